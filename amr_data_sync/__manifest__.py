@@ -7,8 +7,8 @@
     "license": "AGPL-3",
     'website': "http://agus.ramdan.tech",
     'category': 'API',
-    'version': '13.0.3.0.0',
-    'depends': ['base', 'mail', 'amr_resource', 'amr_service_client'],
+    'version': '13.0.3.2.0',
+    'depends': ['base', 'mail', 'amr_resource', 'amr_service_client', 'amr_jsonrpc'],
     'data': [
         'security/ir.model.access.csv',
         'views/data_sync_views.xml',
@@ -1,11 +1,11 @@
 # -*- coding: utf-8 -*-
 
-import json
 import logging
 
 from werkzeug.exceptions import HTTPException
 from werkzeug.wrappers import Response
 from odoo.http import request
+from odoo.addons.amr_jsonrpc import json_codec
 from ..exceptions.api_exception import ApiException
 
 _logger = logging.getLogger(__name__)
@@ -18,12 +18,12 @@ class ApiControllerMixin(object):
         body = request.httprequest.data
         if not body:
             return {}
-        return json.loads(body.decode("utf-8"))
+        return json_codec.loads(body)
 
     @classmethod
     def json_response(cls, result, status=200):
         return Response(
-            json.dumps(result),
+            json_codec.dumps_bytes(result),
             headers=[
                 ("Content-Type", "application/json")
             ],
@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+import ast
+import json
+import logging
+
+_logger = logging.getLogger(__name__)
+
+JSON_COLUMNS = [
+    ('external_data_sync', 'data_json'),
+    ('external_data_sync', 'payload_json'),
+    ('external_data_sync_related', 'data_json'),
+    ('external_data_sync_related', 'internal_data_eval'),
+]
+BATCH_SIZE = 1000
+
+
+def create_is_json_function(cr):
+    cr.execute("""
+        CREATE OR REPLACE FUNCTION amr_data_sync_is_json(value text) RETURNS boolean AS $$
+        BEGIN
+            PERFORM value::jsonb;
+            RETURN true;
+        EXCEPTION WHEN others THEN
+            RETURN false;
+        END;
+        $$ LANGUAGE plpgsql IMMUTABLE
+    """)
+
+
+def literal_to_json(value):
+    # literal python (str(list) / str(dict)) -> json text, None bila bukan literal
+    try:
+        return json.dumps(ast.literal_eval(value))
+    except (ValueError, SyntaxError, TypeError, MemoryError, RecursionError):
+        return None
+
+
+def convert_json_column(cr, table, column):
+    """
+    text -> jsonb. internal_data_eval sebelumnya literal python (str(list)), bukan json:
+    value yang bukan json di parse dengan ast.literal_eval dulu,
+    yang tetap tidak bisa di parse di simpan sebagai json string.
+    """
+    last_id = 0
+    while True:
+        cr.execute("""
+            SELECT id, "{column}" FROM "{table}"
+            WHERE id > %s AND "{column}" IS NOT NULL AND "{column}" != ''
+              AND NOT amr_data_sync_is_json("{column}")
+            ORDER BY id LIMIT %s
+        """.format(table=table, column=column), (last_id, BATCH_SIZE))
+        rows = cr.fetchall()
+        if not rows:
+            break
+        last_id = rows[-1][0]
+        for rec_id, value in rows:
+            json_value = literal_to_json(value)
+            if json_value is not None:
+                cr.execute('UPDATE "{table}" SET "{column}" = %s WHERE id = %s'.format(
+                    table=table, column=column), (json_value, rec_id))
+    cr.execute("""
+        ALTER TABLE "{table}" ALTER COLUMN "{column}" TYPE jsonb USING (
+            CASE
+                WHEN "{column}" IS NULL OR "{column}" = '' THEN NULL
+                WHEN amr_data_sync_is_json("{column}") THEN "{column}"::jsonb
+                ELSE to_jsonb("{column}")
+            END
+        )
+    """.format(table=table, column=column))
+
+
+def migrate(cr, version):
+    if not version:
+        return
+    create_is_json_function(cr)
+    for table, column in JSON_COLUMNS:
+        cr.execute("""
+            SELECT data_type FROM information_schema.columns
+            WHERE table_name = %s AND column_name = %s
+        """, (table, column))
+        row = cr.fetchone()
+        if not row or row[0] == 'jsonb':
+            continue
+        _logger.info("Convert %s.%s to jsonb", table, column)
+        convert_json_column(cr, table, column)
+    cr.execute("DROP FUNCTION IF EXISTS amr_data_sync_is_json(text)")
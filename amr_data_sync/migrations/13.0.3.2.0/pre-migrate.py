@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+import logging
+
+_logger = logging.getLogger(__name__)
+
+TABLE = 'external_data_sync'
+
+
+def get_references(cr):
+    # (table, column, jumlah kolom table) semua foreign key ke external_data_sync
+    cr.execute("""
+        SELECT cl.relname, att.attname,
+               (SELECT count(*) FROM pg_attribute a
+                WHERE a.attrelid = cl.oid AND a.attnum > 0 AND NOT a.attisdropped)
+        FROM pg_constraint con
+        JOIN pg_class cl ON cl.oid = con.conrelid
+        JOIN pg_attribute att ON att.attrelid = con.conrelid AND att.attnum = con.conkey[1]
+        WHERE con.contype = 'f' AND con.confrelid = %s::regclass
+    """, (TABLE,))
+    return cr.fetchall()
+
+
+def get_other_column(cr, table, column):
+    cr.execute("""
+        SELECT column_name FROM information_schema.columns
+        WHERE table_name = %s AND column_name != %s
+    """, (table, column))
+    rows = cr.fetchall()
+    return rows[0][0] if len(rows) == 1 else None
+
+
+def dedupe_external_data_sync(cr):
+    """
+    Gabung duplikat (sync_strategy_id, external_odoo_id) sebelum unique constraint di buat.
+    Record yang di pertahankan: sudah done dengan internal id, lalu id terkecil.
+    Reference ke duplikat di pindah ke record yang di pertahankan,
+    related (turunan data_json) milik duplikat di hapus.
+    """
+    cr.execute("""
+        CREATE TEMP TABLE amr_data_sync_dup ON COMMIT DROP AS
+        SELECT id AS old_id, keep_id FROM (
+            SELECT id, first_value(id) OVER (
+                PARTITION BY sync_strategy_id, external_odoo_id
+                ORDER BY (state = 'done' AND COALESCE(internal_odoo_id, 0) != 0) DESC NULLS LAST, id
+            ) AS keep_id
+            FROM {table}
+            WHERE sync_strategy_id IS NOT NULL AND external_odoo_id IS NOT NULL
+        ) t
+        WHERE id != keep_id
+    """.format(table=TABLE))
+    cr.execute("SELECT count(*) FROM amr_data_sync_dup")
+    count = cr.fetchone()[0]
+    if not count:
+        return
+    _logger.info("Merge %s duplicate external.data.sync", count)
+
+    cr.execute("""
+        DELETE FROM external_data_sync_related r USING amr_data_sync_dup d
+        WHERE r.external_data_sync_id = d.old_id
+    """)
+    for table, column, column_count in get_references(cr):
+        if column_count == 2:
+            # table many2many, hapus link yang sudah ada di record yang di pertahankan
+            other = get_other_column(cr, table, column)
+            if other:
+                cr.execute("""
+                    DELETE FROM "{table}" a USING amr_data_sync_dup d
+                    WHERE a."{column}" = d.old_id AND EXISTS (
+                        SELECT 1 FROM "{table}" b WHERE b."{column}" = d.keep_id AND b."{other}" = a."{other}"
+                    )
+                """.format(table=table, column=column, other=other))
+        cr.execute("""
+            UPDATE "{table}" t SET "{column}" = d.keep_id
+            FROM amr_data_sync_dup d WHERE t."{column}" = d.old_id
+        """.format(table=table, column=column))
+    cr.execute("DELETE FROM {table} t USING amr_data_sync_dup d WHERE t.id = d.old_id".format(table=TABLE))
+
+
+def migrate(cr, version):
+    if not version:
+        return
+    dedupe_external_data_sync(cr)
@@ -1,11 +1,12 @@
 # -*- coding: utf-8 -*-
 from collections import defaultdict
 
-from odoo import models, fields, api
+from odoo import models, fields, api, tools
 from odoo.exceptions import UserError
 import logging
 
-from odoo.addons.amr_data_sync.tools.utils import convert_from_external_data
+from odoo.addons.amr_data_sync.tools.utils import (convert_from_external_data, get_cache_values,
+                                                   invalidate_cache_generation)
 
 _logger = logging.getLogger(__name__)
 
@@ -28,6 +29,10 @@ class ExternalDataLookup(models.Model):
     )
     external_id = fields.Integer()
 
+    # field yang di pakai di mapping company (get_company_mapping_rows)
+    CACHE_FIELDS = ('company_id', 'server_sync_id', 'external_app_name', 'external_id', 'active')
+    _company_cache_generation = 0
+
     # ===== COMPUTE =====
     @api.depends('server_sync_id', 'server_sync_id.app_name')
     def _compute_external_app_name(self):
@@ -43,6 +48,51 @@ class ExternalDataLookup(models.Model):
             # inverse wajib ada supaya field editable
             pass
 
+    @api.model_create_multi
+    def create(self, vals_list):
+        result = super(ExternalDataLookup, self).create(vals_list)
+        # mapping company di cache
+        invalidate_cache_generation(self, '_company_cache_generation')
+        return result
+
+    def write(self, vals):
+        cache_fields = [f for f in self.CACHE_FIELDS if f in vals]
+        before = get_cache_values(self, cache_fields)
+        result = super(ExternalDataLookup, self).write(vals)
+        if cache_fields and before != get_cache_values(self, cache_fields):
+            invalidate_cache_generation(self, '_company_cache_generation')
+        return result
+
+    def unlink(self):
+        result = super(ExternalDataLookup, self).unlink()
+        invalidate_cache_generation(self, '_company_cache_generation')
+        return result
+
+    @tools.ormcache('self._company_cache_generation')
+    def get_company_mapping_rows(self):
+        """
+        Semua mapping company aktif (urut id), di cache di registry.
+        Di invalidate lewat _company_cache_generation saat field CACHE_FIELDS berubah.
+        row: (id, company_id, server_sync_id, external_app_name, external_id)
+        """
+        rows = self.sudo().search_read(
+            [], fields=['company_id', 'server_sync_id', 'external_app_name', 'external_id'], order='id'
+        )
+        return tuple(
+            (r['id'], r['company_id'] and r['company_id'][0], r['server_sync_id'] and r['server_sync_id'][0],
+             r['external_app_name'] or False, r['external_id'])
+            for r in rows
+        )
+
+    @tools.ormcache('self._company_cache_generation', 'external_app_name')
+    def get_company_map(self, external_app_name):
+        # {external_id: company_id} untuk satu application
+        result = {}
+        for row_id, company_id, server_sync_id, app_name, external_id in self.get_company_mapping_rows():
+            if app_name == (external_app_name or False):
+                result.setdefault(external_id, company_id)
+        return result
+
     def lookup_company(self, external_data, server_sync=None,external_app_name=None):
         if not external_data:
             return None
@@ -50,16 +100,23 @@ class ExternalDataLookup(models.Model):
         external_id = data_dict.get('id')
         if not external_id:
             return None
+        Company = self.env['res.company']
         if server_sync:
-            result = self.search(
-                [('external_id', '=', external_id), ('external_app_name', '=', external_app_name)], limit=1
-            )
-            if result:
-                return result.company_id
+            company_map = self.get_company_map(external_app_name)
+            if external_id in company_map:
+                return Company.browse(company_map[external_id])
             external_app_name = server_sync.get_application_name()
-        result = self.search([('external_id','=',external_id),('external_app_name','=',external_app_name)],limit=1)
-        return result.company_id
-
+        return Company.browse(self.get_company_map(external_app_name).get(external_id))
+
+    def lookup_company_by_issuer(self, issuer, external_id):
+        # mapping company berdasarkan base_url server (issuer token)
+        if not issuer or not external_id:
+            return self.browse()
+        server_ids = set(self.env['external.server.sync'].sudo().search([('base_url', '=', issuer)]).ids)
+        for row_id, company_id, server_sync_id, app_name, row_external_id in self.get_company_mapping_rows():
+            if server_sync_id in server_ids and row_external_id == external_id:
+                return self.browse(row_id)
+        return self.browse()
 
     def reverse_mapping(
             self, internal,
@@ -78,18 +135,18 @@ class ExternalDataLookup(models.Model):
             return [0], [0]
         result_map = {}
         not_mapped_ids = set(internal.ids)
+        rows = self.get_company_mapping_rows()
 
-        def filter_by_domain(domain):
-            rows = self.search(domain)
+        def filter_rows(match):
             mapping = defaultdict(list)
-            for r in rows:
-                mapping[r.company_id.id].append(r.external_id)
+            for row_id, company_id, server_sync_id, app_name, external_id in rows:
+                if company_id in not_mapped_ids and match(server_sync_id, app_name):
+                    mapping[company_id].append(external_id)
             return dict(mapping)
 
         if server_sync:
             external_app_name = server_sync.get_application_name()
-            domain = [('company_id', 'in', list(not_mapped_ids)), ('server_sync_id', '=', server_sync.id)]
-            r_map = filter_by_domain(domain)
+            r_map = filter_rows(lambda server_sync_id, app_name: server_sync_id == server_sync.id)
             result_map.update(r_map)
             not_mapped_ids -= r_map.keys()
 
@@ -99,9 +156,7 @@ class ExternalDataLookup(models.Model):
                 raise ValueError("external_app_name not set")
             return result_map, not_mapped_ids
 
-        domain = [('company_id', 'in', list(not_mapped_ids)),
-                  ('external_app_name', '=', external_app_name), ]
-        r_map = filter_by_domain(domain)
+        r_map = filter_rows(lambda server_sync_id, app_name: app_name == external_app_name)
         result_map.update(r_map)
         not_mapped_ids -= r_map.keys()
         return result_map, not_mapped_ids
@@ -1,8 +1,10 @@
 # -*- coding: utf-8 -*-
 
-from odoo import models, fields, api, _
+from odoo import models, fields, api, tools, _
 from odoo.exceptions import UserError
 
+from ..tools.utils import convert_from_external_data, get_cache_values, invalidate_cache_generation
+
 
 class ExternalDataLookup(models.Model):
     _name = 'external.data.lookup'
@@ -33,6 +35,11 @@ class ExternalDataLookup(models.Model):
     internal_id = fields.Integer(readonly=True)
     reverse_able = fields.Boolean()
 
+    # field yang di pakai di index lookup (get_lookup_index)
+    CACHE_FIELDS = ('external_app_name', 'external_model', 'internal_model', 'external_id', 'name',
+                    'internal_id', 'active', 'server_sync_id')
+    _lookup_cache_generation = 0
+
     # ===== COMPUTE =====
     @api.depends('server_sync_id', 'server_sync_id.app_name')
     def _compute_external_app_name(self):
@@ -79,7 +86,10 @@ class ExternalDataLookup(models.Model):
                     'internal_model': model,
                     'internal_id': int(res_id),
                 })
-        return super().create(vals_list)
+        result = super().create(vals_list)
+        # index lookup di cache
+        invalidate_cache_generation(self, '_lookup_cache_generation')
+        return result
 
     def write(self, vals):
         ref = vals.get('internal_ref')
@@ -89,7 +99,17 @@ class ExternalDataLookup(models.Model):
                 'internal_model': model,
                 'internal_id': int(res_id),
             })
-        return super().write(vals)
+        cache_fields = [f for f in self.CACHE_FIELDS if f in vals]
+        before = get_cache_values(self, cache_fields)
+        result = super().write(vals)
+        if cache_fields and before != get_cache_values(self, cache_fields):
+            invalidate_cache_generation(self, '_lookup_cache_generation')
+        return result
+
+    def unlink(self):
+        result = super().unlink()
+        invalidate_cache_generation(self, '_lookup_cache_generation')
+        return result
 
     def action_open_internal(self):
         self.ensure_one()
@@ -107,36 +127,84 @@ class ExternalDataLookup(models.Model):
     def get_internal_object(self):
         return self and self.internal_id and self.env[self.internal_model].browse(self.internal_id)
 
+    @tools.ormcache('self._lookup_cache_generation', 'external_app_name', 'external_model', 'internal_model')
+    def get_lookup_index(self, external_app_name, external_model, internal_model):
+        """
+        Index lookup per (app, external_model, internal_model), di cache di registry.
+        Di invalidate lewat _lookup_cache_generation saat field CACHE_FIELDS berubah.
+        Return (by_id_name, by_id, by_name) dengan value (internal_model, internal_id)
+        dari record pertama (urut id), sama seperti search(..., limit=1).
+        """
+        rows = self.sudo().search_read([
+            ('external_app_name', '=', external_app_name),
+            ('external_model', '=', external_model),
+            ('internal_model', '=', internal_model),
+        ], fields=['external_id', 'name', 'internal_model', 'internal_id'], order='id')
+        by_id_name, by_id, by_name = {}, {}, {}
+        for row in rows:
+            ref = (row['internal_model'], row['internal_id'])
+            if row['external_id'] and row['name']:
+                by_id_name.setdefault((row['external_id'], row['name']), ref)
+            if row['external_id']:
+                by_id.setdefault(row['external_id'], ref)
+            if row['name']:
+                by_name.setdefault(row['name'], ref)
+        return by_id_name, by_id, by_name
+
+    def _ref_to_internal_object(self, ref):
+        if ref and ref[0] and ref[1]:
+            return self.env[ref[0]].browse(ref[1])
+        return None
+
     def lookup_internal(self, external_app_name, external_model, internal_model, external_id=None, display_name=None):
 
         if not external_app_name or not external_model or not internal_model:
             raise UserError("Invalid parameter")
 
-        def lookup(domain):
+        def lookup(app_name):
+            by_id_name, by_id, by_name = self.get_lookup_index(app_name, external_model, internal_model)
             data_lookup = None
             if external_id and display_name:
-                data_lookup = self.search(domain + [
-                    ('external_id', '=', external_id),
-                    ('name', '=', display_name),
-                ], limit=1).get_internal_object()
+                data_lookup = self._ref_to_internal_object(by_id_name.get((external_id, display_name)))
 
             if external_id and not data_lookup:
-                data_lookup = self.search(domain + [
-                    ('external_id', '=', external_id),
-                ], limit=1).get_internal_object()
+                data_lookup = self._ref_to_internal_object(by_id.get(external_id))
 
             if display_name and not data_lookup:
-                data_lookup = self.search(domain + [
-                    ('name', '=', display_name),
-                ], limit=1).get_internal_object()
+                data_lookup = self._ref_to_internal_object(by_name.get(display_name))
             return data_lookup
 
-        return lookup([
-            ('external_app_name', '=', external_app_name),
-            ('external_model', '=', external_model),
-            ('internal_model', '=', internal_model),
-        ]) or lookup([
-            ('external_app_name', '=', '*'),
-            ('external_model', '=', external_model),
-            ('internal_model', '=', internal_model),
-        ])
+        return lookup(external_app_name) or lookup('*')
+
+    def lookup_internal_many(self, external_app_name, external_model, internal_model, items):
+        """
+        Lookup satu page external data sekaligus dari index.
+        items: list external data (id, [id, name] atau dict)
+        return {external_id: internal record}, yang tidak di temukan tidak ada di hasil.
+        """
+        if not external_app_name or not external_model or not internal_model:
+            raise UserError("Invalid parameter")
+
+        indexes = [
+            self.get_lookup_index(app_name, external_model, internal_model)
+            for app_name in (external_app_name, '*')
+        ]
+        result = {}
+        for item in items or []:
+            item_data = convert_from_external_data(item)
+            external_id = item_data.get('id')
+            display_name = item_data.get('display_name') or item_data.get('name')
+            if not external_id or external_id in result:
+                continue
+            for by_id_name, by_id, by_name in indexes:
+                data_lookup = None
+                if display_name:
+                    data_lookup = self._ref_to_internal_object(by_id_name.get((external_id, display_name)))
+                if not data_lookup:
+                    data_lookup = self._ref_to_internal_object(by_id.get(external_id))
+                if display_name and not data_lookup:
+                    data_lookup = self._ref_to_internal_object(by_name.get(display_name))
+                if data_lookup:
+                    result[external_id] = data_lookup
+                    break
+        return result
@@ -1,12 +1,12 @@
 # -*- coding: utf-8 -*-
 
-import json
 from datetime import datetime
 
-from odoo import _, fields, models
-from odoo.tools.safe_eval import safe_eval
+from odoo import _, api, fields, models
 
-from ..tools.utils import has_kwargs, is_callable_method
+from ..tools.fields import json_hash
+from ..tools.utils import (get_cache_values, has_kwargs, invalidate_cache_generation, invalidate_safe_eval,
+                          is_callable_method, safe_eval_cached)
 
 
 class ExternalDataMapping(models.Model):
@@ -64,6 +64,39 @@ class ExternalDataMapping(models.Model):
     constant_simple_value = fields.Boolean(compute='_compute_constant_simple_value')
     constant_value = fields.Char()
 
+    # field yang di pakai field plan strategy (get_field_plan)
+    CACHE_FIELDS = ('active', 'sequence', 'sync_strategy_id', 'internal_field', 'key_name')
+
+    def invalidate_strategy_cache(self, field_plan=True):
+        # success hash strategy memakai write_date mapping, selalu di invalidate
+        names = ('_strategy_cache_generation', '_success_hash_cache_generation') if field_plan \
+            else ('_success_hash_cache_generation',)
+        invalidate_cache_generation(self.env['external.data.sync.strategy'], *names)
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        result = super(ExternalDataMapping, self).create(vals_list)
+        # field plan strategy di cache
+        self.invalidate_strategy_cache()
+        return result
+
+    def write(self, vals):
+        if 'eval_script' in vals:
+            for rec in self:
+                invalidate_safe_eval(rec.eval_script)
+        cache_fields = [f for f in self.CACHE_FIELDS if f in vals]
+        before = get_cache_values(self, cache_fields)
+        result = super(ExternalDataMapping, self).write(vals)
+        if self:
+            self.invalidate_strategy_cache(
+                field_plan=bool(cache_fields) and before != get_cache_values(self, cache_fields))
+        return result
+
+    def unlink(self):
+        result = super(ExternalDataMapping, self).unlink()
+        self.invalidate_strategy_cache()
+        return result
+
     def _compute_constant_simple_value(self):
         for rec in self:
             if rec.constant_value_type in ['None', 'False', 'True', 'empty_array', 'empty_dict', 'empty_string']:
@@ -77,11 +110,11 @@ class ExternalDataMapping(models.Model):
         value = external_data.get(key_name)
         if self.mapping_strategy == 'parent':
             related = self.env['external.data.sync.related'].get_relation_data(field_name, parent_data_sync)
-            data_json=json.dumps(value)
+            data_json_hash = json_hash(value)
             if related:
-                if data_json != related.data_json:
+                if data_json_hash != related.data_json_hash:
                     related.write({
-                        'data_json':json.dumps(value)
+                        'data_json': value
                     })
             else:
                 related = self.env['external.data.sync.related'].create_parent(field_name,parent_data_sync,value)
@@ -90,11 +123,11 @@ class ExternalDataMapping(models.Model):
             return related.get_data_relation()
         elif self.mapping_strategy == 'many2one':
             related = self.env['external.data.sync.related'].get_relation_data(field_name, parent_data_sync)
-            data_json = json.dumps(value)
+            data_json_hash = json_hash(value)
             if related:
-                if data_json != related.data_json:
+                if data_json_hash != related.data_json_hash:
                     related.write({
-                        'data_json': json.dumps(value)
+                        'data_json': value
                     })
             else:
                 related = self.env['external.data.sync.related'].create_many2one(field_name, parent_data_sync, value,self.relation_strategy_id)
@@ -103,11 +136,11 @@ class ExternalDataMapping(models.Model):
             return related.get_data_relation()
         elif self.mapping_strategy == 'many2many':
             related = self.env['external.data.sync.related'].get_relation_data(field_name, parent_data_sync)
-            data_json = json.dumps(value)
+            data_json_hash = json_hash(value)
             if related:
-                if data_json != related.data_json:
+                if data_json_hash != related.data_json_hash:
                     related.write({
-                        'data_json': json.dumps(value)
+                        'data_json': value
                     })
             else:
                 related = self.env['external.data.sync.related'].create_many2many(
@@ -187,7 +220,7 @@ class ExternalDataMapping(models.Model):
                                 'sync_strategy': self.sync_strategy_id,
                                 'field': field
                                 }
-                safe_eval(eval_script, eval_context, mode="exec", nocopy=True)
+                safe_eval_cached(eval_script, eval_context, mode="exec")
                 # nocopy allows to return 'value'
                 return eval_context.get('value')
             except Exception as e:
@@ -1,16 +1,22 @@
 # -*- coding: utf-8 -*-
 
 import datetime
-import json
 import logging
 import traceback
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from queue import Empty, Queue
+
+from psycopg2 import IntegrityError
 
 from odoo import _, api, fields, models, SUPERUSER_ID
 from odoo.exceptions import UserError
-from odoo.tools import date_utils
+from odoo.tools.sql import create_index, index_exists
+from odoo.addons.amr_jsonrpc.remote import session_pool
 
-from ..tools.utils import convert_from_external_data, insert_data_sql
+from ..tools.fields import Json, content_hash, json_hash
+from ..tools.utils import (check_cache_signaling, convert_from_external_data, create_cache_signal_sequence,
+                           insert_data_sql, update_values_sql)
 
 _logger = logging.getLogger(__name__)
 
@@ -61,9 +67,14 @@ class ExternalDataSync(models.Model):
     last_error = fields.Datetime()
 
     need_get_data_json = fields.Boolean(default=True, help="Flag for get data from external")
-    data_json = fields.Text()
+    data_json = Json()
     error_info = fields.Text()
-    payload_json = fields.Text()
+    payload_json = Json()
+    data_json_hash = fields.Char(compute='_compute_data_json_hash', store=True)
+    last_success_hash = fields.Char(
+        copy=False,
+        help="Hash data_json + strategy pada saat terakhir sukses, bila sama process_data di skip"
+    )
     next_processing_datetime = fields.Datetime(default=fields.Datetime.now)
     last_processing_datetime = fields.Datetime()
     request_datetime = fields.Datetime(default=fields.Datetime.now)
@@ -84,6 +95,57 @@ class ExternalDataSync(models.Model):
         string='History External Data Update',
     )
 
+    _sql_constraints = [
+        ('sync_strategy_external_odoo_id_uniq', 'unique(sync_strategy_id, external_odoo_id)',
+         'External data must be unique per sync strategy.'),
+    ]
+
+    @api.depends('data_json', 'need_get_data_json')
+    def _compute_data_json_hash(self):
+        for rec in self:
+            rec.data_json_hash = False if rec.need_get_data_json else content_hash(rec.data_json)
+
+    @api.model
+    def compute_success_hash(self, data_json_hash, sync_strategy):
+        if not data_json_hash or not sync_strategy:
+            return False
+        return json_hash([data_json_hash, sync_strategy.get_success_config_hash()])
+
+    def get_success_hash(self):
+        return self.compute_success_hash(self.data_json_hash, self.sync_strategy_id)
+
+    def is_unchanged_from_external(self, data_json_hash=None):
+        # data sama dengan sync terakhir yang sukses.
+        # state selain done/process selalu menghapus last_success_hash (lihat write),
+        # 'process' hanya di set dispatch_process sebelum process_data
+        if self.state not in ('done', 'process') or not self.last_success_hash:
+            return False
+        success_hash = self.compute_success_hash(data_json_hash or self.data_json_hash, self.sync_strategy_id)
+        return bool(success_hash and self.internal_odoo_id and self.last_success_hash == success_hash)
+
+    def init(self):
+        cr = self.env.cr
+        # signal invalidate generation cache antar worker (check_cache_signaling)
+        create_cache_signal_sequence(cr)
+        # lookup relation_from_external dan reverse_mapping
+        create_index(cr, 'external_data_sync_external_app_model_idx', self._table,
+                     ['external_odoo_id', 'external_app_name', 'internal_model'])
+        create_index(cr, 'external_data_sync_internal_strategy_idx', self._table,
+                     ['internal_odoo_id', 'sync_strategy_id'])
+        # antrian cron_process_data, hanya data yang belum done / belum ambil data_json
+        if not index_exists(cr, 'external_data_sync_pending_idx'):
+            cr.execute('''
+                CREATE INDEX external_data_sync_pending_idx
+                ON {} (next_processing_datetime, last_processing_datetime, id)
+                WHERE state != 'done' OR state IS NULL
+            '''.format(self._table))
+        if not index_exists(cr, 'external_data_sync_need_data_json_idx'):
+            cr.execute('''
+                CREATE INDEX external_data_sync_need_data_json_idx
+                ON {} (next_processing_datetime, last_processing_datetime, id)
+                WHERE need_get_data_json
+            '''.format(self._table))
+
     def get_external_application_name(self):
         return self.external_app_name or (self.server_sync_id and self.server_sync_id.get_application_name()) or None
 
@@ -111,6 +173,9 @@ class ExternalDataSync(models.Model):
             vals['external_model'] = strategy.external_model
             vals['external_app_name'] = strategy.external_app_name
             vals['internal_model'] = strategy.internal_model or strategy.external_model
+        if vals.get('state') not in (None, 'done', 'process'):
+            # proses tidak sukses (need_resolve, error, ...), data harus di proses ulang walaupun isi sama
+            vals.setdefault('last_success_hash', False)
 
         return super(ExternalDataSync, self).write(vals)
 
@@ -119,10 +184,9 @@ class ExternalDataSync(models.Model):
             [('name', '=', self.external_app_name)], limit=1)
 
     def get_sync_strategy(self):
-        sync_strategy_id = self.sync_strategy_id or self.env['external.data.sync.strategy'].search(
-            [('external_app_name', '=', self.external_app_name),
-             ('external_model', '=', self.external_model),
-             ('internal_model', '=', self.internal_model)], limit=1)
+        sync_strategy_id = self.sync_strategy_id or self.env['external.data.sync.strategy'].lookup_strategy_by_model(
+            self.external_app_name, self.external_model, self.internal_model
+        )
         return sync_strategy_id.ensure_internal_context()
 
     def get_external_one_data(self):
@@ -134,7 +198,7 @@ class ExternalDataSync(models.Model):
 
     def get_json_data_for_create(self):
         if not self.need_get_data_json:
-            json_date = json.loads(self.data_json)
+            json_date = self.data_json
             if isinstance(json_date, dict):
                 return json_date
             _logger.info("Data Json not dict")
@@ -142,35 +206,69 @@ class ExternalDataSync(models.Model):
         json_data = self.get_external_one_data()
         if json_data:
             with self.env.cr.savepoint():
-                data = {
-                    'need_get_data_json': False,
-                    'data_json': json.dumps(json_data)
-                }
-                write_date = json_data.get('write_date')
-                if write_date:
-                    if isinstance(write_date, str):
-                        write_date = fields.Datetime.to_datetime(write_date)
-                    data['external_last_update'] = write_date
-                self.write(data)
+                self.write_data_json(json_data)
             return json_data
         else:
             self.write({
                 'need_get_data_json': False,
-                'data_json': json.dumps(json_data)
+                'data_json': json_data
             })
             _logger.info("Deleter")
             return {'active': False}
 
+    def write_data_json(self, json_data):
+        data = {
+            'need_get_data_json': False,
+            'data_json': json_data
+        }
+        write_date = json_data.get('write_date')
+        if write_date:
+            if isinstance(write_date, str):
+                write_date = fields.Datetime.to_datetime(write_date)
+            data['external_last_update'] = write_date
+        self.write(data)
+
+    def prefetch_data_json(self, chunk_size=200):
+        """
+        Ambil data_json dari external secara batch per sync strategy (satu session, read per chunk id)
+        sebelum process_data, supaya tidak ada read ke external per record.
+        Data yang tidak di temukan di external atau chunk read nya gagal tetap need_get_data_json,
+        di proses oleh process_data.
+        """
+        pending = defaultdict(list)
+        for rec in self:
+            if rec.need_get_data_json and rec.external_odoo_id and rec.sync_strategy_id:
+                pending[rec.sync_strategy_id.id].append(rec.id)
+
+        for sync_strategy_id, record_ids in pending.items():
+            records = self.browse(record_ids)
+            sync_strategy = records[0].sync_strategy_id.ensure_internal_context()
+            try:
+                data_map = sync_strategy.get_external_many_data(
+                    list(set(records.mapped('external_odoo_id'))), chunk_size=chunk_size
+                )
+            except Exception:
+                _logger.exception("Error prefetch data json strategy %s", sync_strategy)
+                continue
+            for rec in records:
+                json_data = data_map.get(rec.external_odoo_id)
+                if json_data:
+                    rec.write_data_json(json_data)
+
     def validate_json_data_for_delete(self):
         self.ensure_one()
         json_data = self.get_external_one_data()
         if not json_data:
-            self.external_deleted = True
-            self.action_archive_internal_odoo(self.get_internal_object(), {}, {})
+            self.mark_external_deleted()
             return True
 
         return False
 
+    def mark_external_deleted(self):
+        self.ensure_one()
+        self.external_deleted = True
+        self.action_archive_internal_odoo(self.get_internal_object(), {}, {})
+
     def action_reset_related(self):
         for rec in self:
             rec.related_ids = False
@@ -193,11 +291,14 @@ class ExternalDataSync(models.Model):
                 return False
         return True
 
+    def is_all_related_resolved(self):
+        return all(r.state == 'done' for r in self.related_ids)
+
     def get_related_data(self, field, value):
         related = self.related_ids.filtered(lambda r: r.name == field.name)
         if related:
             related.write({
-                'data_json': json.dumps(value)
+                'data_json': value
             })
         elif self.sync_strategy_id and value:
             parent_sync_strategy = self.sync_strategy_id
@@ -215,9 +316,8 @@ class ExternalDataSync(models.Model):
                 )
         return related.get_data_relation()
 
-    def data_from_external(self, item, sync_strategy, create_when_not_found=True, need_get_data_json=True):
-        if not sync_strategy:
-            raise UserError("Sync Strategy Not found")
+    @api.model
+    def prepare_data_from_external(self, item, need_get_data_json=True):
         external_odoo_id = item.get('id')
         external_last_update = item.get('write_date')
         display_name = item.get('display_name')
@@ -225,21 +325,32 @@ class ExternalDataSync(models.Model):
         if isinstance(external_last_update, str):
             external_last_update = fields.Datetime.to_datetime(external_last_update)
         if need_get_data_json:
-            data_json = json.dumps([external_odoo_id, display_name])
+            data_json = [external_odoo_id, display_name]
         else:
-            data_json = json.dumps(item)
+            data_json = item
 
         input_dict = {
             'display_name': display_name or f'ID {external_odoo_id}',
             'data_json': data_json,
             'need_get_data_json': need_get_data_json
         }
+        return input_dict, external_last_update
+
+    def data_from_external(self, item, sync_strategy, create_when_not_found=True, need_get_data_json=True):
+        if not sync_strategy:
+            raise UserError("Sync Strategy Not found")
+        external_odoo_id = item.get('id')
+        input_dict, external_last_update = self.prepare_data_from_external(item, need_get_data_json)
         domain = [
             ('external_odoo_id', '=', external_odoo_id),
             ('sync_strategy_id', '=', sync_strategy.id)
         ]
         existing = self.search(domain, limit=1)
         if existing:
+            if not need_get_data_json and existing.state == 'done' \
+                    and existing.is_unchanged_from_external(content_hash(item)):
+                _logger.info("Data tidak perlu di update karena isi data sama.")
+                return existing
             if external_last_update and existing.external_last_update and existing.internal_odoo_id:
                 if existing.external_last_update >= external_last_update:
                     _logger.info("Data tidak perlu di update karena data lebih baru atau sama.")
@@ -267,6 +378,79 @@ class ExternalDataSync(models.Model):
 
         return existing
 
+    def data_from_external_batch(self, items, sync_strategy, create_when_not_found=True, need_get_data_json=True):
+        """
+        Versi per page dari data_from_external: satu search_read untuk semua external id,
+        perbandingan external_last_update di memory, satu create multi record
+        dan satu UPDATE ... FROM (VALUES ...) untuk semua record yang berubah.
+        """
+        if not sync_strategy:
+            raise UserError("Sync Strategy Not found")
+        items = [item for item in items or [] if item.get('id')]
+        if not items:
+            return self.browse()
+
+        rows = self.search_read([
+            ('external_odoo_id', 'in', list({item['id'] for item in items})),
+            ('sync_strategy_id', '=', sync_strategy.id)
+        ], fields=['external_odoo_id', 'external_last_update', 'internal_odoo_id', 'state', 'last_success_hash'],
+            order='id')
+        existing_map = {}
+        for row in rows:
+            existing_map.setdefault(row['external_odoo_id'], row)
+
+        update_able = sync_strategy.is_update_able_from_external()
+        result_ids = []
+        update_values = {}
+        create_list = []
+        seen = set()
+        for item in items:
+            external_odoo_id = item['id']
+            if external_odoo_id in seen:
+                continue
+            seen.add(external_odoo_id)
+            input_dict, external_last_update = self.prepare_data_from_external(item, need_get_data_json)
+            row = existing_map.get(external_odoo_id)
+            if row:
+                result_ids.append(row['id'])
+                if not need_get_data_json and row['state'] == 'done' and row['internal_odoo_id'] \
+                        and row['last_success_hash'] \
+                        and row['last_success_hash'] == self.compute_success_hash(content_hash(item), sync_strategy):
+                    continue
+                if external_last_update and row['external_last_update'] and row['internal_odoo_id']:
+                    if row['external_last_update'] >= external_last_update:
+                        continue
+                    input_dict['external_last_update'] = external_last_update
+                if row['state'] != 'process' and update_able:
+                    input_dict['state'] = 'process'
+                    # kolom sama untuk semua record supaya satu statement
+                    input_dict.setdefault('external_last_update', row['external_last_update'])
+                    update_values[row['id']] = input_dict
+            elif create_when_not_found:
+                input_dict.update(
+                    external_odoo_id=external_odoo_id,
+                    sync_strategy_id=sync_strategy.id,
+                )
+                internal = sync_strategy.internal_lookup(item)
+                if internal:
+                    input_dict.update(
+                        internal_odoo_id=internal.id,
+                        state='done',
+                        last_success=fields.Datetime.now(),
+                    )
+                create_list.append(input_dict)
+
+        # UPDATE langsung tanpa write(): logic ExternalDataSync.write (dan override model turunan) tidak jalan.
+        # Harus tetap sejalan dengan write(): sync_strategy_id tidak di ubah di sini (tidak perlu isi
+        # external_model / external_app_name / internal_model) dan state selalu 'process'
+        # (last_success_hash tidak di reset). Bila write() di tambah logic lain, tambahkan juga di sini.
+        update_values_sql(self, update_values)
+
+        result = self.browse(result_ids)
+        if create_list:
+            result |= self.create(create_list)
+        return result
+
     def relation_from_external(self, item, sync_related):
         item = convert_from_external_data(item)
         external_odoo_id = int(item.get('id'))
@@ -289,17 +473,95 @@ class ExternalDataSync(models.Model):
         elif sync_related.sync_strategy_id:
             input_dict = {
                 'display_name': display_name or f'ID {external_odoo_id}',
-                'data_json': f'[{external_odoo_id}, "{display_name}"]',
+                'data_json': [external_odoo_id, display_name],
                 'external_odoo_id': external_odoo_id,
                 'external_model': internal_model,
                 'internal_model': internal_model,
                 'sync_strategy_id': sync_related.sync_strategy_id.id,
                 'external_app_name': parent_external_data_sync.external_app_name
             }
-            existing = self.create([input_dict])[0]
+            existing = self.create_missing([input_dict])[:1]
 
         return existing
 
+    def relation_from_external_many(self, items, sync_related):
+        # versi batch relation_from_external, hasil list sesuai urutan items
+        items = [convert_from_external_data(item) for item in items]
+        external_odoo_ids = [int(item.get('id')) for item in items]
+        if not external_odoo_ids:
+            return []
+
+        internal_model = sync_related.internal_model
+        external_app_name = sync_related.external_app_name
+        existing_by_id = {}
+        for rec in self.search([
+            ('external_odoo_id', 'in', list(set(external_odoo_ids))),
+            ('external_app_name', '=', external_app_name),
+            ('internal_model', '=', internal_model)
+        ], order='id'):
+            existing_by_id.setdefault(rec.external_odoo_id, rec)
+
+        to_dispatch = self.browse()
+        for rec in existing_by_id.values():
+            if rec.state != 'done' and rec.is_update_able_from_external():
+                to_dispatch |= rec
+
+        if sync_related.sync_strategy_id:
+            parent_external_data_sync = sync_related.external_data_sync_id
+            input_list = []
+            for item, external_odoo_id in zip(items, external_odoo_ids):
+                if external_odoo_id in existing_by_id:
+                    continue
+                display_name = item.get('name') or item.get('display_name')
+                existing_by_id[external_odoo_id] = False
+                input_list.append({
+                    'display_name': display_name or f'ID {external_odoo_id}',
+                    'data_json': [external_odoo_id, display_name],
+                    'external_odoo_id': external_odoo_id,
+                    'external_model': internal_model,
+                    'internal_model': internal_model,
+                    'sync_strategy_id': sync_related.sync_strategy_id.id,
+                    'external_app_name': parent_external_data_sync.external_app_name
+                })
+            if input_list:
+                for rec in self.create_missing(input_list):
+                    existing_by_id[rec.external_odoo_id] = rec
+
+        if to_dispatch:
+            to_dispatch.dispatch_process()
+
+        return [existing_by_id.get(external_odoo_id) or self.browse() for external_odoo_id in external_odoo_ids]
+
+    def create_missing(self, vals_list):
+        """
+        Create hanya data yang belum ada berdasarkan unique (sync_strategy_id, external_odoo_id),
+        data yang sudah ada (atau di buat transaksi lain) di return tanpa create.
+        """
+        keys = {(vals['sync_strategy_id'], vals['external_odoo_id']) for vals in vals_list}
+        existing = self.browse()
+        for strategy_id in {strategy_id for strategy_id, external_odoo_id in keys}:
+            existing |= self.search([
+                ('sync_strategy_id', '=', strategy_id),
+                ('external_odoo_id', 'in', [ext_id for st_id, ext_id in keys if st_id == strategy_id]),
+            ])
+        found = {(rec.sync_strategy_id.id, rec.external_odoo_id) for rec in existing}
+        vals_list = [vals for vals in vals_list if (vals['sync_strategy_id'], vals['external_odoo_id']) not in found]
+        if not vals_list:
+            return existing
+        try:
+            with self.env.cr.savepoint():
+                return existing | self.create(vals_list)
+        except IntegrityError:
+            _logger.info("Duplicate external data sync, create per record")
+        for vals in vals_list:
+            try:
+                with self.env.cr.savepoint():
+                    existing |= self.create([vals])
+            except IntegrityError:
+                # di buat transaksi lain, di resolve di proses berikutnya
+                _logger.info("Skip duplicate external data sync %s", vals.get('external_odoo_id'))
+        return existing
+
     def prepare_input_external(self, item, **kwargs):
         parent_object = self
         sync_strategy = kwargs.get('sync_strategy') or self.sync_strategy_id
@@ -309,6 +571,7 @@ class ExternalDataSync(models.Model):
 
     def force_update_from_external(self):
         self.need_get_data_json = True
+        self.last_success_hash = False
         self.request_datetime = fields.Datetime.now()
         if self.state == 'done':
             self.dispatch_process()
@@ -339,10 +602,12 @@ class ExternalDataSync(models.Model):
                 'internal_odoo_id': internal_odoo.id,
                 'state': 'done',
                 'last_success': fields.Datetime.now(),
+                # related yang belum done (need_resolve setelah process_field_after_create) bukan sukses
+                'last_success_hash': self.is_all_related_resolved() and self.get_success_hash(),
                 'last_processing_datetime': fields.Datetime.now()
             }
             if payload:
-                done_data['payload_json'] = json.dumps(payload, default=date_utils.json_default)
+                done_data['payload_json'] = payload
 
             self.write(done_data)
 
@@ -355,7 +620,7 @@ class ExternalDataSync(models.Model):
             'archived_datetime': fields.Datetime.now(),
             'last_success': fields.Datetime.now(),
             'last_processing_datetime': fields.Datetime.now(),
-            'payload_json': json.dumps(payload, default=date_utils.json_default)
+            'payload_json': payload
         }
         self.write(done_data)
 
@@ -369,7 +634,7 @@ class ExternalDataSync(models.Model):
                 'last_processing_datetime': fields.Datetime.now()
             }
             if payload:
-                done_data['payload_json'] = json.dumps(payload, default=date_utils.json_default)
+                done_data['payload_json'] = payload
 
             self.write_error_safe(done_data)
 
@@ -395,13 +660,19 @@ class ExternalDataSync(models.Model):
             if sync_strategy.internal_id_same_as_external:
                 internal_odoo_id = sync_strategy.get_internal_id_same_as_external(item)
                 input_dict['id'] = internal_odoo_id
-                existing = insert_data_sql(existing, [input_dict])[0]
+                existing = insert_data_sql(
+                    existing, [input_dict], resync_sequence=not sync_strategy.is_internal_id_reserved()
+                )[0]
             else:
                 existing = existing.create([input_dict])[0]
 
         return existing
 
-    def process_data(self):
+    def process_data(self, deferred_insert=None):
+        """
+        deferred_insert: list, bila di isi create internal_id_same_as_external tidak langsung di insert
+        tetapi di tambahkan ke list ini (lihat process_data_batch).
+        """
         input_dict = {}
         try:
             _logger.info("process_data start")
@@ -417,6 +688,13 @@ class ExternalDataSync(models.Model):
                     'next_processing_datetime': fields.Datetime.now() + datetime.timedelta(hours=24),
                 })
                 return
+            if self.is_unchanged_from_external() and self.get_internal_object().exists():
+                _logger.info("Data tidak berubah sejak sync terakhir, skip process %s", self)
+                self.write({
+                    'state': 'done',
+                    'last_processing_datetime': fields.Datetime.now(),
+                })
+                return
             if 'company_id' in item:
                 company = sync_strategy.lookup_company(item.get('company_id'))
                 if company and company.id != self.company_id.id:
@@ -467,31 +745,91 @@ class ExternalDataSync(models.Model):
             if not skip_save:
                 if existing is None or isinstance(existing, models.BaseModel):
                     existing = ModelObject
+                if self.defer_insert_data(existing, item, input_dict, sync_strategy, deferred_insert):
+                    return
                 existing = self.save_data(existing, item, input_dict)
 
-            if existing:
-                after_data = self.process_field_after_create(existing) or {}
-                if after_data:
-                    input_dict.update(after_data)
-                self.write_done_internal_odoo(existing, input_dict)
-                all_related_done = self.is_all_related_done()
-                if all_related_done:
-                    _logger.info("Related Done Process after sync done")
-                    sync_strategy.event_external_data_sync_done(existing, item, input_dict)
-                else:
-                    _logger.info("Delay proses data karena masih ada related data yang belum selesai. (%s) [%s] %s",
-                                 self.internal_model, self.external_model, str(self.external_odoo_id)
-                                 )
-                    self.write({'state': 'need_resolve', 'error_info': "need_resolve"})
-
-            else:
-                _logger.info(f"No update or Create {item.get('id')}")
+            self.finish_process_data(existing, item, input_dict, sync_strategy)
 
         except Exception:
             _logger.exception("Error process_data")
             self.write_error(traceback.format_exc(), input_dict)
             raise
 
+    def finish_process_data(self, existing, item, input_dict, sync_strategy):
+        if existing:
+            after_data = self.process_field_after_create(existing) or {}
+            if after_data:
+                input_dict.update(after_data)
+            self.write_done_internal_odoo(existing, input_dict)
+            all_related_done = self.is_all_related_done()
+            if all_related_done:
+                _logger.info("Related Done Process after sync done")
+                sync_strategy.event_external_data_sync_done(existing, item, input_dict)
+            else:
+                _logger.info("Delay proses data karena masih ada related data yang belum selesai. (%s) [%s] %s",
+                             self.internal_model, self.external_model, str(self.external_odoo_id)
+                             )
+                self.write({'state': 'need_resolve', 'error_info': "need_resolve", 'last_success_hash': False})
+
+        else:
+            _logger.info(f"No update or Create {item.get('id')}")
+
+    def defer_insert_data(self, existing, item, input_dict, sync_strategy, deferred_insert):
+        # create internal_id_same_as_external (lihat save_data) di tunda, di insert sekaligus
+        if deferred_insert is None or existing or not self.sync_strategy_id.internal_id_same_as_external:
+            return False
+        if not self.is_create_able_from_external() or self.sync_strategy_id.internal_lookup(item):
+            return False
+        deferred_insert.append((self, existing, item, input_dict, sync_strategy))
+        return True
+
+    def process_data_batch(self):
+        """
+        process_data untuk beberapa record. Internal record internal_id_same_as_external yang belum ada
+        di insert dengan satu insert_data_sql per strategy, bukan satu INSERT per record.
+        """
+        deferred_insert = []
+        for rec in self:
+            try:
+                with rec.env.cr.savepoint():
+                    rec.process_data(deferred_insert=deferred_insert)
+            except Exception:
+                _logger.exception("Error rec %s", rec)
+                rec.write_error_safe({
+                    'error_info': traceback.format_exc(),
+                    'state': 'error',
+                    'last_error': fields.Datetime.now(),
+                    'next_processing_datetime': fields.Datetime.now() + datetime.timedelta(hours=1),
+                })
+
+        groups = defaultdict(list)
+        for row in deferred_insert:
+            groups[row[0].sync_strategy_id].append(row)
+        for strategy, rows in groups.items():
+            vals_list = []
+            for rec, model, item, input_dict, sync_strategy in rows:
+                input_dict['id'] = strategy.get_internal_id_same_as_external(item)
+                vals_list.append(input_dict)
+            try:
+                with self.env.cr.savepoint():
+                    internals = insert_data_sql(
+                        rows[0][1], vals_list, resync_sequence=not strategy.is_internal_id_reserved()
+                    )
+            except Exception:
+                # misal id sudah di pakai, proses ulang per record
+                _logger.exception("Error insert batch %s", strategy)
+                for rec, model, item, input_dict, sync_strategy in rows:
+                    rec.process_with_handel_error()
+                continue
+            for (rec, model, item, input_dict, sync_strategy), internal in zip(rows, internals):
+                try:
+                    with rec.env.cr.savepoint():
+                        rec.finish_process_data(internal, item, input_dict, sync_strategy)
+                except Exception:
+                    _logger.exception("Error rec %s", rec)
+                    rec.write_error(traceback.format_exc(), input_dict)
+
     def write_error(self, stack_trace, payload=None):
         error_data = {
             'error_info': stack_trace,
@@ -501,10 +839,12 @@ class ExternalDataSync(models.Model):
             'next_processing_datetime': fields.Datetime.now() + datetime.timedelta(hours=1),
         }
         if payload:
-            error_data['payload_json'] = json.dumps(payload, default=date_utils.json_default)
+            error_data['payload_json'] = payload
         self.write_error_safe(error_data)
 
     def write_error_safe(self, error_data, using_pool=False):
+        # proses tidak sukses, data harus di proses ulang walaupun isi sama
+        error_data.setdefault('last_success_hash', False)
 
         if using_pool:
             _logger.info("write_error_safe using_pool %s .", self)
@@ -534,7 +874,7 @@ class ExternalDataSync(models.Model):
 
     def action_get_json_data_for_create(self):
         self.ensure_one()
-        self.data_json = json.dumps(self.get_external_one_data())
+        self.data_json = self.get_external_one_data()
 
     def process_with_handel_error(self):
         try:
@@ -549,19 +889,116 @@ class ExternalDataSync(models.Model):
                 'next_processing_datetime': fields.Datetime.now() + datetime.timedelta(hours=1),
             })
 
+    def resolve_related_batch(self):
+        # resolve related semua record sekaligus sebelum di proses per record
+        related = self.mapped('related_ids').filtered(lambda r: r.state != 'done')
+        if not related:
+            return related
+        try:
+            with self.env.cr.savepoint():
+                return related.resolve_related_batch()
+        except Exception:
+            _logger.exception("Error resolve related batch %s", self)
+            return related
+
     def dispatch_process(self, run_immediate=False):
         self.write({'state': 'process'})
         if run_immediate:
-            self.process_with_handel_error()
+            if len(self) > 1:
+                self.process_data_batch()
+            else:
+                self.process_with_handel_error()
+
+    @api.model
+    def get_process_workers(self):
+        param = self.env['ir.config_parameter'].sudo()
+        workers = int(param.get_param('amr_data_sync.process_workers', 0) or 0)
+        chunk_size = int(param.get_param('amr_data_sync.process_chunk_size', 50) or 50)
+        return workers, chunk_size
+
+    def claim_process_chunk(self):
+        # lock data chunk ini, data yang sedang di proses transaksi lain di lewati.
+        # state di cek ulang, data bisa sudah done oleh worker/transaksi lain setelah di search
+        if not self:
+            return self
+        self.env.cr.execute(
+            'SELECT id FROM "{}" WHERE id IN %s '
+            'AND (need_get_data_json OR state IS NULL OR state IN %s) '
+            'FOR UPDATE SKIP LOCKED'.format(self._table),
+            (tuple(self.ids), ('draft', 'process', 'need_resolve', 'error'))
+        )
+        claimed = {row[0] for row in self.env.cr.fetchall()}
+        return self.filtered(lambda r: r.id in claimed)
+
+    def _process_chunk_worker(self, chunk_queue, limit_time):
+        uid, context = self.env.uid, dict(self.env.context)
+        processed = 0
+        with api.Environment.manage():
+            while fields.Datetime.now() <= limit_time:
+                try:
+                    chunk_ids = chunk_queue.get_nowait()
+                except Empty:
+                    break
+                try:
+                    # satu cursor dan satu commit per chunk
+                    with self.pool.cursor() as cr:
+                        env = api.Environment(cr, uid, context)
+                        records = env[self._name].browse(chunk_ids).exists().claim_process_chunk()
+                        records.mapped('sync_strategy_id').preresolve_relation_strategies()
+                        records.prefetch_data_json()
+                        records.resolve_related_batch()
+                        records.dispatch_process(True)
+                        processed += len(records)
+                except Exception:
+                    _logger.exception("Error process chunk %s", chunk_ids)
+        return processed
+
+    def cron_process_data_parallel(self, workers, chunk_size=50, limit=1000):
+        limit_time = fields.Datetime.now() + datetime.timedelta(minutes=10)
+        order = 'next_processing_datetime asc,last_processing_datetime asc, id '
+        records = self.search([('need_get_data_json', '=', True)], limit=limit, order=order)
+        records |= self.search(
+            [('state', '!=', 'done'),
+             '|',
+             ('next_processing_datetime', '<=', fields.Datetime.now()),
+             ('next_processing_datetime', '=', False)],
+            limit=limit, order=order
+        )
+        chunk_queue = Queue()
+        for i in range(0, len(records), chunk_size):
+            chunk_queue.put(records.ids[i:i + chunk_size])
+        # setiap worker (dan thread cron) bisa memegang session remote bersamaan
+        session_pool.ensure_max_size(workers + 1)
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(self._process_chunk_worker, chunk_queue, limit_time)
+                for _ in range(min(workers, chunk_queue.qsize()))
+            ]
+            processed = sum(f.result() for f in futures)
+        _logger.info("cron_process_data_parallel processed %s of %s", processed, len(records))
 
     def cron_process_data(self, limit=1000):
+        check_cache_signaling(self.env)
+        workers, chunk_size = self.get_process_workers()
+        if workers > 1:
+            self.cron_process_data_parallel(workers, chunk_size=chunk_size, limit=limit)
+            # worker sudah commit di cursor masing-masing, snapshot cursor cron sudah basi.
+            # related di proses di cursor baru supaya tidak bentrok (serialization error)
+            with self.pool.cursor() as cr:
+                self.with_env(self.env(cr=cr)).cron_process_related_data(limit=limit)
+            return True
+
         limit_time = fields.Datetime.now() + datetime.timedelta(minutes=10)
         records = self.search(
             [('need_get_data_json', '=', True)],
             limit=limit, order='next_processing_datetime asc,last_processing_datetime asc, id '
         )
-        for rec in records:
-            rec.dispatch_process(True)
+        records.mapped('sync_strategy_id').preresolve_relation_strategies()
+        records.prefetch_data_json()
+        records.resolve_related_batch()
+        for i in range(0, len(records), chunk_size):
+            records[i:i + chunk_size].dispatch_process(True)
             if fields.Datetime.now() > limit_time:
                 break
         records = self.search(
@@ -571,11 +1008,18 @@ class ExternalDataSync(models.Model):
              ('next_processing_datetime', '=', False)],
             limit=limit, order='next_processing_datetime asc,last_processing_datetime asc, id '
         )
-        for rec in records:
-            rec.dispatch_process(True)
+        records.mapped('sync_strategy_id').preresolve_relation_strategies()
+        records.prefetch_data_json()
+        records.resolve_related_batch()
+        for i in range(0, len(records), chunk_size):
+            records[i:i + chunk_size].dispatch_process(True)
             if fields.Datetime.now() > limit_time:
                 break
 
+        self.cron_process_related_data(limit=limit)
+        return True
+
+    def cron_process_related_data(self, limit=1000):
         sync_related = self.env['external.data.sync.related'].search(
             [('state', '!=', 'done'),
              '|',
@@ -583,6 +1027,11 @@ class ExternalDataSync(models.Model):
              ('next_processing_datetime', '=', False)],
             order='next_processing_datetime', limit=limit, )
         limit_time = fields.Datetime.now() + datetime.timedelta(minutes=10)
+        try:
+            with self.env.cr.savepoint():
+                sync_related = sync_related.resolve_related_batch()
+        except Exception:
+            _logger.exception("Error resolve related batch %s", sync_related)
 
         for rec in sync_related:
             rec.dispatch_process(True)
@@ -769,7 +1218,7 @@ class ExternalDataSync(models.Model):
         _logger.info("get_json_data_for_create %s ", item)
         input_dict = self.prepare_input_external(item)
         _logger.info("prepare_input_external %s ", input_dict)
-        self.payload_json = json.dumps(input_dict, default=date_utils.json_default)
+        self.payload_json = input_dict
 
     def data_from_external_id(self, external_odoo_id, sync_strategy):
         if not sync_strategy:
@@ -792,7 +1241,7 @@ class ExternalDataSync(models.Model):
                 'display_name': display_name or f'ID {external_odoo_id}',
                 'external_last_update': external_last_update,
                 'sync_strategy_id': sync_strategy.id,
-                'data_json': json.dumps(item),
+                'data_json': item,
             }
             internal = sync_strategy.internal_lookup(item)
             if internal:
@@ -5,6 +5,8 @@ import logging
 
 from odoo import api, fields, models
 
+from ..tools.utils import check_cache_signaling
+
 _logger = logging.getLogger(__name__)
 
 
@@ -44,11 +46,13 @@ class ExternalDataSyncCron(models.Model):
         self.sync_strategy_id.action_sync_now()
 
     def cron_sync_from_server(self):
+        check_cache_signaling(self.env)
         limit_time = fields.Datetime.now() + datetime.timedelta(minutes=30)
         data_sync_models = self or self.search([
             ('strategy', 'in', ['external_cud', 'external_cu', 'external_create']),
             '|', ('next_sync_datetime', '=', False), ('next_sync_datetime', '<=', fields.Datetime.now())
         ], order='next_sync_datetime asc')
+        data_sync_models.mapped('sync_strategy_id').check_internal_id_sequence_headroom()
         for data_sync in data_sync_models:
             last_sync_datetime = fields.Datetime.now()
             try:
@@ -74,23 +78,37 @@ class ExternalDataSyncCron(models.Model):
                     ('state','=','done'),('external_deleted','=',False),('external_archived','=',False),
                     ('sync_strategy_id','=',data_sync.sync_strategy_id.id)
                 ], limit=1000, order = 'next_processing_datetime')
+                # cek id external per chunk (concurrent), bukan satu request per record
+                try:
+                    existing_ids, failed_ids = data_sync.sync_strategy_id.get_external_existing_ids(
+                        datas.mapped('external_odoo_id')
+                    )
+                except Exception:
+                    _logger.exception(
+                        "Error sync from server %s, model %s",
+                        data_sync.external_app_name,
+                        data_sync.external_model,
+                    )
+                    existing_ids, failed_ids = set(), set(datas.mapped('external_odoo_id'))
+                not_deleted = datas.browse()
                 for data in datas:
-                    deleted = False
+                    if data.external_odoo_id in existing_ids or data.external_odoo_id in failed_ids:
+                        not_deleted |= data
+                        continue
                     try:
                         with self.env.cr.savepoint():
-                            deleted= data.validate_json_data_for_delete()
+                            data.mark_external_deleted()
                     except Exception:
                         _logger.exception(
                             "Error sync from server %s, model %s",
                             data_sync.external_app_name,
                             data.external_model,
                         )
-                    finally:
-                        if not deleted:
-                            data.write({
-                                'last_processing_datetime': last_sync_datetime,
-                                'next_processing_datetime': fields.Datetime.now() + datetime.timedelta(hours=1),
-                            })
+                        not_deleted |= data
+                not_deleted.write({
+                    'last_processing_datetime': last_sync_datetime,
+                    'next_processing_datetime': fields.Datetime.now() + datetime.timedelta(hours=1),
+                })
 
             if fields.Datetime.now() > limit_time:
                 break
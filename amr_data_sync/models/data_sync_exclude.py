@@ -1,8 +1,10 @@
 # -*- coding: utf-8 -*-
 
-from odoo import models, fields, _
+from odoo import api, models, fields, _
 import logging
 
+from ..tools.utils import get_cache_values, invalidate_cache_generation
+
 _logger = logging.getLogger(__name__)
 
 
@@ -21,6 +23,36 @@ Model untuk menyimpan konfigurasi exclude field atau model
     model = fields.Char(required=True)
     fields = fields.Char()
 
+    # field yang di pakai field plan strategy (get_field_plan)
+    CACHE_FIELDS = ('active', 'exclude', 'model', 'fields')
+
+    def invalidate_strategy_cache(self, field_plan=True):
+        # success hash strategy memakai write_date exclude, selalu di invalidate
+        names = ('_strategy_cache_generation', '_success_hash_cache_generation') if field_plan \
+            else ('_success_hash_cache_generation',)
+        invalidate_cache_generation(self.env['external.data.sync.strategy'], *names)
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        result = super(ExternalDataSyncExclude, self).create(vals_list)
+        # field plan strategy di cache
+        self.invalidate_strategy_cache()
+        return result
+
+    def write(self, vals):
+        cache_fields = [f for f in self.CACHE_FIELDS if f in vals]
+        before = get_cache_values(self, cache_fields)
+        result = super(ExternalDataSyncExclude, self).write(vals)
+        if self:
+            self.invalidate_strategy_cache(
+                field_plan=bool(cache_fields) and before != get_cache_values(self, cache_fields))
+        return result
+
+    def unlink(self):
+        result = super(ExternalDataSyncExclude, self).unlink()
+        self.invalidate_strategy_cache()
+        return result
+
     def get_exclude_all_fields(self):
         env = self.env
         exclude_fields = []
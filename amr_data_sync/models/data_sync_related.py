@@ -1,15 +1,13 @@
 # -*- coding: utf-8 -*-
 
-import ast
-import json
 import logging
 import traceback
 import datetime
 
 from odoo import api, fields, models, SUPERUSER_ID
-from odoo.tools import date_utils
 
-from ..tools.utils import is_callable_method
+from ..tools.fields import Json, json_dumps, json_hash
+from ..tools.utils import convert_from_external_data, is_callable_method
 
 _logger = logging.getLogger(__name__)
 
@@ -39,8 +37,9 @@ class ExternalDataSyncRelated(models.Model):
         ('draft', 'Draft'), ('process', 'Process'), ('need_resolve', 'Need Resolve'),
         ('error', 'Error'), ('done', 'Done'),
     ],default='draft')
-    data_json = fields.Text()
-    internal_data_eval = fields.Text()
+    data_json = Json()
+    data_json_hash = fields.Char(compute='_compute_data_json_hash', store=True)
+    internal_data_eval = Json()
     related_external_data_sync_id = fields.Many2one(
         'external.data.sync',
         ondelete='set null'
@@ -48,6 +47,11 @@ class ExternalDataSyncRelated(models.Model):
     mandatory_before_create = fields.Boolean()
     next_processing_datetime = fields.Datetime()
 
+    @api.depends('data_json')
+    def _compute_data_json_hash(self):
+        for rec in self:
+            rec.data_json_hash = json_hash(rec.data_json)
+
     def get_relation_data(self,name,external_data_sync):
         return self.search([('name','=',name),('external_data_sync_id','=',int(external_data_sync))])
 
@@ -59,7 +63,7 @@ class ExternalDataSyncRelated(models.Model):
             'external_data_sync_id': external_data_sync.id,
             'sync_strategy_id':sync_strategy.id,
             'internal_model': sync_strategy.internal_model,
-            'data_json': json.dumps(value)
+            'data_json': value
         })
 
     def create_many2one(self, name, external_data_sync, value, sync_strategy):
@@ -69,7 +73,7 @@ class ExternalDataSyncRelated(models.Model):
             'external_data_sync_id': external_data_sync.id,
             'sync_strategy_id': sync_strategy.id,
             'internal_model': sync_strategy.internal_model,
-            'data_json':json.dumps(value)
+            'data_json': value
         })
 
     def create_many2many(self,name,external_data_sync,value,sync_strategy):
@@ -78,7 +82,7 @@ class ExternalDataSyncRelated(models.Model):
             'field_type': 'many2many',
             'external_data_sync_id': external_data_sync.id,
             'sync_strategy_id': sync_strategy.id,
-            'data_json':json.dumps(value)
+            'data_json': value
         })
 
     def get_All_data_relation(self):
@@ -130,7 +134,7 @@ class ExternalDataSyncRelated(models.Model):
         try:
             if not self.data_json:
                 return
-            item = json.loads(self.data_json)
+            item = self.data_json
             if self.sync_strategy_id.internal_id_same_as_external:
                 internal_id_offset = self.sync_strategy_id.internal_id_offset
                 if self.field_type in ['parent','many2one']:
@@ -144,14 +148,14 @@ class ExternalDataSyncRelated(models.Model):
                         internal_data_eval = item
                     if internal_data_eval is not None:
                         internal_data_eval += internal_id_offset
-                        self.internal_data_eval = str(internal_data_eval)
+                        self.internal_data_eval = internal_data_eval
                         self.state = 'done'
                     return
                 elif self.field_type == 'many2many' and isinstance(item, list):
                     item_list = item
                     if internal_id_offset >0:
                         item_list=[i + internal_id_offset for i in item]
-                    self.internal_data_eval = str(item_list)
+                    self.internal_data_eval = item_list
                     self.state = 'done'
                     return
 
@@ -163,7 +167,7 @@ class ExternalDataSyncRelated(models.Model):
                     self.related_external_data_sync_id = external_data_sync
                     if self.related_external_data_sync_id == external_data_sync:
                         # cirular
-                        self.internal_data_eval = str(external_data_sync.internal_odoo_id)
+                        self.internal_data_eval = external_data_sync.internal_odoo_id
                         self.state = 'done'
                         return
                 else:
@@ -183,14 +187,14 @@ class ExternalDataSyncRelated(models.Model):
 
                         self.write({
                             'state': state,
-                            'internal_data_eval': str(external_data_sync.internal_odoo_id),
+                            'internal_data_eval': external_data_sync.internal_odoo_id,
                         })
                         return
                 elif item:
                     # using data lookup
                     data = self.internal_lookup(item)
                     if data:
-                        self.internal_data_eval = str(data.id)
+                        self.internal_data_eval = data.id
                         self.state = 'done'
 
             elif item:
@@ -212,7 +216,7 @@ class ExternalDataSyncRelated(models.Model):
                     if internal_ids and all(isinstance(i, int) for i in internal_ids):
                         self.write({
                             'state': state,
-                            'internal_data_eval': str(internal_ids),
+                            'internal_data_eval': internal_ids,
                         })
                     else:
                         self.write({
@@ -229,6 +233,111 @@ class ExternalDataSyncRelated(models.Model):
             _logger.error("Error process related data %s : %s", self.name, stack_trace)
             raise
 
+    def _write_grouped(self, updates):
+        # updates: {related_id: vals}, write di kelompokkan berdasarkan vals yang sama
+        groups = {}
+        for related_id, vals in updates.items():
+            group = groups.setdefault(json_dumps(vals, sort_keys=True), (vals, []))
+            group[1].append(related_id)
+        for vals, related_ids in groups.values():
+            self.browse(related_ids).write(vals)
+
+    def resolve_related_batch(self):
+        """
+        Resolve related satu page sekaligus, di kelompokkan per strategy.
+        Related yang tidak bisa di resolve di sini tetap di proses per record oleh process_data.
+        """
+        updates = {}
+        many2one_groups = {}
+        x2many_groups = {}
+        for related in self.filtered(lambda r: r.state != 'done' and r.data_json):
+            item = related.data_json
+            if not item:
+                continue
+            sync_strategy = related.sync_strategy_id
+            if sync_strategy.internal_id_same_as_external:
+                internal_id_offset = sync_strategy.internal_id_offset
+                if related.field_type in ['parent', 'many2one']:
+                    internal_id = convert_from_external_data(item).get('id')
+                    if isinstance(internal_id, int):
+                        updates[related.id] = {
+                            'internal_data_eval': internal_id + internal_id_offset,
+                            'state': 'done',
+                        }
+                    continue
+                elif related.field_type == 'many2many' and isinstance(item, list):
+                    updates[related.id] = {
+                        'internal_data_eval': [i + internal_id_offset for i in item],
+                        'state': 'done',
+                    }
+                    continue
+
+            key = (sync_strategy.id, related.internal_model, related.external_app_name)
+            if related.field_type == 'many2one' and not related.related_external_data_sync_id:
+                many2one_groups.setdefault(key, []).append((related, item))
+            elif related.field_type in ['many2many', 'one2many'] and sync_strategy and isinstance(item, list) \
+                    and all(convert_from_external_data(i).get('id') for i in item):
+                x2many_groups.setdefault(key, []).append((related, item))
+
+        ExternalDataSync = self.env['external.data.sync']
+        for key, related_items in many2one_groups.items():
+            sync_related = related_items[0][0]
+            items = [item for related, item in related_items
+                     if convert_from_external_data(item).get('id')]
+            external_data_sync_list = ExternalDataSync.relation_from_external_many(items, sync_related)
+            by_external_id = {}
+            for external_data_sync in external_data_sync_list:
+                if external_data_sync:
+                    by_external_id[external_data_sync.external_odoo_id] = external_data_sync
+
+            not_found = []
+            for related, item in related_items:
+                external_data_sync = by_external_id.get(convert_from_external_data(item).get('id'))
+                if external_data_sync:
+                    updates[related.id] = {
+                        'related_external_data_sync_id': external_data_sync.id,
+                        'internal_data_eval': external_data_sync.internal_odoo_id,
+                        'state': 'done',
+                    }
+                else:
+                    not_found.append((related, item))
+
+            if not_found and sync_related.internal_model and sync_related.external_app_name:
+                # using data lookup
+                lookup_result = self.env['external.data.lookup'].lookup_internal_many(
+                    sync_related.external_app_name, sync_related.internal_model, sync_related.internal_model,
+                    [item for related, item in not_found]
+                )
+                for related, item in not_found:
+                    data = lookup_result.get(convert_from_external_data(item).get('id'))
+                    if data:
+                        updates[related.id] = {
+                            'internal_data_eval': data.id,
+                            'state': 'done',
+                        }
+
+        for key, related_items in x2many_groups.items():
+            sync_related = related_items[0][0]
+            items = [item for related, item in related_items for item in item]
+            external_data_sync_list = iter(ExternalDataSync.relation_from_external_many(items, sync_related))
+            for related, item in related_items:
+                internal_ids = []
+                state = 'done'
+                for external_data_sync in [next(external_data_sync_list) for i in item]:
+                    if external_data_sync and external_data_sync.internal_odoo_id:
+                        internal_ids.append(external_data_sync.internal_odoo_id)
+                        if external_data_sync.state != 'done':
+                            state = 'need_resolve'
+                        continue
+                    internal_ids.append(None)
+                if internal_ids and all(isinstance(i, int) for i in internal_ids):
+                    updates[related.id] = {'state': state, 'internal_data_eval': internal_ids}
+                else:
+                    updates[related.id] = {'state': 'process', 'internal_data_eval': None}
+
+        self._write_grouped(updates)
+        return self.filtered(lambda r: r.state != 'done')
+
     def get_data_relation(self):
 
         if self.state != 'done':
@@ -237,7 +346,7 @@ class ExternalDataSyncRelated(models.Model):
             if self.field_type == 'many2one' and self.related_external_data_sync_id:
                 return self.related_external_data_sync_id.internal_odoo_id or None
             if self.internal_data_eval:
-                return ast.literal_eval(self.internal_data_eval) or None
+                return self.internal_data_eval or None
 
         return None
 
@@ -273,7 +382,7 @@ class ExternalDataSyncRelated(models.Model):
             update['field_after_create'] = False
             update['mandatory_before_create'] = True
         if value:
-            update['data_json'] = json.dumps(value, default=date_utils.json_default)
+            update['data_json'] = value
         if related_external_data_sync_id:
             update['related_external_data_sync_id'] = int(related_external_data_sync_id)
         domain = [
@@ -16,6 +16,21 @@ class ExternalServerSync(models.Model):
     app_name = fields.Char("Application Name")
     audience = fields.Char(related='app_name', store=True, readonly=False)
 
+    # field yang di pakai di cache strategy, lookup dan company
+    CACHE_FIELDS = ('app_name', 'audience', 'base_url', 'odoo_server_db', 'odoo_server_uid')
+
+    def write(self, vals):
+        cache_fields = [f for f in self.CACHE_FIELDS if f in vals and f in self._fields]
+        before = self.get_cache_values(cache_fields)
+        result = super(ExternalServerSync, self).write(vals)
+        # clear cache hanya bila nilai benar-benar berubah (misal discovery uid tiap login tidak)
+        if cache_fields and before != self.get_cache_values(cache_fields):
+            self.clear_caches()
+        return result
+
+    def get_cache_values(self, cache_fields):
+        return [tuple(rec[f] for f in cache_fields) for rec in self]
+
     def get_application_name(self):
         return self.app_name
 
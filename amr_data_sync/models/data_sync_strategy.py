@@ -3,18 +3,78 @@
 import ast
 import logging
 from collections import defaultdict
+from functools import partial
 
-from odoo import _, api, fields, models
+from odoo import _, api, fields, models, tools
 from ..tools import utils
 from odoo.exceptions import UserError
-from odoo.tools.safe_eval import safe_eval
+from odoo.addons.amr_jsonrpc import remote_async
+from odoo.addons.amr_jsonrpc.remote import OdooSession, RemoteModel
 
-from ..tools.utils import (convert_from_external_data, get_callable_method,
-                           is_callable_method,safe_call_method,call_with_savepoint)
+from ..tools.utils import (convert_from_external_data, get_cache_values, get_callable_method,
+                           invalidate_cache_generation, invalidate_safe_eval, is_callable_method,
+                           safe_call_method, call_with_savepoint, safe_eval_cached)
+from ..tools.fields import json_hash
 
 _logger = logging.getLogger(__name__)
 
 
+# =========================
+# FIELD CONVERTER
+# converter(field, sync_strategy, value, input_dict, related_data)
+# di compile sekali per field di get_field_plan
+# =========================
+def convert_boolean(field, sync_strategy, value, input_dict, related_data):
+    input_dict[field.name] = bool(value)
+
+
+def convert_date(field, sync_strategy, value, input_dict, related_data):
+    if value:
+        input_dict[field.name] = fields.Date.from_string(value) if isinstance(value, str) else value
+
+
+def convert_datetime(field, sync_strategy, value, input_dict, related_data):
+    if value:
+        input_dict[field.name] = fields.Datetime.from_string(value) if isinstance(value, str) else value
+
+
+def convert_integer(field, sync_strategy, value, input_dict, related_data):
+    if value:
+        if isinstance(value, list) and len(value) > 1:
+            # bisa jadi sebelummya dari many2one menjadi integer karena mapping di ubah
+            value = value[0]
+        input_dict[field.name] = int(value)
+
+
+def convert_company(field, sync_strategy, value, input_dict, related_data):
+    if value:
+        company = sync_strategy.lookup_company(value)
+        if company:
+            input_dict[field.name] = int(company)
+
+
+def convert_relation(field, sync_strategy, value, input_dict, related_data):
+    # di proses setelah mapping
+    if value:
+        related_data[field.name] = (field, value)
+
+
+def convert_passthrough(field, sync_strategy, value, input_dict, related_data):
+    if value:
+        input_dict[field.name] = value
+
+
+FIELD_CONVERTERS = {
+    'boolean': convert_boolean,
+    'date': convert_date,
+    'datetime': convert_datetime,
+    'integer': convert_integer,
+    'many2one': convert_relation,
+    'one2many': convert_relation,
+    'many2many': convert_relation,
+}
+
+
 class ExternalDataSyncStrategy(models.Model):
     _name = 'external.data.sync.strategy'
     _description = """
@@ -80,6 +140,15 @@ class ExternalDataSyncStrategy(models.Model):
     # 'Update Only'
     internal_id_same_as_external = fields.Boolean()
     internal_id_offset = fields.Integer()
+    internal_id_sequence_mode = fields.Selection([
+        ('resync', 'Resync Sequence'),
+        ('reserve', 'Reserve Offset Range'),
+    ], default='resync',
+        help="Resync: sequence id di majukan setelah insert id explicit.\n"
+             "Reserve: MAXVALUE sequence di batasi di bawah offset, id >= offset khusus untuk data external. "
+             "Bila id di bawah offset habis, create biasa di internal model gagal "
+             "(reached maximum value of sequence); sisa id di log (warning) setiap sync cron."
+    )
     external_sync = fields.Selection([
         ('jsonrpc', 'Json-RPC'),
         ('rest', 'Rest'),
@@ -125,6 +194,14 @@ class ExternalDataSyncStrategy(models.Model):
         ondelete='set null'
     )
 
+    # field yang di pakai get_field_plan, _lookup_strategy_id dan _lookup_strategy_by_model_id
+    CACHE_FIELDS = ('active', 'external_model', 'internal_model', 'external_app_name', 'server_sync_id',
+                    'parent_sync_strategy_id', 'exclude_fields', 'external_fields', 'after_create_fields',
+                    'relation_field_ignore')
+    _strategy_cache_generation = 0
+    # get_success_config_hash memakai write_date strategy, mapping dan exclude
+    _success_hash_cache_generation = 0
+
     # ===== COMPUTE =====
     @api.depends('server_sync_id', 'server_sync_id.app_name')
     def _compute_external_app_name(self):
@@ -190,6 +267,8 @@ class ExternalDataSyncStrategy(models.Model):
                 vals['external_app_name'] = server.get_application_name()
 
         result = super(ExternalDataSyncStrategy, self).create(vals_list)
+        invalidate_cache_generation(self, '_strategy_cache_generation', '_success_hash_cache_generation')
+        result.apply_internal_id_sequence_mode()
 
         if self._context.get('__from_sync_cron'):
             return result
@@ -222,8 +301,24 @@ class ExternalDataSyncStrategy(models.Model):
             if not server:
                 raise UserError(_("Server dengan ID %s tidak ditemukan") % vals['sync_strategy_id'])
             vals['external_app_name'] = server.get_application_name()
+        if 'eval_script' in vals:
+            for rec in self:
+                invalidate_safe_eval(rec.eval_script)
+
+        sequence_fields = {'internal_id_same_as_external', 'internal_id_offset', 'internal_id_sequence_mode',
+                           'internal_model', 'active'}
+        # internal model lama juga di hitung ulang (misal internal_model di ganti)
+        old_internal_models = set(self.mapped('internal_model')) if sequence_fields & set(vals) else set()
+        cache_fields = [f for f in self.CACHE_FIELDS if f in vals]
+        before = get_cache_values(self, cache_fields)
 
         result = super(ExternalDataSyncStrategy, self).write(vals)
+        if cache_fields and before != get_cache_values(self, cache_fields):
+            invalidate_cache_generation(self, '_strategy_cache_generation')
+        if self:
+            invalidate_cache_generation(self, '_success_hash_cache_generation')
+        if sequence_fields & set(vals):
+            self.apply_internal_id_sequence_mode(internal_models=old_internal_models)
         if self._context.get('__from_sync_cron'):
             return result
         for rec in self:
@@ -242,6 +337,14 @@ class ExternalDataSyncStrategy(models.Model):
 
         return result
 
+    def unlink(self):
+        internal_models = set(self.filtered(lambda r: r.is_internal_id_reserved()).mapped('internal_model'))
+        result = super(ExternalDataSyncStrategy, self).unlink()
+        invalidate_cache_generation(self, '_strategy_cache_generation', '_success_hash_cache_generation')
+        if internal_models:
+            self.browse().apply_internal_id_sequence_mode(internal_models=internal_models)
+        return result
+
     def get_server_sync(self):
         return self.server_sync_id or self.server_sync_id.search([('app_name', '=', self.external_app_name)], limit=1)
 
@@ -290,6 +393,62 @@ class ExternalDataSyncStrategy(models.Model):
         exclude_fields.extend(env['external.data.sync.exclude'].get_exclude_all_fields())
         return exclude_fields
 
+    @tools.ormcache('self._strategy_cache_generation', 'self.id', 'self.internal_model', 'self.env.uid',
+                    'self.env.su')
+    def get_field_plan(self):
+        """
+        Field plan per strategy, internal model, user dan mode sudo, di cache di registry.
+        Di invalidate lewat _strategy_cache_generation saat strategy, mapping atau exclude berubah.
+        Hasil di share antar call, jangan di ubah.
+        """
+        model_object = self.env[self.internal_model]
+        _fields = model_object._fields
+        mapping_fields = self.get_mapping_fields()
+        exclude_fields = set(self.get_exclude_fields())
+        exclude_fields.update(m.key_name for m in mapping_fields.values())
+        exclude_fields.update(mapping_fields.keys())
+        fields_write_able = set(model_object.check_field_access_rights('write', None))
+
+        accept_fields = frozenset(
+            k for k in fields_write_able
+            if k in _fields and k not in exclude_fields and not (_fields[k].compute or _fields[k].related)
+        )
+        include_fields = frozenset(self.get_include_fields())
+        converters = {}
+        for k in accept_fields:
+            f = _fields[k]
+            if f.name == 'company_id' and f.type == 'many2one':
+                converter = convert_company
+            elif f.relational and k not in include_fields and not f.required and self.relation_field_ignore:
+                continue
+            else:
+                converter = FIELD_CONVERTERS.get(f.type, convert_passthrough)
+            converters[k] = partial(converter, f)
+        return {
+            'accept_fields': accept_fields,
+            'converters': converters,
+            'include_fields': include_fields,
+            'after_create_fields': frozenset(self.get_after_create_fields()),
+            'mapping_fields': tuple(
+                (k, m.id) for k, m in mapping_fields.items() if k in fields_write_able and k in _fields
+            ),
+        }
+
+    @tools.ormcache('self._success_hash_cache_generation', 'self.id')
+    def get_success_config_hash(self):
+        """
+        Hash konfigurasi yang mempengaruhi hasil process_data: strategy, mapping dan exclude.
+        Di cache di registry, di invalidate lewat _success_hash_cache_generation
+        saat strategy, mapping atau exclude berubah.
+        """
+        mappings = self.with_context(active_test=False).line_mapping_ids
+        excludes = self.env['external.data.sync.exclude'].sudo().with_context(active_test=False).search([])
+        return json_hash([
+            self.id, self.write_date,
+            sorted((m.id, m.write_date) for m in mappings),
+            sorted((e.id, e.write_date) for e in excludes),
+        ])
+
     def get_internal_lookup_fields(self):
         field_list = []
         if self.internal_lookup_fields:
@@ -341,7 +500,25 @@ class ExternalDataSyncStrategy(models.Model):
             external_app_name=None,
             external_model=None
     ):
-        if parent_sync_strategy:
+        strategy_id = self._lookup_strategy_id(
+            internal_model, external_model or False,
+            parent_sync_strategy.id if parent_sync_strategy else False,
+            server_sync.id if server_sync else False,
+            external_app_name or False,
+        )
+        return self.browse(strategy_id)
+
+    @tools.ormcache('self._strategy_cache_generation', 'self.env.uid', 'self.env.su',
+                    "self._context.get('active_test', True)", 'internal_model', 'external_model',
+                    'parent_sync_strategy_id', 'server_sync_id', 'external_app_name')
+    def _lookup_strategy_id(self, internal_model, external_model, parent_sync_strategy_id, server_sync_id,
+                            external_app_name):
+        # hasil lookup_strategy di cache di registry, di invalidate saat strategy berubah.
+        # search tergantung user (record rule), sudo dan active_test, jadi masuk key
+        strategy = self.browse()
+        server_sync = self.env['external.server.sync'].browse(server_sync_id)
+        if parent_sync_strategy_id:
+            parent_sync_strategy = self.browse(parent_sync_strategy_id)
             strategy = self.search([
                 ('external_model', '=', external_model),
                 ('internal_model', '=', internal_model),
@@ -371,7 +548,32 @@ class ExternalDataSyncStrategy(models.Model):
                 ('external_app_name', '=', external_app_name),
             ], limit=1)
 
-        return strategy or self.browse()
+        return strategy.id
+
+    @tools.ormcache('self._strategy_cache_generation', 'self.env.uid', 'self.env.su',
+                    "self._context.get('active_test', True)", 'external_app_name', 'external_model', 'internal_model')
+    def _lookup_strategy_by_model_id(self, external_app_name, external_model, internal_model):
+        return self.search([
+            ('external_app_name', '=', external_app_name),
+            ('external_model', '=', external_model),
+            ('internal_model', '=', internal_model)], limit=1).id
+
+    def lookup_strategy_by_model(self, external_app_name, external_model, internal_model):
+        return self.browse(self._lookup_strategy_by_model_id(
+            external_app_name or False, external_model or False, internal_model or False
+        ))
+
+    def preresolve_relation_strategies(self):
+        # isi cache lookup_strategy untuk semua field relasi, di panggil di awal batch
+        for sync_strategy in self:
+            if not sync_strategy.internal_model or sync_strategy.internal_model not in self.env:
+                continue
+            for field in self.env[sync_strategy.internal_model]._fields.values():
+                if field.relational:
+                    sync_strategy.lookup_strategy(
+                        field.comodel_name, parent_sync_strategy=sync_strategy,
+                        external_app_name=sync_strategy.external_app_name
+                    )
 
     def lookup_company(self,external_data):
         if not external_data:
@@ -386,67 +588,27 @@ class ExternalDataSyncStrategy(models.Model):
             _fields = model_object._fields
 
             input_dict = {}
-            include_fields = self.get_include_fields()
-            exclude_fields = self.get_exclude_fields()
-            mapping_fields = self.get_mapping_fields()
-            after_create_fields = self.get_after_create_fields()
-            exclude_fields.extend([m.key_name for m in mapping_fields.values()])
-            exclude_fields.extend(mapping_fields.keys())
-
-            fields_write_able = model_object.check_field_access_rights('write', None)
+            plan = self.get_field_plan()
+            converters = plan['converters']
+            after_create_fields = plan['after_create_fields']
+            Mapping = self.env['external.data.mapping']
 
             related_data_process_after_mapping = {}
             for k, v in item.items():
-                if k not in fields_write_able or k not in _fields or k in exclude_fields:
-                    _logger.info("%s not write able",k)
-                    continue
-                f = _fields[k]
-
-                if f.compute or f.related:
-                    _logger.info("%s compute or related", k)
-                    continue
-
-                if f.type == 'boolean':
-                    input_dict[k] = bool(v)
-                    continue
-                if not v:
-                    _logger.info("%s empty data %s", k,v)
-                    continue
-                if f.name == 'company_id' and f.type == 'many2one':
-                    company = self.lookup_company(v)
-                    if company:
-                        input_dict[k] = int(company)
-                    continue
-                if f.type in ['many2one', 'one2many', 'many2many']:
-                    if k in include_fields:
-                        _logger.info("Process relation field %s.%s", self.internal_model, k)
-                    elif not f.required and self.relation_field_ignore:
-                        continue
-                    related_data_process_after_mapping[k] = (f, v)
-                    continue
-                elif f.type in ['date', 'datetime']:
-                    if isinstance(v, str):
-                        v = fields.Date.from_string(v) if f.type == 'date' else fields.Datetime.from_string(v)
-                elif f.type in ['integer']:
-                    if isinstance(v, list) and len(v) > 1:
-                        # bisa jadi sebelummya dari many2one menjadi integer karena mapping di ubah
-                        v = v[0]
-                    v = int(v)
-
-                input_dict[k] = v
-            for k, m in mapping_fields.items():
-                if k in fields_write_able and k in _fields:
-                    field = _fields[k]
-                    input_dict[k] = m.mapping_data(
-                        item, model=model_object, parent_data_sync=parent_object, field=field
-                    )
+                convert = converters.get(k)
+                if convert:
+                    convert(self, v, input_dict, related_data_process_after_mapping)
+            for k, mapping_id in plan['mapping_fields']:
+                input_dict[k] = Mapping.browse(mapping_id).mapping_data(
+                    item, model=model_object, parent_data_sync=parent_object, field=_fields[k]
+                )
             eval_script = self.eval_script and self.eval_script.strip()
             if eval_script:
                 try:
                     eval_context = {'env': self.env, 'model': model_object, 'external_data': item,
                                     'input_dict': input_dict}
                     # nocopy allows to return 'action'
-                    safe_eval(self.eval_script.strip(), eval_context, mode="exec", nocopy=True)
+                    safe_eval_cached(eval_script, eval_context, mode="exec")
                     input_dict.update(eval_context.get('input_dict') or {})
                 except Exception as e:
                     raise ValueError(f"Error evaluating script: {e}")
@@ -521,6 +683,7 @@ class ExternalDataSyncStrategy(models.Model):
             'fields': fields_list,
             'context': context,
             'domain': domain,
+            'keyset': True,
         }
         return config
 
@@ -554,13 +717,13 @@ class ExternalDataSyncStrategy(models.Model):
     def sync_list_model_object(self):
         # ModelObject = self.sync_list_model_object()
         self_internal = self.ensure_internal_context()
-
-        def callback(item, **kwargs):
-            self_internal.env['external.data.sync'].data_from_external(item, self_internal)
+        ExternalDataSync = self_internal.env['external.data.sync']
 
         kwargs = self.prepare_sync_list_dict() or {}
         with self.server_sync_id.create_remote_model(self.external_model, **kwargs) as ModelObject:
-            ModelObject.external_data_callback(callback)
+            # page berikutnya di ambil selama page saat ini di simpan
+            for page in ModelObject.iter_pages(read_ahead=True):
+                ExternalDataSync.data_from_external_batch(page, self_internal)
 
     def get_external_one_data(self, object_id):
         # ModelObject = self.sync_one_model_object(object_id)
@@ -572,6 +735,82 @@ class ExternalDataSyncStrategy(models.Model):
                 return result[0]
             return result
 
+    def get_external_many_data(self, object_ids, chunk_size=200):
+        # read beberapa id sekaligus dalam satu session, hasil: {external_id: data}
+        # chunk yang gagal di lewati, id nya tidak ada di hasil
+        result = {}
+        if not object_ids:
+            return result
+        kwargs = self.prepare_sync_one_dict()
+        with self.server_sync_id.create_remote_model(self.external_model, **kwargs) as ModelObject:
+            ids_chunks = [object_ids[i:i + chunk_size] for i in range(0, len(object_ids), chunk_size)]
+            for ids, rows in zip(ids_chunks, ModelObject.read_many(ids_chunks)):
+                if isinstance(rows, Exception):
+                    _logger.error("Error read external data %s %s: %s", self.external_model, ids, rows)
+                    continue
+                for row in rows or []:
+                    if isinstance(row, dict) and row.get('id'):
+                        result[row['id']] = row
+        return result
+
+    def get_external_existing_ids(self, object_ids, chunk_size=200):
+        """
+        Cek id external yang masih ada (termasuk archived) dengan search_read id in chunk.
+        Id yang tidak kembali belum tentu terhapus (bisa tidak terlihat karena record rule),
+        jadi di konfirmasi dengan read per id: read id yang hilang return kosong, id yang tidak
+        bisa di akses return error.
+        Request di kirim concurrent lewat transport async bila tersedia.
+        return (existing_ids, failed_ids), failed_ids: id yang gagal di cek.
+        """
+        existing_ids, failed_ids = set(), set()
+        if not object_ids:
+            return existing_ids, failed_ids
+        kwargs = self.prepare_sync_one_dict()
+        kwargs['context'] = dict(kwargs.get('context') or {}, active_test=False)
+        ids_chunks = [object_ids[i:i + chunk_size] for i in range(0, len(object_ids), chunk_size)]
+
+        async def search_async(model, ids):
+            return await model.search_read(domain=[('id', 'in', ids)], fields=['id'], limit=len(ids))
+
+        async def read_async(model, ids):
+            return await model.read(ids, fields=['id'])
+
+        with self.server_sync_id.create_remote_model(self.external_model, **kwargs) as ModelObject:
+            session = getattr(ModelObject, 'session', None)
+            use_async = remote_async.is_available() and isinstance(ModelObject, RemoteModel) \
+                and isinstance(session, OdooSession)
+
+            def run(func, async_func, items):
+                if use_async:
+                    return remote_async.gather(session, self.external_model, async_func, items, **kwargs)
+                results = []
+                for ids in items:
+                    try:
+                        results.append(func(ids))
+                    except Exception as e:
+                        results.append(e)
+                return results
+
+            def collect(items, results):
+                for ids, rows in zip(items, results):
+                    if isinstance(rows, Exception):
+                        _logger.error("Error check external ids %s %s: %s", self.external_model, ids, rows)
+                        failed_ids.update(ids)
+                        continue
+                    existing_ids.update(row['id'] for row in rows or [] if isinstance(row, dict))
+
+            collect(ids_chunks, run(
+                lambda ids: ModelObject.search_read(domain=[('id', 'in', ids)], fields=['id'], limit=len(ids)),
+                search_async, ids_chunks,
+            ))
+            missing_chunks = [[object_id] for object_id in object_ids
+                              if object_id not in existing_ids and object_id not in failed_ids]
+            if missing_chunks:
+                collect(missing_chunks, run(
+                    lambda ids: ModelObject.read(ids, fields=['id']), read_async, missing_chunks,
+                ))
+        return existing_ids, failed_ids
+
     @api.model
     def method_call_sync_from_application_server(self):
         model = self.env[self.internal_model]
@@ -620,11 +859,8 @@ class ExternalDataSyncStrategy(models.Model):
                 'sync_strategy': self,
                 'prepare': prepare_dict,
             }
-            safe_eval(
-                eval_script,
-                eval_context, mode="exec",
-                nocopy=True,  # nocopy allows to return 'prepare'
-            )
+            # nocopy allows to return 'prepare'
+            safe_eval_cached(eval_script, eval_context, mode="exec")
             return eval_context.get('prepare')
         except Exception as e:
             raise ValueError(f"Error evaluating script: {e}")
@@ -663,6 +899,35 @@ class ExternalDataSyncStrategy(models.Model):
 
         return result_map, not_mapped_ids
 
+    def is_internal_id_reserved(self):
+        return self.internal_id_same_as_external and self.internal_id_sequence_mode == 'reserve'
+
+    def apply_internal_id_sequence_mode(self, internal_models=None):
+        """
+        MAXVALUE sequence id di hitung per internal model dari semua strategy reserve di model tersebut
+        (offset terkecil). Bila tidak ada lagi strategy reserve, sequence kembali NO MAXVALUE.
+        """
+        for rec in self.filtered(lambda r: r.is_internal_id_reserved()):
+            if rec.internal_id_offset <= 0:
+                raise UserError(_("Reserve Offset Range membutuhkan Offset External Id > 0 (%s)") % rec.display_name)
+        internal_models = set(internal_models or ()) | set(self.mapped('internal_model'))
+        for internal_model in internal_models:
+            if not internal_model or internal_model not in self.env:
+                continue
+            reserved = self.search([('internal_model', '=', internal_model)]).filtered(
+                lambda r: r.is_internal_id_reserved() and r.internal_id_offset > 0)
+            Model = self.env[internal_model]
+            if reserved:
+                utils.reserve_id_sequence(Model, min(reserved.mapped('internal_id_offset')))
+            else:
+                utils.release_id_sequence(Model)
+
+    def check_internal_id_sequence_headroom(self):
+        # log warning sisa id sequence sebelum MAXVALUE untuk strategy reserve
+        for internal_model in set(self.filtered(lambda r: r.is_internal_id_reserved()).mapped('internal_model')):
+            if internal_model in self.env:
+                utils.check_id_sequence_headroom(self.env[internal_model])
+
     def get_internal_id_same_as_external(self, item):
         item_dict = {}
         if isinstance(item, list):
@@ -681,8 +946,7 @@ class ExternalDataSyncStrategy(models.Model):
 
     def get_or_create_relation_from_external(self, list_of_int_or_dict, sync_related):
         # Create for many2many or one2many
-        return [self.env['external.data.sync'].relation_from_external(item, sync_related) for item in
-                list_of_int_or_dict]
+        return self.env['external.data.sync'].relation_from_external_many(list_of_int_or_dict, sync_related)
 
     def call_internal_process_method(self, existing, item, input_dict, data_sync):
         """
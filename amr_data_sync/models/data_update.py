@@ -6,6 +6,8 @@ import logging
 
 from odoo import api, models, fields
 
+from ..tools.fields import content_hash
+
 _logger = logging.getLogger(__name__)
 
 
@@ -104,6 +106,14 @@ class ExternalDataUpdate(models.Model):
                             return
                         data.write({'external_last_update': write_date})
                     _logger.info("Without Company %s .", data)
+                    if data.state == 'done' and data.is_unchanged_from_external(content_hash(item)):
+                        _logger.info("Data tidak berubah %s .", data)
+                        self.write({
+                            'state': 'done',
+                            'data_id': data.id,
+                            'error_message': False
+                        })
+                        return
                 data.dispatch_process()
                 self.write({
                     'state': 'done',
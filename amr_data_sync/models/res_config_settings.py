@@ -12,3 +12,11 @@ class ResConfigSettings(models.TransientModel):
         ('secure_log', 'Secure Log'),
         ('not_secure', 'Not Secure'),
     ], "Security Op.", config_parameter='amr_data_sync.date_update_security_option', default='secure_log')
+    amr_process_workers = fields.Integer(
+        "Process Workers", config_parameter='amr_data_sync.process_workers', default=0,
+        help="Jumlah worker paralel untuk cron process data, 0 atau 1 berarti serial."
+    )
+    amr_process_chunk_size = fields.Integer(
+        "Process Chunk Size", config_parameter='amr_data_sync.process_chunk_size', default=50,
+        help="Jumlah data per chunk yang di proses dan di commit oleh satu worker."
+    )
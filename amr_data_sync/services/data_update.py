@@ -44,8 +44,7 @@ class DataUpdateService(models.AbstractModel):
         if company_id and isinstance(company_id, list):
             company_id = company_id[0]
         if company_id:
-            external_company = self.env["external.data.company"].search(
-                [('server_sync_id.base_url', '=', issuer), ('external_id', '=', company_id)])
+            external_company = self.env["external.data.company"].lookup_company_by_issuer(issuer, company_id)
             if external_company.company_id:
                 prepare_dict['company_id'] = external_company.company_id.id
 
@@ -0,0 +1,19 @@
+# -*- coding: utf-8 -*-
+
+from . import test_data_from_external_batch
+from . import test_prefetch
+from . import test_unique_data_sync
+from . import test_process_parallel
+from . import test_field_plan
+from . import test_field_converters
+from . import test_safe_eval_cache
+from . import test_data_lookup
+from . import test_data_company
+from . import test_lookup_strategy
+from . import test_relation_many
+from . import test_resolve_related_batch
+from . import test_success_hash
+from . import test_insert_same_as_external
+from . import test_id_sequence
+from . import test_external_existing_ids
+from . import test_json_field
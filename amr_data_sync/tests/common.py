@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*-
+
+from contextlib import contextmanager
+from unittest.mock import patch
+
+from odoo.tests.common import SavepointCase
+
+
+class DataSyncCase(SavepointCase):
+    """ server + strategy res.partner -> res.partner, tanpa koneksi ke server external """
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.DataSync = cls.env['external.data.sync']
+        cls.Strategy = cls.env['external.data.sync.strategy']
+        cls.server = cls.env['external.server.sync'].create({
+            'name': 'Test Server',
+            'app_name': 'test_app',
+            'base_url': 'http://external.test',
+        })
+        cls.strategy = cls.Strategy.create({
+            'server_sync_id': cls.server.id,
+            'external_model': 'res.partner',
+            'internal_model': 'res.partner',
+            'strategy': 'external_cud',
+        })
+
+    @contextmanager
+    def patch_model(self, model_name, method, **kwargs):
+        """ patch method di class registry model (berlaku untuk semua record model tersebut) """
+        with patch.object(type(self.env[model_name]), method, **kwargs) as mock:
+            yield mock
+
+    def create_data_sync(self, external_odoo_id, **vals):
+        vals.setdefault('sync_strategy_id', self.strategy.id)
+        vals.setdefault('external_odoo_id', external_odoo_id)
+        return self.DataSync.create([vals])
@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+
+from odoo.tests import tagged
+
+from .common import DataSyncCase
+
+
+@tagged('post_install', '-at_install')
+class TestDataCompany(DataSyncCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.DataCompany = cls.env['external.data.company']
+        cls.company = cls.env.ref('base.main_company')
+        cls.company_b = cls.env['res.company'].create({'name': 'Company B Sync'})
+        cls.DataCompany.create([
+            {'company_id': cls.company.id, 'server_sync_id': cls.server.id, 'external_id': 11},
+            {'company_id': cls.company_b.id, 'server_sync_id': cls.server.id, 'external_id': 12},
+        ])
+
+    def test_lookup_company(self):
+        DataCompany = self.DataCompany
+        self.assertEqual(DataCompany.lookup_company([12, 'B'], external_app_name='test_app'), self.company_b)
+        # app name lain, fallback ke app name server
+        self.assertEqual(
+            DataCompany.lookup_company({'id': 11}, server_sync=self.server, external_app_name='other'),
+            self.company
+        )
+        self.assertFalse(DataCompany.lookup_company(13, external_app_name='test_app'))
+        with self.assertQueryCount(0):
+            DataCompany.lookup_company(11, external_app_name='test_app')
+
+    def test_cache_cleared_on_change(self):
+        self.assertFalse(self.DataCompany.lookup_company(13, external_app_name='test_app'))
+        mapping = self.DataCompany.create({
+            'company_id': self.company_b.id, 'server_sync_id': self.server.id, 'external_id': 13,
+        })
+        self.assertEqual(self.DataCompany.lookup_company(13, external_app_name='test_app'), self.company_b)
+        mapping.external_id = 14
+        self.assertFalse(self.DataCompany.lookup_company(13, external_app_name='test_app'))
+
+    def test_reverse_mapping(self):
+        companies = self.company | self.company_b
+        mapped, not_mapped = self.DataCompany.reverse_mapping(companies, server_sync=self.server)
+        self.assertEqual(mapped, {self.company.id: [11], self.company_b.id: [12]})
+        self.assertFalse(not_mapped)
+
+    def test_lookup_by_issuer(self):
+        row = self.DataCompany.lookup_company_by_issuer('http://external.test', 12)
+        self.assertEqual(row.company_id, self.company_b)
+        self.assertFalse(self.DataCompany.lookup_company_by_issuer('http://other.test', 12))
+
+    def test_write_invalidates_only_company_map(self):
+        mapping = self.DataCompany.search([('external_id', '=', 12)])
+        self.DataCompany.lookup_company(12, external_app_name='test_app')
+        with self.patch_model('external.data.company', 'clear_caches') as clear_caches:
+            # nilai sama, cache tetap
+            mapping.write({'external_id': 12, 'company_id': self.company_b.id})
+            with self.assertQueryCount(0):
+                self.assertEqual(self.DataCompany.lookup_company(12, external_app_name='test_app'), self.company_b)
+            mapping.write({'active': False})
+            self.assertFalse(self.DataCompany.lookup_company(12, external_app_name='test_app'))
+            clear_caches.assert_not_called()
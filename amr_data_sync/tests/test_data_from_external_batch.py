@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+
+from unittest.mock import patch
+
+from odoo.tests import tagged
+
+from ..tools import utils
+from ..tools.fields import content_hash
+from .common import DataSyncCase
+
+
+@tagged('post_install', '-at_install')
+class TestDataFromExternalBatch(DataSyncCase):
+
+    def test_create_and_update_page(self):
+        existing = self.create_data_sync(1, state='done', display_name='Old 1') \
+            | self.create_data_sync(2, state='done', display_name='Old 2')
+        items = [
+            {'id': 1, 'display_name': 'New 1', 'write_date': '2024-01-01 00:00:00'},
+            {'id': 2, 'display_name': 'New 2'},
+            {'id': 3, 'display_name': 'New 3'},
+            {'id': 3, 'display_name': 'Duplicate 3'},
+        ]
+        with patch('odoo.addons.amr_data_sync.models.data_sync.update_values_sql',
+                   wraps=utils.update_values_sql) as mock_used:
+            result = self.DataSync.data_from_external_batch(items, self.strategy, need_get_data_json=False)
+
+        # semua record yang berubah dalam satu UPDATE
+        self.assertEqual(mock_used.call_count, 1)
+        self.assertEqual(sorted(mock_used.call_args[0][1]), existing.ids)
+
+        self.assertEqual(len(result), 3)
+        rec1, rec2 = existing
+        self.assertEqual(rec1.state, 'process')
+        self.assertEqual(rec1.display_name, 'New 1')
+        self.assertEqual(rec2.display_name, 'New 2')
+        self.assertEqual(str(rec1.external_last_update), '2024-01-01 00:00:00')
+        self.assertFalse(rec2.external_last_update)
+        self.assertEqual(rec1.data_json['display_name'], 'New 1')
+        # field compute ikut di hitung ulang
+        self.assertEqual(rec1.data_json_hash, content_hash(items[0]))
+
+        created = result - existing
+        self.assertEqual(created.external_odoo_id, 3)
+        self.assertEqual(created.display_name, 'New 3')
+
+    def test_skip_not_newer(self):
+        rec = self.create_data_sync(
+            5, state='done', internal_odoo_id=self.env.user.partner_id.id,
+            external_last_update='2024-02-01 00:00:00', display_name='Keep',
+        )
+        self.DataSync.data_from_external_batch(
+            [{'id': 5, 'display_name': 'Older', 'write_date': '2024-01-01 00:00:00'}], self.strategy,
+            need_get_data_json=False,
+        )
+        self.assertEqual(rec.state, 'done')
+        self.assertEqual(rec.display_name, 'Keep')
+
+    def test_update_values_sql(self):
+        rec1 = self.create_data_sync(7)
+        rec2 = self.create_data_sync(8)
+        utils.update_values_sql(self.DataSync, {
+            rec1.id: {'display_name': 'A', 'data_json': {'id': 7}, 'need_get_data_json': False},
+            rec2.id: {'display_name': 'B', 'data_json': [8, 'B'], 'need_get_data_json': True},
+        })
+        self.assertEqual((rec1.display_name, rec2.display_name), ('A', 'B'))
+        self.assertEqual(rec1.data_json, {'id': 7})
+        self.assertEqual(rec2.data_json, [8, 'B'])
+        self.assertEqual(rec1.data_json_hash, content_hash({'id': 7}))
+        self.assertFalse(rec2.data_json_hash)
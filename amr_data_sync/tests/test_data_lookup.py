@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+
+from odoo.tests import tagged
+
+from .common import DataSyncCase
+
+
+@tagged('post_install', '-at_install')
+class TestDataLookup(DataSyncCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.Lookup = cls.env['external.data.lookup']
+        cls.partner_a = cls.env['res.partner'].create({'name': 'Lookup A'})
+        cls.partner_b = cls.env['res.partner'].create({'name': 'Lookup B'})
+        cls.partner_any = cls.env['res.partner'].create({'name': 'Lookup Any'})
+        cls.create_lookup(cls.partner_a, external_id=7, name='Seven')
+        cls.create_lookup(cls.partner_b, external_id=7, name='Tujuh')
+        cls.create_lookup(cls.partner_any, external_id=9, name='Nine', external_app_name='*')
+
+    @classmethod
+    def create_lookup(cls, record, **vals):
+        vals.setdefault('server_sync_id', cls.server.id)
+        return cls.Lookup.create({
+            'external_model': 'res.partner',
+            'internal_ref': '%s,%s' % (record._name, record.id),
+            **vals,
+        })
+
+    def lookup(self, external_id=None, display_name=None):
+        return self.Lookup.lookup_internal('test_app', 'res.partner', 'res.partner', external_id, display_name)
+
+    def test_lookup_cascade(self):
+        self.assertEqual(self.lookup(7, 'Tujuh'), self.partner_b)
+        # id saja, record pertama
+        self.assertEqual(self.lookup(7), self.partner_a)
+        self.assertEqual(self.lookup(display_name='Tujuh'), self.partner_b)
+        # fallback application '*'
+        self.assertEqual(self.lookup(9), self.partner_any)
+        self.assertFalse(self.lookup(99, 'Tidak Ada'))
+
+    def test_lookup_without_query(self):
+        self.lookup(7)
+        with self.assertQueryCount(0):
+            self.assertEqual(self.lookup(7, 'Seven'), self.partner_a)
+
+    def test_cache_cleared_on_change(self):
+        self.assertFalse(self.lookup(8))
+        partner = self.env['res.partner'].create({'name': 'Lookup C'})
+        lookup = self.create_lookup(partner, external_id=8, name='Eight')
+        self.assertEqual(self.lookup(8), partner)
+        lookup.unlink()
+        self.assertFalse(self.lookup(8))
+
+    def test_lookup_many(self):
+        result = self.Lookup.lookup_internal_many(
+            'test_app', 'res.partner', 'res.partner', [[7, 'Tujuh'], {'id': 9}, 99]
+        )
+        self.assertEqual(result, {7: self.partner_b, 9: self.partner_any})
+
+    def test_write_invalidates_only_lookup_index(self):
+        lookup = self.Lookup.search([('external_id', '=', 7), ('name', '=', 'Seven')])
+        self.lookup(7)
+        with self.patch_model('external.data.lookup', 'clear_caches') as clear_caches:
+            # field yang tidak di pakai index, cache tetap
+            lookup.write({'reverse_able': True})
+            with self.assertQueryCount(0):
+                self.assertEqual(self.lookup(7), self.partner_a)
+            # nilai sama, cache tetap
+            lookup.write({'name': 'Seven'})
+            with self.assertQueryCount(0):
+                self.lookup(7)
+            lookup.write({'active': False})
+            self.assertEqual(self.lookup(7), self.partner_b)
+            clear_caches.assert_not_called()
@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+
+from unittest.mock import patch
+
+from odoo.tests import tagged
+
+from odoo.addons.amr_jsonrpc import remote_async
+
+from .common import DataSyncCase
+
+
+class FakeRemote:
+    """ search_read hanya return id visible, read id yang tidak bisa di akses raise error """
+
+    def __init__(self, visible, readable, forbidden):
+        self.visible = set(visible)
+        self.readable = set(readable)
+        self.forbidden = set(forbidden)
+        self.read_calls = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+    def search_read(self, domain=None, fields=None, limit=None, **kwargs):
+        ids = domain[0][2]
+        return [{'id': i} for i in ids if i in self.visible]
+
+    def read(self, ids, fields=None):
+        self.read_calls.append(list(ids))
+        if self.forbidden.intersection(ids):
+            raise RuntimeError("odoo.exceptions.AccessError")
+        return [{'id': i} for i in ids if i in self.visible | self.readable]
+
+
+@tagged('post_install', '-at_install')
+class TestExternalExistingIds(DataSyncCase):
+
+    def existing_ids(self, fake, object_ids):
+        with patch.object(remote_async, 'is_available', return_value=False), \
+                self.patch_model('external.server.sync', 'create_remote_model', return_value=fake):
+            return self.strategy.get_external_existing_ids(object_ids)
+
+    def test_missing_ids_confirmed(self):
+        # 1 visible, 2 tidak bisa di akses (record rule), 3 terhapus, 4 tidak ikut search tapi bisa di read
+        fake = FakeRemote(visible=[1], readable=[4], forbidden=[2])
+        existing_ids, failed_ids = self.existing_ids(fake, [1, 2, 3, 4])
+        self.assertEqual(existing_ids, {1, 4})
+        self.assertEqual(failed_ids, {2})
+        # hanya id yang tidak kembali di konfirmasi, per id
+        self.assertEqual(fake.read_calls, [[2], [3], [4]])
+
+    def test_all_returned_no_confirmation(self):
+        fake = FakeRemote(visible=[1, 2], readable=[], forbidden=[])
+        existing_ids, failed_ids = self.existing_ids(fake, [1, 2])
+        self.assertEqual(existing_ids, {1, 2})
+        self.assertFalse(failed_ids)
+        self.assertFalse(fake.read_calls)
+
+
+class FakeManyRemote(FakeRemote):
+
+    def read_many(self, ids_chunks, fields=None):
+        results = []
+        for ids in ids_chunks:
+            try:
+                results.append(self.read(ids, fields=fields))
+            except Exception as e:
+                results.append(e)
+        return results
+
+
+@tagged('post_install', '-at_install')
+class TestExternalManyData(DataSyncCase):
+
+    def test_failed_chunk_skipped(self):
+        fake = FakeManyRemote(visible=[1, 2, 4], readable=[], forbidden=[3])
+        with self.patch_model('external.server.sync', 'create_remote_model', return_value=fake):
+            result = self.strategy.get_external_many_data([1, 2, 3, 4], chunk_size=2)
+        # chunk [3, 4] gagal, chunk [1, 2] tetap di pakai
+        self.assertEqual(sorted(result), [1, 2])
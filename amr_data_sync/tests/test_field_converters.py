@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+
+import datetime
+
+from odoo.tests import tagged
+
+from .common import DataSyncCase
+
+
+@tagged('post_install', '-at_install')
+class TestFieldConverters(DataSyncCase):
+
+    def prepare(self, item):
+        return self.strategy.prepare_input_external(self.DataSync.browse(), item)
+
+    def test_convert_by_field_type(self):
+        input_dict = self.prepare({
+            'name': 'Partner A',
+            'active': 0,
+            'date': '2020-01-31',
+            'color': [3, 'Three'],
+            'comment': 'catatan',
+            'parent_id': False,
+            'field_tidak_ada': 1,
+        })
+        self.assertEqual(input_dict['name'], 'Partner A')
+        self.assertIs(input_dict['active'], False)
+        self.assertEqual(input_dict['date'], datetime.date(2020, 1, 31))
+        self.assertEqual(input_dict['color'], 3)
+        self.assertEqual(input_dict['comment'], 'catatan')
+        self.assertNotIn('parent_id', input_dict)
+        self.assertNotIn('field_tidak_ada', input_dict)
+
+    def test_relation_ignored_without_converter(self):
+        self.assertIn('parent_id', self.strategy.get_field_plan()['converters'])
+        self.strategy.relation_field_ignore = True
+        plan = self.strategy.get_field_plan()
+        self.assertNotIn('parent_id', plan['converters'])
+        self.assertIn('name', plan['converters'])
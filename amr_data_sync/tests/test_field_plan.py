@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+
+from odoo.tests import tagged
+
+from .common import DataSyncCase
+
+
+@tagged('post_install', '-at_install')
+class TestFieldPlan(DataSyncCase):
+
+    def test_plan_cached(self):
+        plan = self.strategy.get_field_plan()
+        self.assertIs(self.strategy.get_field_plan(), plan)
+        self.assertIn('comment', plan['accept_fields'])
+        self.assertIn('comment', plan['converters'])
+
+    def test_plan_invalidate_on_strategy_write(self):
+        plan = self.strategy.get_field_plan()
+        self.strategy.write({'exclude_fields': 'comment'})
+        new_plan = self.strategy.get_field_plan()
+        self.assertIsNot(new_plan, plan)
+        self.assertNotIn('comment', new_plan['accept_fields'])
+
+    def test_plan_key_sudo(self):
+        # uid sama, tetapi sudo() bisa melihat field yang di batasi group
+        strategy = self.strategy.with_user(self.env.ref('base.user_admin'))
+        plan = strategy.get_field_plan()
+        self.assertIs(strategy.get_field_plan(), plan)
+        self.assertIsNot(strategy.sudo().get_field_plan(), plan)
+
+    def test_plan_kept_on_unrelated_write(self):
+        plan = self.strategy.get_field_plan()
+        with self.patch_model('external.data.sync.strategy', 'clear_caches') as clear_caches:
+            self.strategy.write({'filter_last_update': True})
+            # nilai sama
+            self.strategy.write({'internal_model': 'res.partner'})
+            self.assertIs(self.strategy.get_field_plan(), plan)
+            clear_caches.assert_not_called()
+
+    def test_plan_invalidate_on_mapping_change(self):
+        mapping = self.env['external.data.mapping'].create({
+            'sync_strategy_id': self.strategy.id,
+            'name': 'Comment',
+            'internal_field': 'comment',
+            'mapping_strategy': 'field_mapping',
+        })
+        plan = self.strategy.get_field_plan()
+        self.assertIn(('comment', mapping.id), plan['mapping_fields'])
+        mapping.write({'description': 'Tidak di pakai plan'})
+        self.assertIs(self.strategy.get_field_plan(), plan)
+        mapping.write({'internal_field': 'ref'})
+        new_plan = self.strategy.get_field_plan()
+        self.assertIsNot(new_plan, plan)
+        self.assertIn(('ref', mapping.id), new_plan['mapping_fields'])
@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+
+from odoo.tests import tagged
+
+from .common import DataSyncCase
+from ..tools import utils
+
+
+@tagged('post_install', '-at_install')
+class TestIdSequence(DataSyncCase):
+
+    def setUp(self):
+        super().setUp()
+        self.Category = self.env['res.partner.category']
+        self.sequence = utils.get_id_sequence(self.Category)
+        self.default_maxvalue = utils.get_id_sequence_maxvalue(self.Category, self.sequence)[1]
+
+    def maxvalue(self):
+        return utils.get_id_sequence_maxvalue(self.Category, self.sequence)[0]
+
+    def create_strategy(self, offset, **vals):
+        return self.Strategy.create(dict({
+            'server_sync_id': self.server.id,
+            'external_model': 'res.partner.category',
+            'internal_model': 'res.partner.category',
+            'strategy': 'external_cud',
+            'internal_id_same_as_external': True,
+            'internal_id_offset': offset,
+            'internal_id_sequence_mode': 'reserve',
+        }, **vals))
+
+    def test_cap_across_strategies(self):
+        first = self.create_strategy(10000000)
+        self.assertEqual(self.maxvalue(), 10000000)
+        second = self.create_strategy(5000000)
+        self.assertEqual(self.maxvalue(), 5000000)
+        # offset lebih besar tidak menaikkan cap
+        first.internal_id_offset = 20000000
+        self.assertEqual(self.maxvalue(), 5000000)
+        second.unlink()
+        self.assertEqual(self.maxvalue(), 20000000)
+
+    def test_release_on_resync(self):
+        strategy = self.create_strategy(10000000)
+        strategy.internal_id_sequence_mode = 'resync'
+        self.assertEqual(self.maxvalue(), self.default_maxvalue)
+
+    def test_release_on_same_as_external_off(self):
+        strategy = self.create_strategy(10000000)
+        strategy.internal_id_same_as_external = False
+        self.assertEqual(self.maxvalue(), self.default_maxvalue)
+
+    def test_release_on_internal_model_change(self):
+        strategy = self.create_strategy(10000000)
+        strategy.write({'internal_model': 'res.partner.title', 'internal_id_sequence_mode': 'resync'})
+        self.assertEqual(self.maxvalue(), self.default_maxvalue)
+
+    def test_headroom_warning(self):
+        self.env.cr.execute("SELECT last_value FROM {}".format(self.sequence))
+        last_value = self.env.cr.fetchone()[0]
+        with self.assertLogs(utils.__name__, level='WARNING') as logs:
+            strategy = self.create_strategy(last_value)
+        self.assertTrue(any('reached maximum value of sequence' in line for line in logs.output))
+        self.assertEqual(utils.check_id_sequence_headroom(self.Category), 0)
+        strategy.internal_id_sequence_mode = 'resync'
+        self.assertIsNone(utils.check_id_sequence_headroom(self.Category))
@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+
+from unittest.mock import patch
+
+from odoo.tests import tagged
+
+from .common import DataSyncCase
+from ..tools import utils
+
+OFFSET = 10000000
+
+
+@tagged('post_install', '-at_install')
+class TestInsertSameAsExternal(DataSyncCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        # reserve: sequence tidak di setval, ALTER SEQUENCE ikut rollback
+        cls.category_strategy = cls.Strategy.create({
+            'server_sync_id': cls.server.id,
+            'external_model': 'res.partner.category',
+            'internal_model': 'res.partner.category',
+            'strategy': 'external_cud',
+            'internal_id_same_as_external': True,
+            'internal_id_offset': OFFSET,
+            'internal_id_sequence_mode': 'reserve',
+        })
+
+    def test_insert_data_sql_many(self):
+        Category = self.env['res.partner.category']
+        records = utils.insert_data_sql(Category, [
+            {'id': OFFSET + i, 'name': 'Category %s' % i} for i in (1, 2, 3)
+        ], resync_sequence=False)
+        self.assertEqual(records.ids, [OFFSET + 1, OFFSET + 2, OFFSET + 3])
+        with self.assertQueryCount(0):
+            self.assertEqual(records.mapped('name'), ['Category 1', 'Category 2', 'Category 3'])
+        self.assertEqual(Category.search([('id', 'in', records.ids)]), records)
+
+    def test_process_batch_one_insert(self):
+        records = self.DataSync.browse()
+        for i in (1, 2, 3):
+            records |= self.create_data_sync(
+                i, sync_strategy_id=self.category_strategy.id,
+                data_json={'id': i, 'name': 'External %s' % i}, need_get_data_json=False,
+            )
+        calls = []
+
+        def insert(model, vals_list, **kwargs):
+            calls.append([vals['id'] for vals in vals_list])
+            return utils.insert_data_sql(model, vals_list, **kwargs)
+
+        with patch('odoo.addons.amr_data_sync.models.data_sync.insert_data_sql', side_effect=insert):
+            records.dispatch_process(True)
+        # satu insert untuk semua record
+        self.assertEqual(calls, [[OFFSET + 1, OFFSET + 2, OFFSET + 3]])
+        self.assertEqual(records.mapped('state'), ['done'] * 3)
+        self.assertEqual(records.mapped('internal_odoo_id'), [OFFSET + 1, OFFSET + 2, OFFSET + 3])
+        categories = self.env['res.partner.category'].browse(records.mapped('internal_odoo_id'))
+        self.assertEqual(categories.mapped('name'), ['External 1', 'External 2', 'External 3'])
@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+
+import datetime
+
+from odoo.tests import tagged
+
+from .common import DataSyncCase
+from .test_unique_data_sync import load_migration
+
+
+@tagged('post_install', '-at_install')
+class TestJsonField(DataSyncCase):
+
+    def db_value(self, record, column='data_json'):
+        record.flush()
+        self.env.cr.execute(
+            'SELECT jsonb_typeof("{0}"), "{0}" FROM "{1}" WHERE id = %s'.format(column, record._table),
+            (record.id,)
+        )
+        return self.env.cr.fetchone()
+
+    def assertRoundTrip(self, record, value, json_type):
+        self.assertEqual(record.data_json, value)
+        self.assertEqual(self.db_value(record), (json_type, value))
+        record.invalidate_cache(['data_json'], record.ids)
+        self.assertEqual(record.data_json, value)
+
+    def test_round_trip(self):
+        for value, json_type in [
+            ({'id': 1, 'name': 'A', 'child_ids': [2, 3]}, 'object'),
+            ([1, 'A'], 'array'),
+            (5, 'number'),
+        ]:
+            record = self.create_data_sync(1, data_json=value)
+            self.assertRoundTrip(record, value, json_type)
+            record.write({'data_json': None})
+            self.assertFalse(record.data_json)
+            record.write({'data_json': value})
+            self.assertRoundTrip(record, value, json_type)
+            record.unlink()
+
+    def test_json_text_not_double_encoded(self):
+        record = self.create_data_sync(1, data_json='{"id": 1}')
+        self.assertEqual(self.db_value(record), ('object', {'id': 1}))
+        record.write({'data_json': '[1, "A"]'})
+        self.assertEqual(self.db_value(record), ('array', [1, 'A']))
+        # json text dari UI
+        self.assertEqual(record.read(['data_json'])[0]['data_json'], '[1, "A"]')
+
+    def test_datetime_value(self):
+        record = self.create_data_sync(1)
+        record.write({'payload_json': {'date': datetime.date(2020, 1, 31)}})
+        self.assertEqual(self.db_value(record, 'payload_json'), ('object', {'date': '2020-01-31'}))
+
+    def test_migration_python_literal(self):
+        migration = load_migration('13.0.3.1.0', 'pre-migrate.py')
+        cr = self.env.cr
+        cr.execute("CREATE TEMP TABLE amr_json_migration (id serial PRIMARY KEY, value text)")
+        values = ['[1, "A"]', "[2, 'Nama O\\'Brien']", "{'id': 3, 'active': True, 'parent_id': None}",
+                  'bukan json', '']
+        for value in values:
+            cr.execute("INSERT INTO amr_json_migration (value) VALUES (%s)", (value,))
+        migration.create_is_json_function(cr)
+        migration.convert_json_column(cr, 'amr_json_migration', 'value')
+        cr.execute("SELECT jsonb_typeof(value), value FROM amr_json_migration ORDER BY id")
+        self.assertEqual(cr.fetchall(), [
+            ('array', [1, 'A']),
+            ('array', [2, "Nama O'Brien"]),
+            ('object', {'id': 3, 'active': True, 'parent_id': None}),
+            ('string', 'bukan json'),
+            (None, None),
+        ])
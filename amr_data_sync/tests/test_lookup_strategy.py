@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+
+from odoo.tests import tagged
+
+from .common import DataSyncCase
+
+
+@tagged('post_install', '-at_install')
+class TestLookupStrategy(DataSyncCase):
+
+    def lookup(self):
+        return self.Strategy.lookup_strategy('res.partner', server_sync=self.server)
+
+    def test_lookup_memoized(self):
+        self.assertEqual(self.lookup(), self.strategy)
+        with self.assertQueryCount(0):
+            self.assertEqual(self.lookup().id, self.strategy.id)
+
+    def test_strategy_change_clears_cache(self):
+        self.assertEqual(self.lookup(), self.strategy)
+        self.strategy.active = False
+        self.assertFalse(self.lookup())
+
+    def test_server_write_clears_only_on_change(self):
+        with self.patch_model('external.server.sync', 'clear_caches') as clear_caches:
+            self.server.write({'name': 'Rename', 'app_name': 'test_app', 'base_url': 'http://external.test'})
+            clear_caches.assert_not_called()
+            self.server.write({'app_name': 'test_app_2'})
+            clear_caches.assert_called_once()
+
+    def test_server_uid_discovery(self):
+        if 'odoo_server_uid' not in self.server._fields:
+            self.skipTest("odoo_server_uid tidak ada di server")
+        with self.patch_model('external.server.sync', 'clear_caches') as clear_caches:
+            self.server.write({'odoo_server_uid': 5})
+            self.assertEqual(clear_caches.call_count, 1)
+            # uid yang sama saat login ulang tidak clear cache
+            self.server.write({'odoo_server_uid': 5})
+            self.assertEqual(clear_caches.call_count, 1)
+
+    def test_lookup_key_active_test(self):
+        self.strategy.active = False
+        self.assertFalse(self.lookup())
+        # active_test=False di pemanggil pertama tidak mempengaruhi pemanggil lain (dan sebaliknya)
+        strategy = self.Strategy.with_context(active_test=False).lookup_strategy(
+            'res.partner', server_sync=self.server)
+        self.assertEqual(strategy, self.strategy)
+        self.assertFalse(self.lookup())
@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+
+from odoo.tests import tagged
+
+from .common import DataSyncCase
+
+
+@tagged('post_install', '-at_install')
+class TestPrefetchDataJson(DataSyncCase):
+
+    def test_prefetch_one_call_per_strategy(self):
+        records = self.create_data_sync(11) | self.create_data_sync(12) | self.create_data_sync(13)
+        remote = {
+            11: {'id': 11, 'name': 'A', 'write_date': '2024-01-02 03:04:05'},
+            12: {'id': 12, 'name': 'B'},
+        }
+        with self.patch_model('external.data.sync.strategy', 'get_external_many_data',
+                              return_value=remote) as mock:
+            records.prefetch_data_json()
+
+        self.assertEqual(mock.call_count, 1)
+        self.assertEqual(sorted(mock.call_args[0][0]), [11, 12, 13])
+        rec11, rec12, rec13 = records
+        self.assertFalse(rec11.need_get_data_json)
+        self.assertEqual(rec11.data_json['name'], 'A')
+        self.assertEqual(str(rec11.external_last_update), '2024-01-02 03:04:05')
+        self.assertFalse(rec12.need_get_data_json)
+        # tidak ada di external, tetap di proses per record (cek delete)
+        self.assertTrue(rec13.need_get_data_json)
+
+    def test_prefetch_error_keeps_records_pending(self):
+        records = self.create_data_sync(21)
+        with self.patch_model('external.data.sync.strategy', 'get_external_many_data',
+                              side_effect=ConnectionError("down")):
+            records.prefetch_data_json()
+        self.assertTrue(records.need_get_data_json)
+
+    def test_prefetch_skips_records_with_data(self):
+        records = self.create_data_sync(31, need_get_data_json=False, data_json={'id': 31})
+        with self.patch_model('external.data.sync.strategy', 'get_external_many_data',
+                              return_value={}) as mock:
+            records.prefetch_data_json()
+        mock.assert_not_called()
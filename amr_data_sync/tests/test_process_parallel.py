@@ -0,0 +1,29 @@
+# -*- coding: utf-8 -*-
+
+from odoo.tests import tagged
+
+from .common import DataSyncCase
+
+
+@tagged('post_install', '-at_install')
+class TestProcessParallel(DataSyncCase):
+
+    def test_claim_skip_done(self):
+        pending = self.create_data_sync(1)
+        done = self.create_data_sync(2)
+        done.write({'state': 'done', 'need_get_data_json': False})
+        refetch = self.create_data_sync(3)
+        refetch.write({'state': 'done', 'need_get_data_json': True})
+        claimed = (pending | done | refetch).claim_process_chunk()
+        self.assertEqual(claimed, pending | refetch)
+
+    def test_related_on_fresh_cursor(self):
+        self.env['ir.config_parameter'].sudo().set_param('amr_data_sync.process_workers', 2)
+        cursors = []
+        with self.patch_model('external.data.sync', 'cron_process_data_parallel') as parallel, \
+                self.patch_model('external.data.sync', 'cron_process_related_data', autospec=True,
+                                 side_effect=lambda rec, limit=1000: cursors.append(rec.env.cr)):
+            self.DataSync.cron_process_data(limit=10)
+        parallel.assert_called_once()
+        self.assertEqual(len(cursors), 1)
+        self.assertIsNot(cursors[0], self.env.cr)
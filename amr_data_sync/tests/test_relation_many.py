@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+
+from odoo.tests import tagged
+
+from .common import DataSyncCase
+
+
+@tagged('post_install', '-at_install')
+class TestRelationMany(DataSyncCase):
+
+    def setUp(self):
+        super().setUp()
+        self.parent = self.create_data_sync(100)
+        self.sync_related = self.env['external.data.sync.related'].create({
+            'name': 'child_ids',
+            'field_type': 'one2many',
+            'external_data_sync_id': self.parent.id,
+            'sync_strategy_id': self.strategy.id,
+            'internal_model': 'res.partner',
+        })
+
+    def test_order_and_single_create(self):
+        existing = self.create_data_sync(2)
+        create_origin = type(self.DataSync).create
+        with self.patch_model('external.data.sync', 'create', autospec=True, side_effect=create_origin) as create:
+            result = self.DataSync.relation_from_external_many([[3, 'Three'], 2, {'id': 4}, 3], self.sync_related)
+        # satu create untuk semua yang belum ada
+        self.assertEqual(create.call_count, 1)
+        self.assertEqual([vals['external_odoo_id'] for vals in create.call_args[0][1]], [3, 4])
+        self.assertEqual([r.external_odoo_id for r in result], [3, 2, 4, 3])
+        self.assertEqual(result[1], existing)
+        self.assertEqual(result[0], result[3])
+        self.assertEqual(result[0].name, 'Three')
+
+    def test_dispatch_existing_not_done(self):
+        draft = self.create_data_sync(5)
+        done = self.create_data_sync(6, state='done')
+        with self.patch_model('external.data.sync', 'dispatch_process', autospec=True) as dispatch:
+            self.DataSync.relation_from_external_many([5, 6], self.sync_related)
+        dispatch.assert_called_once()
+        self.assertEqual(dispatch.call_args[0][0], draft)
+        self.assertNotIn(done, dispatch.call_args[0][0])
+
+    def test_empty(self):
+        self.assertEqual(self.DataSync.relation_from_external_many([], self.sync_related), [])
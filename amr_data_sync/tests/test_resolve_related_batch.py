@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+
+from odoo.tests import tagged
+
+from .common import DataSyncCase
+
+
+@tagged('post_install', '-at_install')
+class TestResolveRelatedBatch(DataSyncCase):
+
+    def setUp(self):
+        super().setUp()
+        self.Related = self.env['external.data.sync.related']
+        self.parent = self.create_data_sync(100)
+        self.partner = self.env['res.partner'].create({'name': 'Related Done'})
+
+    def create_related(self, field_type, data_json, name='parent_id'):
+        return self.Related.create({
+            'name': name,
+            'field_type': field_type,
+            'external_data_sync_id': self.parent.id,
+            'sync_strategy_id': self.strategy.id,
+            'internal_model': 'res.partner',
+            'data_json': data_json,
+        })
+
+    def test_many2one_done(self):
+        done = self.create_data_sync(7, state='done', internal_odoo_id=self.partner.id)
+        related = self.create_related('many2one', [7, 'Seven'])
+        pending = related.resolve_related_batch()
+        self.assertFalse(pending)
+        self.assertEqual(related.state, 'done')
+        self.assertEqual(related.related_external_data_sync_id, done)
+        self.assertEqual(related.internal_data_eval, self.partner.id)
+
+    def test_many2one_lookup_fallback(self):
+        self.env['external.data.lookup'].create({
+            'server_sync_id': self.server.id,
+            'external_model': 'res.partner',
+            'external_id': 8,
+            'internal_ref': 'res.partner,%s' % self.partner.id,
+        })
+        related = self.create_related('many2one', [8, 'Eight'])
+        # strategy tanpa lookup di external.data.sync
+        related.sync_strategy_id = False
+        related.resolve_related_batch()
+        self.assertEqual(related.state, 'done')
+        self.assertEqual(related.internal_data_eval, self.partner.id)
+
+    def test_x2many_group(self):
+        partner_b = self.env['res.partner'].create({'name': 'Related B'})
+        self.create_data_sync(7, state='done', internal_odoo_id=self.partner.id)
+        self.create_data_sync(9, state='process', internal_odoo_id=partner_b.id)
+        done = self.create_related('many2many', [7], name='category_id')
+        need_resolve = self.create_related('many2many', [7, 9], name='child_ids')
+        missing = self.create_related('many2many', [7, 10], name='bank_ids')
+        pending = (done | need_resolve | missing).resolve_related_batch()
+        self.assertEqual(pending, need_resolve | missing)
+        self.assertEqual(done.internal_data_eval, [self.partner.id])
+        self.assertEqual(need_resolve.state, 'need_resolve')
+        self.assertEqual(need_resolve.internal_data_eval, [self.partner.id, partner_b.id])
+        self.assertEqual(missing.state, 'process')
+        # data sync untuk id 10 di buat sekali untuk satu group
+        self.assertEqual(self.DataSync.search_count([
+            ('sync_strategy_id', '=', self.strategy.id), ('external_odoo_id', '=', 10)]), 1)
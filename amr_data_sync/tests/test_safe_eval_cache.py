@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+
+from unittest.mock import patch
+
+from odoo.tests import tagged
+from odoo.tests.common import BaseCase
+
+from ..tools import utils
+
+
+@tagged('post_install', '-at_install')
+class TestSafeEvalCache(BaseCase):
+
+    def setUp(self):
+        super().setUp()
+        utils._safe_eval_cache.clear()
+
+    def test_compile_once(self):
+        script = "input_dict['x'] = external_data['a'] + 1"
+        with patch.object(utils, 'test_expr', wraps=utils.test_expr) as compile_mock:
+            for value in (1, 2):
+                context = {'external_data': {'a': value}, 'input_dict': {}}
+                utils.safe_eval_cached(script, context)
+                self.assertEqual(context['input_dict'], {'x': value + 1})
+        self.assertEqual(compile_mock.call_count, 1)
+
+    def test_invalidate(self):
+        script = "result = 1"
+        utils.compile_safe_eval(script)
+        self.assertEqual(len(utils._safe_eval_cache), 1)
+        utils.invalidate_safe_eval(" %s\n" % script)
+        self.assertFalse(utils._safe_eval_cache)
+
+    def test_unsafe_rejected(self):
+        with self.assertRaises(Exception):
+            utils.safe_eval_cached("__import__('os')", {})
+        self.assertFalse(utils._safe_eval_cache)
+
+    def test_lru_limit(self):
+        with patch.object(utils, 'SAFE_EVAL_CACHE_SIZE', 2):
+            for i in range(3):
+                utils.compile_safe_eval("result = %s" % i)
+        self.assertEqual(len(utils._safe_eval_cache), 2)
+        self.assertNotIn(utils._safe_eval_key("result = 0", "exec"), utils._safe_eval_cache)
@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+
+from odoo.tests import tagged
+
+from .common import DataSyncCase
+
+
+@tagged('post_install', '-at_install')
+class TestSuccessHash(DataSyncCase):
+
+    def setUp(self):
+        super().setUp()
+        self.partner = self.env['res.partner'].create({'name': 'Hash Partner'})
+        self.record = self.create_data_sync(
+            1, data_json={'id': 1, 'name': 'Hash Partner'}, need_get_data_json=False,
+        )
+        self.record.write_done_internal_odoo(self.partner)
+
+    def test_done_sets_hash(self):
+        self.assertTrue(self.record.last_success_hash)
+        self.assertTrue(self.record.is_unchanged_from_external())
+
+    def test_skip_unchanged(self):
+        self.record.dispatch_process()
+        with self.patch_model('external.data.sync.strategy', 'prepare_input_external') as prepare:
+            self.record.process_data()
+        prepare.assert_not_called()
+        self.assertEqual(self.record.state, 'done')
+
+    def test_clear_hash_not_done(self):
+        for state in ('need_resolve', 'error', 'draft'):
+            self.record.write_done_internal_odoo(self.partner)
+            self.record.write({'state': state})
+            self.assertFalse(self.record.last_success_hash, state)
+            self.assertFalse(self.record.is_unchanged_from_external())
+
+    def test_need_resolve_related_not_success(self):
+        self.env['external.data.sync.related'].create({
+            'name': 'parent_id',
+            'field_type': 'many2one',
+            'external_data_sync_id': self.record.id,
+            'sync_strategy_id': self.strategy.id,
+            'internal_model': 'res.partner',
+            'state': 'need_resolve',
+        })
+        self.record.write_done_internal_odoo(self.partner)
+        self.assertEqual(self.record.state, 'done')
+        self.assertFalse(self.record.last_success_hash)
+
+    def test_hash_mapping_and_exclude(self):
+        success_hash = self.record.get_success_hash()
+        mapping = self.env['external.data.mapping'].create({
+            'sync_strategy_id': self.strategy.id,
+            'internal_field': 'comment',
+            'key_name': 'name',
+        })
+        mapping_hash = self.record.get_success_hash()
+        self.assertNotEqual(mapping_hash, success_hash)
+        self.assertFalse(self.record.is_unchanged_from_external())
+        self.env['external.data.sync.exclude'].create({'model': 'res.partner', 'fields': 'comment'})
+        self.assertNotEqual(self.record.get_success_hash(), mapping_hash)
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+
+import importlib.util
+
+from odoo.modules.module import get_module_resource
+from odoo.tests import tagged
+
+from .common import DataSyncCase
+
+
+def load_migration(version, name):
+    path = get_module_resource('amr_data_sync', 'migrations', version, name)
+    spec = importlib.util.spec_from_file_location('amr_data_sync_migration', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@tagged('post_install', '-at_install')
+class TestUniqueDataSync(DataSyncCase):
+
+    def create_related(self, parent):
+        return self.env['external.data.sync.related'].create({
+            'name': 'category_id',
+            'field_type': 'many2many',
+            'external_data_sync_id': parent.id,
+            'sync_strategy_id': self.strategy.id,
+            'internal_model': 'res.partner',
+        })
+
+    def test_relation_many_reuses_unique_key(self):
+        parent = self.create_data_sync(1)
+        related = self.create_related(parent)
+        # key unique sama, tetapi internal_model lain (tidak ketemu lewat lookup relasi)
+        other = self.create_data_sync(2)
+        # create() selalu isi internal_model dari strategy
+        other.internal_model = 'res.users'
+        result = self.DataSync.relation_from_external_many([2, [3, 'Three'], 3], related)
+        self.assertEqual(result[0], other)
+        self.assertTrue(result[1])
+        self.assertEqual(result[1], result[2])
+        self.assertEqual(self.DataSync.search_count([
+            ('sync_strategy_id', '=', self.strategy.id), ('external_odoo_id', '=', 3)]), 1)
+
+    def test_create_missing(self):
+        first = self.create_data_sync(10)
+        result = self.DataSync.create_missing([
+            {'sync_strategy_id': self.strategy.id, 'external_odoo_id': 10},
+            {'sync_strategy_id': self.strategy.id, 'external_odoo_id': 11},
+        ])
+        self.assertIn(first, result)
+        self.assertEqual(sorted(result.mapped('external_odoo_id')), [10, 11])
+
+    def test_migration_merge_duplicates(self):
+        cr = self.env.cr
+        cr.execute("ALTER TABLE external_data_sync DROP CONSTRAINT IF EXISTS "
+                   "external_data_sync_sync_strategy_external_odoo_id_uniq")
+        keep = self.create_data_sync(20)
+        duplicate = self.create_data_sync(20)
+        done = self.create_data_sync(21)
+        done_duplicate = self.create_data_sync(21, state='done', internal_odoo_id=self.env.user.partner_id.id)
+        update = self.env['external.data.update'].create({'data_id': duplicate.id})
+        self.create_related(duplicate)
+        self.env['base'].flush()
+
+        load_migration('13.0.3.2.0', 'pre-migrate.py').migrate(cr, '13.0.3.1.0')
+        self.env['base'].invalidate_cache()
+
+        self.assertTrue(keep.exists())
+        self.assertFalse(duplicate.exists())
+        self.assertEqual(update.data_id, keep)
+        # yang sudah done di pertahankan
+        self.assertTrue(done_duplicate.exists())
+        self.assertFalse(done.exists())
+        cr.execute("""
+            SELECT sync_strategy_id, external_odoo_id FROM external_data_sync
+            GROUP BY 1, 2 HAVING count(*) > 1
+        """)
+        self.assertFalse(cr.fetchall())
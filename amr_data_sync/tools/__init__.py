@@ -1,2 +1,3 @@
 # -*- coding: utf-8 -*-
 from . import utils
+from . import fields
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+import hashlib
+import json
+
+from functools import partial
+
+from psycopg2.extras import Json as PgJson
+
+from odoo import fields
+from odoo.tools import date_utils
+
+json_dumps = partial(json.dumps, default=date_utils.json_default)
+
+
+def json_hash(value):
+    """ hash isi json (key di urutkan), dipakai untuk membandingkan data tanpa serialize ulang di python """
+    if value is None or value is False:
+        return False
+    return hashlib.sha1(json_dumps(value, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+# key yang selalu berubah walaupun isi data sama
+CONTENT_HASH_EXCLUDE = ('write_date', '__last_update')
+
+
+def content_hash(value, exclude=CONTENT_HASH_EXCLUDE):
+    """ hash isi payload external, tanpa key yang tidak mempengaruhi isi data """
+    if isinstance(value, dict):
+        value = {k: v for k, v in value.items() if k not in exclude}
+    return json_hash(value)
+
+
+class Json(fields.Text):
+    """
+    Field json di simpan sebagai jsonb.
+    Nilai di record berupa object python (dict, list, int, ...), string di anggap json text.
+    Untuk UI (read) di kirim sebagai json text.
+    """
+    column_type = ('jsonb', 'jsonb')
+    column_cast_from = ('text', 'varchar')
+
+    def write(self, records, value):
+        # _String.write menulis cache value langsung ke column tanpa convert_to_column,
+        # Field.write selalu lewat convert_to_write + convert_to_column
+        return fields.Field.write(self, records, value)
+
+    def convert_to_column(self, value, record, values=None, validate=True):
+        if value is None or value is False:
+            return None
+        if isinstance(value, PgJson):
+            return value
+        return PgJson(self.convert_to_cache(value, record, validate=validate), dumps=json_dumps)
+
+    def convert_to_cache(self, value, record, validate=True):
+        if value is None or value is False:
+            return None
+        if isinstance(value, (bytes, str)):
+            try:
+                return json.loads(value)
+            except ValueError:
+                return value
+        return value
+
+    def convert_to_record(self, value, record):
+        return False if value is None else value
+
+    def convert_to_write(self, value, record):
+        # object python, bukan json text dari convert_to_read
+        return self.convert_to_cache(value, record)
+
+    def convert_to_read(self, value, record, use_name_get=True):
+        if value is None or value is False:
+            return False
+        return json_dumps(value)
+
+    def convert_to_export(self, value, record):
+        if value is None or value is False:
+            return ''
+        return json_dumps(value)
@@ -1,21 +1,138 @@
 
+import hashlib
 import inspect
 import logging
+import threading
 
-from collections import defaultdict
+from collections import defaultdict, OrderedDict
 
 from psycopg2._psycopg import AsIs
 from odoo import SUPERUSER_ID,_
 from odoo.exceptions import UserError
 from odoo.tools import clean_context, attrgetter
+from odoo.tools.safe_eval import _BUILTINS, _SAFE_OPCODES, test_expr, unsafe_eval
 
 
 _logger = logging.getLogger(__name__)
 
 LOG_ACCESS_COLUMNS = ['create_uid', 'create_date', 'write_uid', 'write_date']
 
+# jumlah row per INSERT multi VALUES pada insert_sql
+INSERT_BATCH_SIZE = 500
 
-def insert_data_sql(self, vals_list):
+# sequence id mode reserve: warning bila sisa id di bawah fraksi MAXVALUE ini
+RESERVE_HEADROOM_WARNING = 0.1
+
+SAFE_EVAL_CACHE_SIZE = 256
+_safe_eval_cache = OrderedDict()
+_safe_eval_lock = threading.Lock()
+
+
+def _safe_eval_key(script, mode):
+    return hashlib.sha256(script.encode('utf-8')).hexdigest(), mode
+
+
+def compile_safe_eval(script, mode="exec"):
+    """
+    Compile + validasi bytecode script (langkah compile safe_eval) sekali,
+    code object di cache LRU dengan key hash script.
+    """
+    key = _safe_eval_key(script, mode)
+    with _safe_eval_lock:
+        code = _safe_eval_cache.get(key)
+        if code is not None:
+            _safe_eval_cache.move_to_end(key)
+            return code
+    code = test_expr(script, _SAFE_OPCODES, mode=mode)
+    with _safe_eval_lock:
+        _safe_eval_cache[key] = code
+        while len(_safe_eval_cache) > SAFE_EVAL_CACHE_SIZE:
+            _safe_eval_cache.popitem(last=False)
+    return code
+
+
+def invalidate_safe_eval(script, mode="exec"):
+    if script:
+        with _safe_eval_lock:
+            _safe_eval_cache.pop(_safe_eval_key(script.strip(), mode), None)
+
+
+def safe_eval_cached(script, eval_context, mode="exec"):
+    """
+    Seperti safe_eval(script, eval_context, mode=mode, nocopy=True)
+    tetapi menjalankan code object yang sudah di validasi dari cache.
+    """
+    code = compile_safe_eval(script, mode=mode)
+    eval_context['__builtins__'] = _BUILTINS
+    return unsafe_eval(code, eval_context)
+
+
+# =========================
+# GENERATION CACHE
+# ormcache model di bawah ini memakai generation (class attribute model di registry) di key,
+# invalidate cukup menaikkan generation, tidak clear_caches seluruh registry.
+# =========================
+CACHE_SIGNAL_SEQUENCE = 'external_data_sync_cache_signal'
+CACHE_GENERATIONS = {
+    'external.data.lookup': ('_lookup_cache_generation',),
+    'external.data.company': ('_company_cache_generation',),
+    'external.data.sync.strategy': ('_strategy_cache_generation', '_success_hash_cache_generation'),
+}
+_cache_signal_seen = {}
+
+
+def create_cache_signal_sequence(cr):
+    cr.execute("CREATE SEQUENCE IF NOT EXISTS %s" % CACHE_SIGNAL_SEQUENCE)
+
+
+def get_cache_values(records, cache_fields):
+    return [tuple(rec[f] for f in cache_fields) for rec in records]
+
+
+def invalidate_cache_generation(model, *names):
+    """
+    Naikkan generation names di model (registry worker ini), cache lama tidak terpakai lagi.
+    Worker lain di beri tahu lewat sequence signal setelah commit, lihat check_cache_signaling.
+    """
+    cls = type(model)
+    for name in names:
+        setattr(cls, name, getattr(cls, name, 0) + 1)
+    cr = model.env.cr
+    if getattr(cr, '_external_cache_signal', False):
+        return
+    cr._external_cache_signal = True
+
+    def after_commit():
+        cr._external_cache_signal = False
+        # nextval tidak transactional, aman di jalankan setelah commit
+        cr.execute("SELECT nextval(%s)", [CACHE_SIGNAL_SEQUENCE])
+
+    def after_rollback():
+        cr._external_cache_signal = False
+
+    cr.after('commit', after_commit)
+    cr.after('rollback', after_rollback)
+
+
+def check_cache_signaling(env):
+    """
+    Di panggil di awal cron: bila worker lain mengubah data yang di cache (sequence signal berubah),
+    semua generation di CACHE_GENERATIONS di naikkan.
+    """
+    cr = env.cr
+    cr.execute("SELECT last_value FROM %s" % CACHE_SIGNAL_SEQUENCE)
+    value = cr.fetchone()[0]
+    if _cache_signal_seen.get(cr.dbname) == value:
+        return
+    _cache_signal_seen[cr.dbname] = value
+    for model_name, names in CACHE_GENERATIONS.items():
+        if model_name in env:
+            cls = type(env[model_name])
+            for name in names:
+                setattr(cls, name, getattr(cls, name, 0) + 1)
+
+
+def insert_data_sql(self, vals_list, batch_size=None, resync_sequence=True):
     bad_names = {'parent_path'}
     if self._log_access:
         # the superuser can set log_access fields while loading registry
@@ -61,17 +178,20 @@ def insert_data_sql(self, vals_list):
 
         data_list.append(data)
 
-    return insert_sql(self, data_list)
+    return insert_sql(self, data_list, batch_size=batch_size, resync_sequence=resync_sequence)
 
 
-def insert_sql(self, data_list):
-    """ Create records from the stored field values in ``data_list``. """
+def insert_sql(self, data_list, batch_size=None, resync_sequence=True):
+    """
+    Create records from the stored field values in ``data_list``.
+    resync_sequence: bila id di isi explicit, sequence id di majukan ke id max (sekali per batch)
+    """
     assert data_list
+    batch_size = batch_size or INSERT_BATCH_SIZE
     cr = self.env.cr
     quote = '"{}"'.format
 
     # insert rows
-    ids = []  # ids of created records
     other_fields = set()  # non-column fields
     translated_fields = set()  # translated fields
 
@@ -99,35 +219,32 @@ def insert_sql(self, data_list):
             else:
                 other_fields.add(field)
 
-        # Insert rows one by one
-        # - as records don't all specify the same columns, code building batch-insert query
-        #   was very complex
-        # - and the gains were low, so not worth spending so much complexity
-        #
-        # It also seems that we have to be careful with INSERTs in batch, because they have the
-        # same problem as SELECTs:
-        # If we inject a lot of data in a single query, we fall into pathological perfs in
-        # terms of SQL parser and the execution of the query itself.
-        # In SELECT queries, we inject max 1000 ids (integers) when we can, because we know
-        # that this limit is well managed by PostgreSQL.
-        # In INSERT queries, we inject integers (small) and larger data (TEXT blocks for
-        # example).
-        #
-        # The problem then becomes: how to "estimate" the right size of the batch to have
-        # good performance?
-        #
-        # This requires extensive testing, and it was prefered not to introduce INSERTs in
-        # batch, to avoid regressions as much as possible.
-        #
-        # That said, we haven't closed the door completely.
-        query = "INSERT INTO {} ({}) VALUES ({}) RETURNING id".format(
-            quote(self._table),
-            ", ".join(quote(name) for name, fmt, val in columns),
-            ", ".join(fmt for name, fmt, val in columns),
-        )
-        params = [val for name, fmt, val in columns]
-        cr.execute(query, params)
-        ids.append(cr.fetchone()[0])
+        data['columns'] = columns
+
+    # Insert rows per batch: row dengan kolom (dan format) yang sama di gabung
+    # dalam satu INSERT multi VALUES, urutan RETURNING id sesuai urutan VALUES
+    groups = defaultdict(list)
+    for index, data in enumerate(data_list):
+        columns = data.pop('columns')
+        key = tuple((name, fmt) for name, fmt, val in columns)
+        groups[key].append((index, [val for name, fmt, val in columns]))
+
+    ids = [None] * len(data_list)
+    for key, rows in groups.items():
+        row_format = "({})".format(", ".join(fmt for name, fmt in key))
+        for i in range(0, len(rows), batch_size):
+            batch = rows[i:i + batch_size]
+            query = "INSERT INTO {} ({}) VALUES {} RETURNING id".format(
+                quote(self._table),
+                ", ".join(quote(name) for name, fmt in key),
+                ", ".join([row_format] * len(batch)),
+            )
+            params = [val for index, values in batch for val in values]
+            cr.execute(query, params)
+            for (index, values), row in zip(batch, cr.fetchall()):
+                ids[index] = row[0]
+            if resync_sequence and 'id' in dict(key):
+                resync_id_sequence(self, max(ids[index] for index, values in batch))
 
     # put the new records in cache, and update inverse fields, for many2one
     #
@@ -210,6 +327,138 @@ def insert_sql(self, data_list):
     return records
 
 
+def update_values_sql(self, values_by_id):
+    """
+    Update nilai per record (nilai berbeda tiap record) dalam satu UPDATE ... FROM (VALUES ...)
+    per kumpulan kolom yang sama, pengganti write per record.
+    values_by_id: {id: {field: value}}, hanya field stored dengan kolom (bukan x2many).
+    Cache di invalidate dan field compute yang depend di tandai recompute.
+    write() (dan override nya) tidak di panggil, pemanggil harus menjaga logic write() tetap sejalan.
+    """
+    if not values_by_id:
+        return self.browse()
+    cr = self.env.cr
+    quote = '"{}"'.format
+    groups = defaultdict(dict)
+    for record_id, vals in values_by_id.items():
+        groups[tuple(sorted(vals))][record_id] = vals
+
+    records = self.browse(list(values_by_id))
+    fnames = sorted({name for names in groups for name in names})
+    records.flush(fnames, records)
+    for names, group in groups.items():
+        _fields = [self._fields[name] for name in names]
+        for field in _fields:
+            assert field.store and field.column_type, "Field %s tidak bisa di update lewat SQL" % field
+        row_format = "(%s, {})".format(", ".join("%s::{}".format(field.column_type[1]) for field in _fields))
+        assignments = ['{0} = v.{0}'.format(quote(name)) for name in names]
+        if self._log_access:
+            assignments.append('"write_uid" = %s')
+            assignments.append('"write_date" = (now() at time zone \'UTC\')')
+        ids = list(group)
+        for i in range(0, len(ids), INSERT_BATCH_SIZE):
+            batch = ids[i:i + INSERT_BATCH_SIZE]
+            params = [self._uid] if self._log_access else []
+            for record_id in batch:
+                vals = group[record_id]
+                params.append(record_id)
+                params.extend(field.convert_to_column(vals[field.name], self.browse(record_id), vals)
+                              for field in _fields)
+            query = 'UPDATE {table} SET {assignments} FROM (VALUES {rows}) AS v(id, {columns}) ' \
+                    'WHERE {table}.id = v.id'.format(
+                        table=quote(self._table),
+                        assignments=", ".join(assignments),
+                        rows=", ".join([row_format] * len(batch)),
+                        columns=", ".join(quote(name) for name in names),
+                    )
+            cr.execute(query, params)
+
+    records.invalidate_cache(fnames + (LOG_ACCESS_COLUMNS if self._log_access else []), records.ids)
+    records.modified(fnames)
+    return records
+
+
+def get_id_sequence(self):
+    cr = self.env.cr
+    cr.execute("SELECT pg_get_serial_sequence(%s, 'id')", (self._table,))
+    row = cr.fetchone()
+    return row and row[0]
+
+
+def resync_id_sequence(self, max_id):
+    """ majukan sequence id table ke max_id, sequence tidak pernah di mundurkan """
+    sequence = get_id_sequence(self)
+    if not sequence or not max_id:
+        return
+    self.env.cr.execute(
+        "SELECT setval(%s, GREATEST(last_value, %s)) FROM {}".format(sequence),
+        (sequence, max_id)
+    )
+
+
+def reserve_id_sequence(self, max_value):
+    """
+    Batasi MAXVALUE sequence id table, id di atas max_value di cadangkan untuk insert explicit id
+    (internal_id_same_as_external dengan offset), create biasa tidak akan bentrok.
+    """
+    sequence = get_id_sequence(self)
+    if not sequence:
+        return
+    cr = self.env.cr
+    cr.execute("SELECT last_value FROM {}".format(sequence))
+    last_value = cr.fetchone()[0]
+    if last_value > max_value:
+        raise UserError(_("Sequence %s sudah di %s, tidak bisa di batasi sampai %s") % (sequence, last_value, max_value))
+    if get_id_sequence_maxvalue(self, sequence)[0] != max_value:
+        cr.execute("ALTER SEQUENCE {} MAXVALUE %s".format(sequence), (max_value,))
+    check_id_sequence_headroom(self)
+
+
+def check_id_sequence_headroom(self):
+    """
+    Sisa id sequence sebelum MAXVALUE (mode reserve), None bila sequence tidak di batasi.
+    Setelah habis create biasa di model ini gagal dengan "reached maximum value of sequence",
+    jadi di log warning bila sisa di bawah RESERVE_HEADROOM_WARNING.
+    """
+    sequence = get_id_sequence(self)
+    if not sequence:
+        return None
+    maxvalue, default_maxvalue = get_id_sequence_maxvalue(self, sequence)
+    if maxvalue >= default_maxvalue:
+        return None
+    self.env.cr.execute("SELECT last_value FROM {}".format(sequence))
+    remaining = maxvalue - self.env.cr.fetchone()[0]
+    if remaining < maxvalue * RESERVE_HEADROOM_WARNING:
+        _logger.warning(
+            "Sequence %s (%s) tinggal %s id sebelum MAXVALUE %s, setelah habis create di %s gagal "
+            "(reached maximum value of sequence). Naikkan offset external id strategy reserve.",
+            sequence, self._name, remaining, maxvalue, self._name
+        )
+    return remaining
+
+
+def get_id_sequence_maxvalue(self, sequence):
+    """ (MAXVALUE sequence, MAXVALUE default tipe sequence) """
+    self.env.cr.execute("""
+        SELECT seqmax, CASE seqtypid WHEN 'int2'::regtype THEN 32767
+                                     WHEN 'int4'::regtype THEN 2147483647
+                                     ELSE 9223372036854775807 END
+        FROM pg_sequence WHERE seqrelid = %s::regclass
+    """, (sequence,))
+    return self.env.cr.fetchone()
+
+
+def release_id_sequence(self):
+    """ kebalikan reserve_id_sequence, sequence id table tanpa batas MAXVALUE """
+    sequence = get_id_sequence(self)
+    if not sequence:
+        return
+    maxvalue, default_maxvalue = get_id_sequence_maxvalue(self, sequence)
+    # ALTER SEQUENCE lock sequence sampai commit, hanya bila memang di batasi
+    if maxvalue < default_maxvalue:
+        self.env.cr.execute("ALTER SEQUENCE {} NO MAXVALUE".format(sequence))
+
+
 def safe_call_method(obj, method_name, args=None, kwargs=None):
     """
     Memanggil method pada object secara aman.
@@ -11,5 +11,5 @@
     'website': "http://agus.ramdan.tech",
     'category': 'API',
     'version': '13.0.0.0.0',
-    'depends': ['base', 'web'],
+    'depends': ['base', 'web', 'amr_jsonrpc'],
 }
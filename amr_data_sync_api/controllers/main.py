@@ -14,7 +14,7 @@ class ControllerSync(http.Controller):
     @http.route([
         '/api/sync/data/<model_name>'
     ], type='http', auth="none", methods=['GET'], csrf=False)
-    @check_authorization(setup_session=True)
+    @check_authorization(stateless=True)
     def rest_api_sync_data(self, model_name, **kwargs):
         Model = request.env['ir.model']
         Model_id = Model.sudo().search([('model', '=', model_name)], limit=1)
@@ -0,0 +1,4 @@
+# -*- coding: utf-8 -*-
+
+from . import test_stream
+from . import test_auth_cache
@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+
+from unittest.mock import MagicMock, patch
+
+from odoo.exceptions import AccessDenied
+from odoo.tests import tagged
+from odoo.tests.common import TransactionCase
+
+from ..tools import utils
+
+
+@tagged('post_install', '-at_install')
+class TestAuthenticateBasic(TransactionCase):
+
+    def setUp(self):
+        super().setUp()
+        utils.auth_cache.clear()
+        self.addCleanup(utils.auth_cache.clear)
+        fake_request = MagicMock()
+        fake_request.session.db = self.env.cr.dbname
+        fake_request.env = self.env
+        patcher = patch.object(utils, 'request', fake_request)
+        self.request = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def patch_login(self, **kwargs):
+        return patch.object(type(self.env['res.users']), '_login', **kwargs)
+
+    def test_stateless_login_cached(self):
+        with self.patch_login(return_value=7) as login:
+            self.assertEqual(utils.authenticate_basic('user', 'secret', stateless=True), (7, 'user'))
+            self.assertEqual(utils.authenticate_basic('user', 'secret', stateless=True), (7, 'user'))
+        login.assert_called_once_with(self.env.cr.dbname, 'user', 'secret')
+        self.request.session.authenticate.assert_not_called()
+
+    def test_failed_not_cached(self):
+        with self.patch_login(side_effect=AccessDenied()) as login, \
+                self.assertLogs(utils.__name__, level='INFO') as logs:
+            self.assertEqual(utils.authenticate_basic('user', 'wrong', stateless=True), (None, None))
+            self.assertEqual(utils.authenticate_basic('user', 'wrong', stateless=True), (None, None))
+        # setiap percobaan gagal sampai ke _login (rate limit)
+        self.assertEqual(login.call_count, 2)
+        self.assertTrue(any('Basic auth failed' in line for line in logs.output))
+
+    def test_session_authenticate(self):
+        self.request.session.authenticate.return_value = 9
+        self.assertEqual(utils.authenticate_basic('user', 'secret'), (9, 'user'))
+        self.request.session.authenticate.assert_called_once_with(self.env.cr.dbname, 'user', 'secret')
+
+    def test_empty_credential(self):
+        with self.patch_login() as login:
+            self.assertEqual(utils.authenticate_basic('user', '', stateless=True), (None, None))
+        login.assert_not_called()
+
+
+@tagged('post_install', '-at_install')
+class TestStatelessUser(TransactionCase):
+
+    def test_context_from_user(self):
+        user = self.env['res.users'].create({
+            'name': 'Sync API', 'login': 'sync_api_stateless', 'tz': 'Asia/Jakarta',
+        })
+        fake_request = MagicMock()
+        fake_request.env = self.env
+        # context session sebelumnya
+        fake_request.context = {'lang': 'fr_FR', 'tz': 'Europe/Paris', 'allowed_company_ids': [99]}
+        with patch.object(utils, 'request', fake_request):
+            utils.set_stateless_user(user.id)
+        self.assertEqual(fake_request.uid, user.id)
+        self.assertEqual(fake_request.context['tz'], 'Asia/Jakarta')
+        self.assertEqual(fake_request.context['lang'], user.lang)
+        self.assertEqual(fake_request.context['uid'], user.id)
+        self.assertNotIn('allowed_company_ids', fake_request.context)
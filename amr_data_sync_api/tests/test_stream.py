@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+
+import json
+import zlib
+
+from odoo import SUPERUSER_ID
+from odoo.tests import tagged
+from odoo.tests.common import TransactionCase
+
+from ..tools import utils
+
+
+@tagged('post_install', '-at_install')
+class TestStreamRecords(TransactionCase):
+    """ stream_records memakai cursor sendiri, jadi hanya data yang sudah commit (res.country) """
+
+    def stream(self, **kwargs):
+        chunks = utils.stream_records(
+            self.env.cr.dbname, SUPERUSER_ID, {}, 'res.country', kwargs.pop('domain', []), ['id', 'code'], **kwargs
+        )
+        return [json.loads(line) for line in b''.join(chunks).decode('utf-8').splitlines()]
+
+    def test_keyset_pages(self):
+        expected = self.env['res.country'].search_read([], ['id', 'code'], limit=5, order='id')
+        rows = self.stream(limit=5, page_size=2)
+        self.assertEqual(rows, expected)
+        # lanjut setelah id terakhir
+        rows = self.stream(after_id=expected[1]['id'], limit=3, page_size=2)
+        self.assertEqual(rows, expected[2:5])
+
+    def test_error_last_line(self):
+        rows = self.stream(domain=[('field_tidak_ada', '=', 1)])
+        self.assertEqual(len(rows), 1)
+        self.assertIn('error', rows[0])
+
+    def test_gzip_chunks(self):
+        data = b''.join(utils.gzip_chunks([b'{"id": 1}\n', b'{"id": 2}\n']))
+        self.assertEqual(zlib.decompress(data, 16 + zlib.MAX_WBITS), b'{"id": 1}\n{"id": 2}\n')
+
+    def test_is_true_param(self):
+        self.assertTrue(utils.is_true_param('1'))
+        self.assertTrue(utils.is_true_param('True'))
+        self.assertFalse(utils.is_true_param(None))
+        self.assertFalse(utils.is_true_param('0'))
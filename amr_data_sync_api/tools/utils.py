@@ -1,16 +1,25 @@
 # -*- coding: utf-8 -*-
 
+import odoo
+from odoo import api
 from odoo.fields import Datetime, Date
 from datetime import datetime, date
 from odoo.http import request
-from odoo.exceptions import AccessError
+from odoo.exceptions import AccessDenied, AccessError
 from odoo.service import security
 from functools import wraps
 from werkzeug.wrappers import Response
+from odoo.addons.amr_jsonrpc import json_codec
 
 import ast
 import werkzeug.wrappers
 import base64
+import hashlib
+import threading
+import time
+import zlib
+
+from collections import OrderedDict
 
 try:
     import simplejson as json
@@ -24,6 +33,7 @@ _logger = logging.getLogger(__name__)
 
 
 class JSONEncoder(json.JSONEncoder):
+    # response api memakai json_codec, class ini di pertahankan untuk modul lain
     def default(self, obj):
         if isinstance(obj, (bytes, bytearray)):
             return obj.decode("utf-8")
@@ -53,6 +63,17 @@ def set_session(login, uid, session_token=None):
         session.get_context()
 
 
+def set_stateless_user(uid):
+    """
+    Mode stateless: request.uid dan context user (lang, tz) tanpa set_session,
+    context session sebelumnya / anonymous tidak di pakai.
+    """
+    context = dict(request.env(user=uid)['res.users'].context_get())
+    context['uid'] = uid
+    request.uid = uid
+    request.context = context
+
+
 def get_bearer_token():
     auth = request.httprequest.headers.get("Authorization")
     if not auth or not auth.startswith("Bearer "):
@@ -84,7 +105,113 @@ def make_response_error(status=400, error="", error_description=""):
     )
 
 
-def check_authorization(_func=None, *, setup_session=False, header_name=('token', 'access_token'), param_name=None):
+AUTH_CACHE_TTL = 60
+AUTH_CACHE_SIZE = 1024
+
+
+class AuthCache:
+    """
+    Cache LRU + TTL hasil validasi credential (basic / token), key hash dari credential.
+    Hanya hasil valid yang di cache, password / token tidak di simpan.
+    """
+
+    def __init__(self, ttl=AUTH_CACHE_TTL, max_size=AUTH_CACHE_SIZE):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(dbname, kind, *secrets):
+        digest = hashlib.sha256('\x00'.join(str(v) for v in secrets).encode('utf-8')).hexdigest()
+        return dbname, kind, digest
+
+    def get(self, key):
+        with self._lock:
+            item = self._data.get(key)
+            if not item:
+                return None
+            expires, value = item
+            if expires < time.time():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl=None):
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        if ttl <= 0:
+            return
+        with self._lock:
+            self._data[key] = (time.time() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+auth_cache = AuthCache()
+
+
+def authenticate_basic(username, password, stateless=False):
+    """ return (uid, login) basic credential, hasil di cache """
+    if not username or not password:
+        return None, None
+    dbname = request.session.db or request.db
+    key = auth_cache.make_key(dbname, 'basic', username, password)
+    cached = auth_cache.get(key)
+    if cached:
+        return cached
+    try:
+        if stateless:
+            # tanpa session (tidak rotate session), tetap lewat _login: rate limit login gagal
+            uid = request.env['res.users']._login(dbname, username, password)
+        else:
+            uid = request.session.authenticate(dbname, username, password)
+    except AccessDenied:
+        _logger.info("Basic auth failed for db:%s login:%s", dbname, username)
+        return None, None
+    except Exception:
+        _logger.exception("Basic auth error for db:%s login:%s", dbname, username)
+        return None, None
+    if not uid:
+        _logger.info("Basic auth failed for db:%s login:%s", dbname, username)
+        return None, None
+    # hanya credential valid yang di cache, gagal selalu di cek ulang (rate limit _login tetap berlaku)
+    auth_cache.set(key, (uid, username))
+    return uid, username
+
+
+def validate_token_cached(token):
+    """ return (uid, login) token, hasil di cache sampai TTL atau exp token """
+    dbname = request.session.db or request.db
+    key = auth_cache.make_key(dbname, 'token', token)
+    cached = auth_cache.get(key)
+    if cached:
+        return cached
+    token_data = request.env['token.validator.service'].sudo().validate_token(token)
+    if not token_data or not token_data.get('uid'):
+        return None, None
+    uid = token_data['uid']
+    login = token_data.get('username') or token_data.get('sub')
+    if not login:
+        return None, None
+    ttl = None
+    if token_data.get('exp'):
+        ttl = int(token_data['exp'] - time.time())
+    auth_cache.set(key, (uid, login), ttl=ttl)
+    return uid, login
+
+
+def check_authorization(_func=None, *, setup_session=False, stateless=False,
+                        header_name=('token', 'access_token'), param_name=None):
+    """
+    stateless=True: request.uid dan context user di set langsung (set_stateless_user),
+    tanpa authenticate / rotate session dan tanpa restore session setelah call.
+    """
     def decorator(func):
         @wraps(func)
         def wrapper(self, *args, **kwargs):
@@ -94,17 +221,16 @@ def check_authorization(_func=None, *, setup_session=False, header_name=('token'
             save_login = session.login
             session_token = session.session_token
             accept_authorization = False
+            login = None
             try:
                 username, password = get_basic_auth()
-                uid = request.session.authenticate(
-                    request.session.db,
-                    username,
-                    password
-                )
-            except:
+                uid, login = authenticate_basic(username, password, stateless=stateless)
+            except Exception:
                 uid = None
             if uid:
                 accept_authorization = True
+                if not stateless and session.uid != uid:
+                    set_session(login, uid)
             else:
                 # Ambil semua kemungkin token yang ada
                 token_list = [get_bearer_token()]
@@ -131,14 +257,11 @@ def check_authorization(_func=None, *, setup_session=False, header_name=('token'
                 for t in tokens:
                     if not t:
                         continue
-                    token_data = request.env['token.validator.service'].sudo().validate_token(t)
-                    if token_data and token_data.get('uid'):
-                        uid = token_data['uid']
-                        login = token_data.get('username') or token_data.get('sub')
-                        if uid and login:
-                            accept_authorization = True
-                            if setup_session:
-                                set_session(login, uid)
+                    uid, login = validate_token_cached(t)
+                    if uid and login:
+                        accept_authorization = True
+                        if setup_session and not stateless:
+                            set_session(login, uid)
                     if accept_authorization:
                         break
             if not accept_authorization:
@@ -146,10 +269,13 @@ def check_authorization(_func=None, *, setup_session=False, header_name=('token'
                     401, error.get("error", "invalid_token"),
                     error.get("error_description", "The token is invalid or expired.")
                 )
+            if stateless:
+                set_stateless_user(uid)
+                return func(self, *args, **kwargs)
             result = func(self, *args, **kwargs)
             if uid or setup_session:
                 # Set kembali session sebelumnya
-                set_session(save_uid, save_login, session_token)
+                set_session(save_login, save_uid, session_token)
             return result
         return wrapper
 
@@ -163,7 +289,7 @@ def valid_response(status, data):
     return werkzeug.wrappers.Response(
         status=status,
         content_type='application/json; charset=utf-8',
-        response=json.dumps(data, cls=JSONEncoder),
+        response=json_codec.dumps_bytes(data, bytes_mode=json_codec.BYTES_UTF8),
     )
 
 
@@ -199,6 +325,73 @@ def object_not_found_all(modal_name):
     )
 
 
+STREAM_PAGE_SIZE = 1000
+STREAM_MIMETYPE = 'application/x-ndjson'
+
+
+def is_true_param(value):
+    return str(value).lower() in ('1', 'true', 'yes')
+
+
+def accept_gzip():
+    return 'gzip' in (request.httprequest.headers.get('Accept-Encoding') or '').lower()
+
+
+def gzip_chunks(chunks):
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def stream_records(dbname, uid, context, model_name, domain, fields, after_id=0, limit=None,
+                   page_size=STREAM_PAGE_SIZE, sudo_read=False):
+    """
+    Generator NDJSON (satu record per baris), di baca per page dengan keyset id > after_id.
+    Di jalankan setelah request selesai, jadi pakai cursor sendiri; cache env di clear tiap page.
+    """
+    with api.Environment.manage(), odoo.registry(dbname).cursor() as cr:
+        env = api.Environment(cr, uid, context)
+        model = env[model_name]
+        if sudo_read:
+            model = model.sudo(sudo_read)
+        sent = 0
+        try:
+            while True:
+                size = page_size if not limit else min(page_size, limit - sent)
+                if size <= 0:
+                    break
+                rows = model.search_read(domain + [('id', '>', after_id)], fields=fields, limit=size, order='id')
+                if rows:
+                    yield b''.join(
+                        json_codec.dumps_bytes(row, bytes_mode=json_codec.BYTES_UTF8) + b'\n' for row in rows
+                    )
+                sent += len(rows)
+                if len(rows) < size:
+                    break
+                after_id = rows[-1]['id']
+                env.clear()
+        except Exception as e:
+            # status sudah terkirim, error di kirim sebagai baris terakhir
+            _logger.exception("Error stream %s", model_name)
+            yield (json.dumps({
+                'error': "Process error please contact Administrator",
+                'error_description': "Error: %s" % str(e),
+            }) + '\n').encode('utf-8')
+
+
+def stream_response(status, chunks):
+    headers = []
+    if accept_gzip():
+        chunks = gzip_chunks(chunks)
+        headers.append(('Content-Encoding', 'gzip'))
+    return werkzeug.wrappers.Response(
+        chunks, status=status, headers=headers, mimetype=STREAM_MIMETYPE, direct_passthrough=True,
+    )
+
+
 def object_read(model_name, params, status_code, filter_fields=None, __from_sync_data_api=True, sudo_read=False):
     domain = []
     fields = []
@@ -208,6 +401,9 @@ def object_read(model_name, params, status_code, filter_fields=None, __from_sync
     ids = []
     if 'filters' in params:
         domain += ast.literal_eval(params['filters'])
+    if 'domain' in params:
+        # RestModelObject mengirim domain dengan nama 'domain'
+        domain += ast.literal_eval(params['domain'])
     if 'context' in params:
         context = ast.literal_eval(params['context']) or {}
     else:
@@ -253,6 +449,16 @@ def object_read(model_name, params, status_code, filter_fields=None, __from_sync
         fields = filter_fields(model_name, fields)
 
     try:
+        if is_true_param(params.get('stream')):
+            # mode stream: NDJSON dengan keyset after_id, tanpa limit default
+            model.check_access_rights('read')
+            return stream_response(status_code, stream_records(
+                request.env.cr.dbname, model.env.uid, dict(model.env.context), model_name, domain, fields,
+                after_id=int(params.get('after_id') or 0),
+                limit=int(params['limit']) if params.get('limit') else None,
+                page_size=int(params.get('page_size') or STREAM_PAGE_SIZE),
+                sudo_read=sudo_read,
+            ))
         data = model.search_read(
                 domain=domain, fields=fields, offset=offset, limit=limit, order=order
             )
@@ -48,13 +48,16 @@ class ExternalDataSync(models.Model):
 
     def dispatch_process(self, run_immediate=False):
         self.write({'on_queue': True, 'state': 'process'})
-        self.with_delay().process_with_handel_error()
+        # satu job per record, process_data bekerja per record
+        for rec in self:
+            rec.with_delay().process_with_handel_error()
 
     def cron_process_data(self, limit=1000):
         records = self.search(
             [('on_queue', '=', False), ('need_get_data_json', '=', True)],
             limit=limit, order='next_processing_datetime asc,last_processing_datetime asc, id '
         )
+        records.prefetch_data_json()
         for rec in records:
             rec.dispatch_process()
 
@@ -65,5 +68,6 @@ class ExternalDataSync(models.Model):
              ('next_processing_datetime', '=', False)],
             limit=limit, order='next_processing_datetime asc,last_processing_datetime asc, id '
         )
+        records.prefetch_data_json()
         for rec in records:
             rec.dispatch_process()
@@ -1,6 +1,8 @@
 # -*- coding: utf-8 -*-
 
 from . import utils
+from . import json_codec
 from . import remote
+from . import remote_async
 from . import controllers
 from . import models
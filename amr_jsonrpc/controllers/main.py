@@ -1,7 +1,10 @@
 # -*- coding: utf-8 -*-
 
-from odoo import http, tools
-from odoo.http import request
+from odoo import api, http, tools
+from odoo.exceptions import AccessDenied
+from odoo.http import dispatch_rpc, request, serialize_exception
+
+from .. import json_codec
 
 import logging
 import werkzeug
@@ -34,3 +37,55 @@ class ControllerREST(http.Controller):
             content_type='application/json; charset=utf-8',
             response=json.dumps(data),
         )
+
+    @http.route([
+        '/jsonrpc/batch',
+    ], type='http', auth="none", methods=['POST'], csrf=False)
+    def jsonrpc_batch(self, **kwargs):
+        """
+        JSON-RPC 2.0 batch: body list of call, response list result dengan id yang sama.
+        params service/method/args -> dispatch_rpc (seperti /jsonrpc),
+        params model/method/args/kwargs -> call_kw dengan session (seperti /web/dataset/call_kw).
+        """
+        try:
+            calls = json_codec.loads(request.httprequest.get_data())
+        except ValueError:
+            calls = None
+        if not isinstance(calls, list):
+            return self._jsonrpc_response({
+                'jsonrpc': '2.0', 'id': None,
+                'error': {'code': -32600, 'message': 'Invalid Request'},
+            }, status=400)
+        return self._jsonrpc_response([self._jsonrpc_batch_item(call) for call in calls])
+
+    def _jsonrpc_batch_item(self, call):
+        call_id = call.get('id') if isinstance(call, dict) else None
+        try:
+            params = call.get('params') or {}
+            if 'service' in params:
+                result = dispatch_rpc(params['service'], params['method'], params.get('args') or [])
+            else:
+                result = self._call_kw_session(params)
+            return {'jsonrpc': '2.0', 'id': call_id, 'result': result}
+        except Exception as e:
+            _logger.info("JSON-RPC batch call error %s", e)
+            return {
+                'jsonrpc': '2.0', 'id': call_id,
+                'error': {'code': 200, 'message': "Odoo Server Error", 'data': serialize_exception(e)},
+            }
+
+    def _call_kw_session(self, params):
+        if not request.session.uid:
+            raise AccessDenied()
+        request.session.check_security()
+        request.uid = request.session.uid
+        with request.env.cr.savepoint():
+            model = request.env[params['model']]
+            return api.call_kw(model, params['method'], params.get('args') or [], params.get('kwargs') or {})
+
+    def _jsonrpc_response(self, data, status=200):
+        return werkzeug.wrappers.Response(
+            status=status,
+            content_type='application/json; charset=utf-8',
+            response=json_codec.dumps_bytes(data),
+        )
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+"""
+JSON codec bersama client (remote) dan server (api sync).
+Memakai orjson bila terinstall, fallback ke json stdlib.
+datetime / date (format odoo), Decimal, UUID, bytes dan set di handle saat encode,
+tanpa normalize (walk) payload terlebih dahulu.
+"""
+import base64
+import json
+import logging
+
+from datetime import date, datetime
+from decimal import Decimal
+from functools import lru_cache
+from uuid import UUID
+
+from odoo.fields import Date, Datetime
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_logger = logging.getLogger(__name__)
+
+# bytes_mode: 'base64' (default remote client) atau 'utf8' (api sync)
+BYTES_BASE64 = 'base64'
+BYTES_UTF8 = 'utf8'
+
+
+@lru_cache(maxsize=None)
+def get_default(bytes_mode=BYTES_BASE64):
+    def default(value):
+        if isinstance(value, datetime):
+            return Datetime.to_string(value)
+        if isinstance(value, date):
+            return Date.to_string(value)
+        if isinstance(value, (bytes, bytearray)):
+            if bytes_mode == BYTES_UTF8:
+                return value.decode('utf-8')
+            return base64.b64encode(value).decode()
+        if isinstance(value, UUID):
+            return str(value)
+        if isinstance(value, Decimal):
+            return float(value)
+        if isinstance(value, (set, frozenset)):
+            return list(value)
+        return str(value)
+    return default
+
+
+if orjson:
+    # datetime di lewatkan ke default supaya format sama dengan odoo (bukan iso)
+    _ORJSON_OPTION = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+
+    def dumps_bytes(value, bytes_mode=BYTES_BASE64):
+        return orjson.dumps(value, default=get_default(bytes_mode), option=_ORJSON_OPTION)
+
+    def dumps(value, bytes_mode=BYTES_BASE64):
+        return dumps_bytes(value, bytes_mode=bytes_mode).decode('utf-8')
+
+    def loads(data):
+        return orjson.loads(data)
+else:
+    def dumps(value, bytes_mode=BYTES_BASE64):
+        return json.dumps(value, default=get_default(bytes_mode), separators=(',', ':'))
+
+    def dumps_bytes(value, bytes_mode=BYTES_BASE64):
+        return dumps(value, bytes_mode=bytes_mode).encode('utf-8')
+
+    def loads(data):
+        if isinstance(data, (bytes, bytearray)):
+            data = data.decode('utf-8')
+        return json.loads(data)
+
+
+def response_json(response):
+    """ pengganti requests Response.json() memakai codec ini """
+    return loads(response.content)
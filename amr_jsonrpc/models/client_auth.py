@@ -3,6 +3,7 @@
 from odoo import models, fields, api, _
 from odoo.exceptions import UserError
 from .. import remote
+import hashlib
 import logging
 from contextlib import contextmanager
 
@@ -140,6 +141,27 @@ class AuthRestToken(models.AbstractModel):
         """
         return remote.OdooSession(self)
 
+    def get_session_pool_key(self):
+        credential = repr((
+            self.get_auth_type(), self.get_endpoint_url(), self.get_db_name(),
+            self.get_username(), self.get_password(), self.get_access_token(),
+        ))
+        return self.env.cr.dbname, self._name, self.id, hashlib.sha256(credential.encode()).hexdigest()
+
+    @contextmanager
+    def pooled_session(self):
+        """
+        Session dari pool (sudah connect), di kembalikan ke pool setelah selesai.
+        Contoh penggunaan
+        with auth.pooled_session() as s:
+            r = s.jsonrpc_call('res.partner', 'read', [[1]])
+        """
+        auth = self.ensure_one()
+        with remote.session_pool.session(auth.get_session_pool_key(), auth.create_session) as odoo_session:
+            # record auth terikat ke env (cursor) saat ini
+            odoo_session.auth_model = auth
+            yield odoo_session
+
     @contextmanager
     def create_remote_model(self, model_name, **kwargs):
         """
@@ -149,13 +171,8 @@ class AuthRestToken(models.AbstractModel):
         with auth.create_remote_model('res.partner) as s:
             r = s.read([1])")
         """
-        odoo_session = self.create_session()
-        try:
-            remote_model = odoo_session.create_remote_model(model_name, **kwargs)
-            odoo_session.connect()
-            yield remote_model
-        finally:
-            odoo_session.close()
+        with self.pooled_session() as odoo_session:
+            yield odoo_session.create_remote_model(model_name, **kwargs)
 
     def apply_auth(self, odoo_session):
         remote.apply_auth(self, odoo_session)
@@ -174,13 +191,11 @@ class AuthRestToken(models.AbstractModel):
         })
 
     def jsonrpc_execute_kw(self, model, method, args, kw=None):
-        auth = self.ensure_one()
-        with auth.create_session() as rpc:
+        with self.pooled_session() as rpc:
             return rpc.jsonrpc_call(model, method, args, kw=kw)
 
     def jsonrpc_call(self, model, method, args, kw=None):
-        auth = self.ensure_one()
-        with auth.create_session() as rpc:
+        with self.pooled_session() as rpc:
             return rpc.jsonrpc_call(model, method, args, kw=kw)
 
     def action_get_odoo_server_uid(self):
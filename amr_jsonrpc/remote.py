@@ -1,6 +1,9 @@
 # -*- coding: utf-8 -*-
 
 from odoo.fields import Datetime, Date
+from collections import defaultdict
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import date, datetime, timedelta
 from decimal import Decimal
 from uuid import UUID
@@ -8,6 +11,10 @@ from uuid import UUID
 import requests
 import base64
 import logging
+import threading
+import time
+
+from . import json_codec
 
 _logger = logging.getLogger(__name__)
 
@@ -15,6 +22,7 @@ _logger = logging.getLogger(__name__)
 def normalize_json(value):
     """
     Convert Python objects into JSON-serializable types (recursive)
+    Request jsonrpc tidak lagi memakai ini, encode langsung lewat json_codec.
     """
     if value is None:
         return None
@@ -55,6 +63,87 @@ def normalize_json(value):
 
 
 # HELEPER
+class RemoteAuthError(RuntimeError):
+    """ request remote di tolak karena auth (401 / session expired), harus login ulang """
+
+
+class JsonRPCAuthError(RemoteAuthError):
+    """ error jsonrpc karena auth, session / uid harus login ulang """
+
+
+class JsonRPCAccessDenied(JsonRPCAuthError):
+    """ error jsonrpc karena uid / password tidak valid (AccessDenied di server) """
+
+
+class JsonRPCSessionExpired(JsonRPCAuthError):
+    """ error jsonrpc karena session server sudah expired (HTTP 200, bukan 401) """
+
+
+def get_error_name(error):
+    if not isinstance(error, dict):
+        return ''
+    return (error.get('data') or {}).get('name') or ''
+
+
+def is_access_denied_error(error):
+    return get_error_name(error).endswith('AccessDenied')
+
+
+def is_session_expired_error(error):
+    return get_error_name(error).endswith('SessionExpiredException') \
+        or (isinstance(error, dict) and error.get('code') == 100)
+
+
+class ServerAuthCache:
+    """
+    Cache process wide db name dan uid hasil discovery per server,
+    key db: db name endpoint url, key uid: (endpoint url, db, username).
+    Di invalidate saat auth gagal (401 / AccessDenied / login error).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._db = {}
+        self._uid = {}
+
+    @staticmethod
+    def uid_key(auth_model, db, username):
+        return auth_model.get_endpoint_url(), db, username
+
+    def get_db_name(self, auth_model):
+        """ db dari setting auth, bila kosong dari cache / discovery (satu request per server) """
+        db = auth_model.get_db_name()
+        if db:
+            return db
+        url = auth_model.get_db_name_endpoint_url()
+        db = self._db.get(url)
+        if not db:
+            db = get_db_name(url)
+            if db:
+                with self._lock:
+                    self._db[url] = db
+        return db
+
+    def get_uid(self, auth_model, db, username):
+        return self._uid.get(self.uid_key(auth_model, db, username))
+
+    def set_uid(self, auth_model, db, username, uid):
+        with self._lock:
+            self._uid[self.uid_key(auth_model, db, username)] = uid
+
+    def invalidate(self, auth_model):
+        endpoint_url = auth_model.get_endpoint_url()
+        with self._lock:
+            self._db.pop(auth_model.get_db_name_endpoint_url(), None)
+            for key in [key for key in self._uid if key[0] == endpoint_url and key[2] == auth_model.get_username()]:
+                del self._uid[key]
+
+    def clear(self):
+        with self._lock:
+            self._db.clear()
+            self._uid.clear()
+
+
 def get_db_name(url):
     try:
         resp = requests.get(url)
@@ -87,13 +176,18 @@ def odoo_rpc_auth(self, odoo_session, odoo_server_db, username, password):
 
     # JSON-RPC error
     if "error" in data:
-        raise RuntimeError(f"Odoo login error: {data['error']}")
+        server_auth_cache.invalidate(self)
+        raise JsonRPCAuthError(f"Odoo login error: {data['error']}")
 
     uid = data.get("result")
     if not uid:
-        raise RuntimeError("Odoo login failed: invalid credentials")
+        server_auth_cache.invalidate(self)
+        raise JsonRPCAuthError("Odoo login failed: invalid credentials")
 
-    self.odoo_server_uid = uid
+    server_auth_cache.set_uid(self, odoo_server_db, username, uid)
+    # hindari write record auth yang tidak perlu setiap login
+    if getattr(self, 'odoo_server_uid', None) != uid:
+        self.odoo_server_uid = uid
     return uid
 
 
@@ -115,25 +209,30 @@ def odoo_rpc_session_auth(self, odoo_session, odoo_server_db, username, password
 
     # JSON-RPC error
     if "error" in data:
-        raise RuntimeError(f"Odoo login error: {data['error']}")
+        server_auth_cache.invalidate(self)
+        raise JsonRPCAuthError(f"Odoo login error: {data['error']}")
 
     result = data.get("result") or {}
     uid = result.get("uid")
     # uid False / None
     if not uid:
-        raise RuntimeError("Odoo login failed: invalid credentials")
+        server_auth_cache.invalidate(self)
+        raise JsonRPCAuthError("Odoo login failed: invalid credentials")
 
     # valid session_id cookie
     if "session_id" not in odoo_session.cookies:
-        raise RuntimeError("Odoo login failed: session_id not set")
+        raise JsonRPCAuthError("Odoo login failed: session_id not set")
         # simpan uid (cookie sudah otomatis di session)
-    self.odoo_server_uid = uid
+    server_auth_cache.set_uid(self, odoo_server_db, username, uid)
+    # hindari write record auth yang tidak perlu setiap login
+    if getattr(self, 'odoo_server_uid', None) != uid:
+        self.odoo_server_uid = uid
     return uid
 
 
 def apply_odoo_rpc_token_auth(self, odoo_session):
     refresh_token_if_needed(self)
-    odoo_server_db = self.get_db_name() or get_db_name(self.get_db_name_endpoint_url())
+    odoo_server_db = server_auth_cache.get_db_name(self)
     if not odoo_server_db:
         raise ValueError("Odoo RPC auth requires database name")
     username = self.get_username()
@@ -143,7 +242,7 @@ def apply_odoo_rpc_token_auth(self, odoo_session):
 
 def apply_odoo_rpc_auth(self, odoo_session):
     username, password = self.get_username_password()
-    odoo_server_db = self.get_db_name() or get_db_name(self.get_db_name_endpoint_url())
+    odoo_server_db = server_auth_cache.get_db_name(self)
     if not odoo_server_db:
         raise ValueError("Odoo RPC auth requires database name")
     odoo_rpc_session_auth(self, odoo_session, odoo_server_db, username, password)
@@ -235,6 +334,11 @@ def safe_call(call_func, auth):
         raise
 
 
+def check_auth_response(response):
+    if response.status_code == 401:
+        raise RemoteAuthError("Unauthorized %s" % getattr(response, 'url', ''))
+
+
 def rest_url(base_url, base_path=None, path=None):
     if path:
         if not path.startswith('/'):
@@ -259,18 +363,26 @@ class RemoteModel:
         self.offset = kwargs.get('offset', 0)
         self.limit = kwargs.get('limit', 500)
         self.order = kwargs.get('order', None)
+        # keyset: paging dengan ('id', '>', last_id) order id, tanpa offset dan search_count
+        self.keyset = kwargs.get('keyset', False)
 
     def call(self, method, args, kw=None):
         raise NotImplemented
 
-    def search_read(self, domain=None, fields=None, offset=0, limit=None, order=None):
-        method = 'search_read'
-        args = []
-        kw = {
+    def search_read_kw(self, domain=None, fields=None, offset=0, limit=None, order=None):
+        if self.keyset:
+            # page keyset sudah di batasi domain id > last_id, offset model tidak boleh ikut
+            offset = 0
+        return {
             'domain': domain or self.domain or [],
             'fields': fields or self.fields, 'order': order or self.order,
             'offset': offset or self.offset, 'limit': limit or self.limit,
         }
+
+    def search_read(self, domain=None, fields=None, offset=0, limit=None, order=None):
+        method = 'search_read'
+        args = []
+        kw = self.search_read_kw(domain, fields, offset, limit, order)
         return self.call(method, args, kw=kw)
 
     def read(self, *args, fields=None):
@@ -285,22 +397,102 @@ class RemoteModel:
         args = [self.domain or []]
         return self.call(method, args=args)
 
+    def read_many(self, ids_chunks, fields=None):
+        # read beberapa chunk id, return list hasil read per chunk (exception untuk chunk yang gagal)
+        results = []
+        for ids in ids_chunks:
+            try:
+                results.append(self.read(ids, fields=fields))
+            except Exception as e:
+                results.append(e)
+        return results
+
+    def search_read_after(self, last_id, limit=None):
+        return self.search_read(**self.fetch_page_args(last_id, limit=limit))
+
+    def fetch_page_args(self, cursor, limit=None):
+        # argumen search_read satu page, cursor: last_id untuk keyset, offset untuk paging biasa
+        limit = limit or self.limit
+        if self.keyset:
+            return {'domain': list(self.domain or []) + [('id', '>', cursor or 0)], 'order': 'id asc', 'limit': limit}
+        return {'offset': cursor, 'limit': limit}
+
+    def fetch_page(self, cursor, limit=None):
+        return self.search_read(**self.fetch_page_args(cursor, limit=limit))
+
+    def prepare_page_request(self, cursor, limit=None):
+        """
+        Argumen requests.request untuk satu page (payload dan auth sudah jadi),
+        di kirim oleh thread read ahead. None: read ahead tidak di support.
+        """
+        return None
+
+    def page_from_response(self, response):
+        raise NotImplementedError
+
+    def iter_pages(self, limit=None, read_ahead=False):
+        """
+        Generator page (list of dict) dari remote, page di ambil saat di butuhkan.
+        read_ahead=True: page berikutnya di ambil di background thread selama page saat ini di proses.
+        Thread read ahead hanya mengirim request HTTP lewat requests.Session sendiri (snapshot auth),
+        payload di siapkan dan login ulang (401 / session expired) di thread pemanggil,
+        record auth dan cursor odoo tidak pernah di akses dari thread lain.
+        """
+        limit = limit or self.limit
+        cursor = 0
+        executor = ThreadPoolExecutor(max_workers=1) if read_ahead else None
+        http = None
+        future = None
+        try:
+            page = self.fetch_page(cursor, limit=limit)
+            while page:
+                next_cursor = None
+                if len(page) >= limit:
+                    if self.keyset:
+                        next_cursor = max(item.get('id') or 0 for item in page)
+                    else:
+                        next_cursor = cursor + len(page)
+                if executor and next_cursor is not None:
+                    request = self.prepare_page_request(next_cursor, limit=limit)
+                    if request is not None:
+                        http = http or self.session.detached_session()
+                        future = executor.submit(http.request, **request)
+                yield page
+                if next_cursor is None:
+                    break
+                page = None
+                if future:
+                    response, future = future.result(), None
+                    try:
+                        page = self.page_from_response(response)
+                    except RemoteAuthError:
+                        # login ulang di thread ini lewat fetch_page, snapshot auth di ambil ulang
+                        http.close()
+                        http = None
+                if page is None:
+                    page = self.fetch_page(next_cursor, limit=limit)
+                cursor = next_cursor
+        finally:
+            if executor:
+                future and future.cancel()
+                executor.shutdown(wait=True)
+            if http:
+                http.close()
+
+    def iter_records(self, limit=None, read_ahead=False):
+        for page in self.iter_pages(limit=limit, read_ahead=read_ahead):
+            yield from page
+
     def external_data_callback(self, call_back):
-        total = self.search_count()
+        total = None if self.keyset else self.search_count()
         offset = 0
-        limit = self.limit
-        row_count = self.limit
         _logger.info("Start : external_data_callback %s = total %s", self.model_name, total)
-        while total and row_count == limit:
-            data = self.search_read(offset=offset, limit=limit)
-            row_count = len(data) if data else 0
-            if row_count == 0:
-                break
-            _logger.info("Count %s ,Offset %s, Total: %s", row_count, offset, total)
-            for item in data:
-                offset = offset + 1
-                # self.ids = [item.get('id')]
-                call_back(item, offset=offset, total=total)
+        if self.keyset or total:
+            for page in self.iter_pages():
+                _logger.info("Count %s ,Offset %s, Total: %s", len(page), offset, total)
+                for item in page:
+                    offset = offset + 1
+                    call_back(item, offset=offset, total=total)
 
         _logger.info("Done : Offset %s = total %s", offset, total)
 
@@ -349,12 +541,25 @@ class OdooSession(requests.Session):
 
         if resp.status_code == 401:
             self.cookies.clear()
+            server_auth_cache.invalidate(self.auth_model)
             self.auth_model.reconnect_session(self)
             return super().request(*args, **kwargs)
 
         return resp
 
-    def jsonrpc_call(self, model_name, method, args, kw=None):
+    def detached_session(self):
+        """
+        requests.Session baru dengan snapshot auth session ini (cookie, header, basic auth, param),
+        untuk kirim request dari thread lain tanpa akses auth_model.
+        """
+        http = requests.Session()
+        http.cookies.update(self.cookies)
+        http.headers.update(self.headers)
+        http.auth = self.auth
+        http.params.update(self.params)
+        return http
+
+    def prepare_jsonrpc_payload(self, model_name, method, args, kw=None, request_id=2, force_auth=False):
         if self.session_rpc:
             payload = {
                 "jsonrpc": "2.0",
@@ -364,18 +569,21 @@ class OdooSession(requests.Session):
                     "method": method,
                     "args": args or [],
                     "kwargs": kw or {}
-                }
+                },
+                "id": request_id,
             }
         else:
             db, uid, username, password = self.auth_model.get_db_uid_username_password()
             if not db:
-                db = get_db_name(self.auth_model.get_db_name_endpoint_url())
+                db = server_auth_cache.get_db_name(self.auth_model)
                 if not db:
                     raise ValueError("Odoo RPC call requires database name")
 
             if not password:
                 password = self.auth_model.get_access_token()
 
+            # uid hasil discovery dari cache, force_auth setelah AccessDenied
+            uid = None if force_auth else server_auth_cache.get_uid(self.auth_model, db, username) or uid
             if not uid:
                 uid = odoo_rpc_auth(self.auth_model, self, db, username, password)
                 if not uid:
@@ -392,19 +600,137 @@ class OdooSession(requests.Session):
                     "method": "execute_kw",
                     "args": [db, uid, password, model_name, method, args, kw],
                 },
-                "id": 2,
+                "id": request_id,
             }
-        url = rest_url(self.get_endpoint_url(), self.get_rcp_path())
-        resp = self.post(url, json=normalize_json(payload))
-        resp.raise_for_status()
-        data = resp.json()
+        return payload
 
+    @staticmethod
+    def jsonrpc_result(data):
         # JSON-RPC error
         if "error" in data:
+            if is_access_denied_error(data['error']):
+                raise JsonRPCAccessDenied(f"Odoo login error: {data['error']}")
+            if is_session_expired_error(data['error']):
+                raise JsonRPCSessionExpired(f"Odoo login error: {data['error']}")
             raise RuntimeError(f"Odoo login error: {data['error']}")
 
         return data.get("result") or []
 
+    def prepare_jsonrpc_request(self, payload, url=None):
+        # argumen requests.request, bisa di kirim lewat detached_session
+        return {
+            'method': 'POST',
+            'url': url or rest_url(self.get_endpoint_url(), self.get_rcp_path()),
+            'data': json_codec.dumps_bytes(payload),
+            'headers': {'Content-Type': 'application/json'},
+        }
+
+    @classmethod
+    def jsonrpc_response_result(cls, resp):
+        check_auth_response(resp)
+        resp.raise_for_status()
+        return cls.jsonrpc_result(json_codec.response_json(resp))
+
+    def jsonrpc_post(self, payload, url=None):
+        return self.jsonrpc_response_result(self.request(**self.prepare_jsonrpc_request(payload, url)))
+
+    def reauthenticate(self):
+        """ login ulang setelah session expired / access denied """
+        self.cookies.clear()
+        server_auth_cache.invalidate(self.auth_model)
+        if self.session_rpc:
+            self.auth_model.reconnect_session(self)
+
+    def jsonrpc_call(self, model_name, method, args, kw=None):
+        payload = self.prepare_jsonrpc_payload(model_name, method, args, kw=kw)
+        try:
+            return self.jsonrpc_post(payload)
+        except JsonRPCAuthError:
+            # session / uid / db di cache sudah tidak valid, login ulang satu kali,
+            # bila masih gagal error di teruskan (session di buang dari pool)
+            self.reauthenticate()
+            payload = self.prepare_jsonrpc_payload(model_name, method, args, kw=kw, force_auth=not self.session_rpc)
+            return self.jsonrpc_post(payload)
+
+    def jsonrpc_batch_call(self, calls):
+        """
+        calls: list (model_name, method, args, kw).
+        Kirim semua call dalam satu request JSON-RPC 2.0 batch (/jsonrpc/batch),
+        bila server tidak support (404) fallback ke request concurrent.
+        return list result atau exception, urutan sama dengan calls.
+        """
+        if not calls:
+            return []
+        # payload (auth) di siapkan di thread ini, thread fallback hanya kirim request
+        payloads = [
+            self.prepare_jsonrpc_payload(model_name, method, args, kw=kw, request_id=i)
+            for i, (model_name, method, args, kw) in enumerate(calls)
+        ]
+        url = rest_url(self.get_endpoint_url(), JSONRPC_BATCH_PATH)
+        rpc_url = rest_url(self.get_endpoint_url(), self.get_rcp_path())
+        results = None
+        if _jsonrpc_batch_support.get(url, True):
+            resp = self.post(url, data=json_codec.dumps_bytes(payloads), headers={'Content-Type': 'application/json'})
+            if resp.status_code == 404:
+                _logger.info("JSON-RPC batch not supported %s, fallback concurrent request", url)
+                _jsonrpc_batch_support[url] = False
+            else:
+                resp.raise_for_status()
+                _jsonrpc_batch_support[url] = True
+                responses = {item.get('id'): item for item in json_codec.response_json(resp)}
+                results = []
+                for i in range(len(calls)):
+                    try:
+                        results.append(self.jsonrpc_result(responses.get(i) or {'error': 'No response'}))
+                    except Exception as e:
+                        results.append(e)
+
+        if results is None:
+            # thread fallback hanya kirim request lewat detached_session (tanpa akses auth_model),
+            # hasil dan error auth di proses di thread ini
+            http = self.detached_session()
+            try:
+                with ThreadPoolExecutor(max_workers=min(len(calls), JSONRPC_BATCH_WORKERS)) as executor:
+                    futures = [
+                        executor.submit(http.request, **self.prepare_jsonrpc_request(payload, rpc_url))
+                        for payload in payloads
+                    ]
+            finally:
+                http.close()
+            results = []
+            for future in futures:
+                try:
+                    results.append(self.jsonrpc_response_result(future.result()))
+                except Exception as e:
+                    results.append(e)
+
+        # batch maupun fallback sama seperti jsonrpc_call: login ulang satu kali, call yang gagal auth di kirim ulang
+        retry = [i for i, result in enumerate(results) if isinstance(result, RemoteAuthError)]
+        if retry:
+            self.reauthenticate()
+            for i in retry:
+                model_name, method, args, kw = calls[i]
+                payload = self.prepare_jsonrpc_payload(
+                    model_name, method, args, kw=kw, request_id=i, force_auth=not self.session_rpc and i == retry[0]
+                )
+                try:
+                    results[i] = self.jsonrpc_post(payload, rpc_url)
+                except Exception as e:
+                    results[i] = e
+        return results
+
+    @contextmanager
+    def batch(self):
+        """
+        with session.batch() as b:
+            count = b.call('res.partner', 'search_count', [[]])
+            page = b.call('res.partner', 'search_read', [], {'limit': 80})
+        count.result(), page.result()
+        """
+        batch = JsonRPCBatch(self)
+        yield batch
+        batch.flush()
+
     def create_remote_model(self, model_name, **kwargs):
         if self.auth_model.auth_type in ('odoo-rcp', 'jwt-odoo-rcp'):
             remote_model = JsonRPCRemoteModel(model_name, self, **kwargs)
@@ -413,18 +739,203 @@ class OdooSession(requests.Session):
         return remote_model
 
 
+JSONRPC_BATCH_PATH = '/jsonrpc/batch'
+JSONRPC_BATCH_WORKERS = 4
+# endpoint url: server support /jsonrpc/batch
+_jsonrpc_batch_support = {}
+
+server_auth_cache = ServerAuthCache()
+
+
+class JsonRPCBatch:
+    """ kumpulan call yang di kirim sekaligus saat flush, hasil lewat Future """
+
+    def __init__(self, session):
+        self.session = session
+        self.calls = []
+
+    def call(self, model_name, method, args=None, kw=None):
+        future = Future()
+        self.calls.append(((model_name, method, args or [], kw), future))
+        return future
+
+    def flush(self):
+        calls, self.calls = self.calls, []
+        if not calls:
+            return
+        try:
+            results = self.session.jsonrpc_batch_call([call for call, future in calls])
+        except Exception as e:
+            for call, future in calls:
+                future.set_exception(e)
+            raise
+        for (call, future), result in zip(calls, results):
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+
+# =========================
+# SESSION POOL
+# =========================
+class OdooSessionPool:
+    """
+    Pool OdooSession process wide, key: server + credential.
+    Session yang sudah authenticate (cookie / uid / header) dan koneksi TCP/TLS
+    di pakai ulang antar call. Re-authenticate lewat 401 di OdooSession.request
+    atau error SessionExpired / AccessDenied di OdooSession.jsonrpc_call.
+    """
+
+    def __init__(self, max_size=4, idle_timeout=300, wait_timeout=60):
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.wait_timeout = wait_timeout
+        self._condition = threading.Condition()
+        self._idle = defaultdict(list)  # key: [(last_used, session)]
+        self._in_use = defaultdict(int)
+        # key: {thread ident: jumlah session yang sedang di pakai thread}
+        self._owners = defaultdict(lambda: defaultdict(int))
+
+    def ensure_max_size(self, size):
+        # minimal sebanyak worker yang memakai pool bersamaan (misal worker process data paralel)
+        with self._condition:
+            if size > self.max_size:
+                self.max_size = size
+                self._condition.notify_all()
+
+    def _evict_idle(self):
+        # dipanggil dengan lock
+        expired = []
+        limit = time.monotonic() - self.idle_timeout
+        for key in list(self._idle):
+            items = self._idle[key]
+            keep = [item for item in items if item[0] >= limit]
+            expired.extend(item[1] for item in items if item[0] < limit)
+            if keep:
+                self._idle[key] = keep
+            else:
+                del self._idle[key]
+        return expired
+
+    def acquire(self, key, factory):
+        deadline = time.monotonic() + self.wait_timeout
+        ident = threading.get_ident()
+        with self._condition:
+            expired = self._evict_idle()
+            # thread yang sudah memegang session key ini (pooled_session bersarang) tidak menunggu dirinya sendiri
+            reentrant = bool(self._owners.get(key, {}).get(ident))
+            while True:
+                if self._idle.get(key):
+                    odoo_session = self._idle[key].pop()[1]
+                    break
+                if self._in_use[key] < self.max_size or reentrant:
+                    odoo_session = None
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise RuntimeError("Odoo session pool exhausted for %s" % (key,))
+                self._condition.wait(remaining)
+            self._in_use[key] += 1
+            self._owners[key][ident] += 1
+
+        for s in expired:
+            s.close()
+
+        if odoo_session is None:
+            try:
+                odoo_session = factory()
+                odoo_session.connect()
+            except Exception:
+                self._release_slot(key)
+                raise
+        return odoo_session
+
+    def _release_slot(self, key):
+        ident = threading.get_ident()
+        with self._condition:
+            self._in_use[key] -= 1
+            if self._in_use[key] <= 0:
+                del self._in_use[key]
+            owners = self._owners[key]
+            owners[ident] -= 1
+            if owners[ident] <= 0:
+                del owners[ident]
+            if not owners:
+                del self._owners[key]
+            self._condition.notify()
+
+    def release(self, key, odoo_session, discard=False):
+        if not discard:
+            with self._condition:
+                # session lebih dari max_size (acquire reentrant) tidak di simpan
+                if len(self._idle[key]) < self.max_size:
+                    self._idle[key].append((time.monotonic(), odoo_session))
+                    odoo_session = None
+        if odoo_session is not None:
+            odoo_session.close()
+        self._release_slot(key)
+
+    @contextmanager
+    def session(self, key, factory):
+        odoo_session = self.acquire(key, factory)
+        discard = False
+        try:
+            yield odoo_session
+        except (requests.RequestException, RemoteAuthError):
+            # koneksi / auth bermasalah, jangan di kembalikan ke pool
+            discard = True
+            raise
+        finally:
+            self.release(key, odoo_session, discard=discard)
+
+    def clear(self):
+        with self._condition:
+            sessions = [item[1] for items in self._idle.values() for item in items]
+            self._idle.clear()
+        for s in sessions:
+            s.close()
+
+
+session_pool = OdooSessionPool()
+
+
 class JsonRPCRemoteModel(RemoteModel):
     def __init__(self, model_name, session: OdooSession, **kwargs):
         super().__init__(model_name, **kwargs)
         self.session = session
 
-    def call(self, method, args, kw=None):
+    def prepare_kw(self, kw=None):
         kw = dict(kw or {})
-        context = self.context or {}
+        context = dict(self.context or {})
         if 'context' in kw:
             context.update(kw['context'] or {})
         kw['context'] = context
-        return self.session.jsonrpc_call(self.model_name, method, args, kw=kw)
+        return kw
+
+    def call(self, method, args, kw=None):
+        return self.session.jsonrpc_call(self.model_name, method, args, kw=self.prepare_kw(kw))
+
+    def prepare_page_request(self, cursor, limit=None):
+        kw = self.prepare_kw(self.search_read_kw(**self.fetch_page_args(cursor, limit=limit)))
+        payload = self.session.prepare_jsonrpc_payload(self.model_name, 'search_read', [], kw=kw)
+        return self.session.prepare_jsonrpc_request(payload)
+
+    def page_from_response(self, response):
+        return self.session.jsonrpc_response_result(response)
+
+    def read_many(self, ids_chunks, fields=None):
+        # semua chunk dalam satu round trip (JSON-RPC batch)
+        kw = self.prepare_kw({'fields': fields or self.fields})
+        futures = []
+        try:
+            with self.session.batch() as batch:
+                futures = [batch.call(self.model_name, 'read', [ids], kw) for ids in ids_chunks]
+        except Exception:
+            # request batch gagal, flush sudah mengisi exception ke semua future
+            if not all(future.done() for future in futures):
+                raise
+        return [future.exception() or future.result() for future in futures]
 
     def __getattr__(self, method):
         def delegate_func(*args, **kw):
@@ -454,16 +965,20 @@ class RestModelObject(RemoteModel):
     def __init__(self, model_name, session, **kwargs):
         super().__init__(model_name, **kwargs)
         self.session = session
+        # stream=True: iter_pages memakai mode stream NDJSON api/sync/data (satu request full scan)
+        self.stream = kwargs.get('stream', False)
 
-    def rest_path_get(self, params=None, _id=None):
+    def rest_path_url(self, _id=None):
         if _id is not None:
             path = f"{self.model_name}/{_id}"
         else:
             path = self.model_name
-        url = self.session.get_rest_url(path)
-        return self.session.get(url, params=params)
+        return self.session.get_rest_url(path)
 
-    def search_read(self, domain=None, fields=None, offset=0, limit=None, order=None, context=None):
+    def rest_path_get(self, params=None, _id=None):
+        return self.session.get(self.rest_path_url(_id), params=params)
+
+    def search_read_params(self, domain=None, fields=None, offset=0, limit=None, order=None, context=None):
         params = {}
 
         domain = domain or self.domain
@@ -474,7 +989,8 @@ class RestModelObject(RemoteModel):
         if fields is not None:
             params['fields'] = str(fields)
 
-        offset = offset or self.offset
+        # keyset: page di batasi domain id > last_id, offset model tidak boleh ikut
+        offset = 0 if self.keyset else offset or self.offset
         if offset is not None:
             params['offset'] = offset
 
@@ -489,13 +1005,87 @@ class RestModelObject(RemoteModel):
         context = context or self.context
         if context:
             params['context'] = str(context)
+        return params
 
-        response = self.rest_path_get(params=params)
+    def search_read_result(self, response):
+        if self.is_empty_result(response):
+            return []
         response.raise_for_status()
-        data = response.json()
+        data = json_codec.response_json(response)
         return data.get("results", [])
 
-    def read(self, ids=None, fields=None):
+    def search_read(self, domain=None, fields=None, offset=0, limit=None, order=None, context=None):
+        params = self.search_read_params(domain, fields, offset, limit, order, context)
+        return self.search_read_result(self.rest_path_get(params=params))
+
+    def prepare_page_request(self, cursor, limit=None):
+        params = self.search_read_params(**self.fetch_page_args(cursor, limit=limit))
+        return {'method': 'GET', 'url': self.rest_path_url(), 'params': params}
+
+    def page_from_response(self, response):
+        check_auth_response(response)
+        return self.search_read_result(response)
+
+    @staticmethod
+    def is_empty_result(response):
+        # server api/sync/data return 404 bila search_read tidak ada data
+        if response.status_code != 404:
+            return False
+        try:
+            description = response.json().get('error_description') or ''
+        except ValueError:
+            return False
+        return description.startswith('No Record found')
+
+    def stream_read(self, domain=None, fields=None, after_id=0, limit=None, page_size=None, context=None):
+        """
+        Generator record dari api/sync/data mode stream (NDJSON, keyset id > after_id, gzip).
+        """
+        params = {'stream': 1, 'after_id': after_id or 0}
+        domain = domain or self.domain
+        if domain:
+            params['domain'] = str(domain)
+        fields = fields or self.fields
+        if fields is not None:
+            params['fields'] = str(fields)
+        if limit:
+            params['limit'] = limit
+        if page_size:
+            params['page_size'] = page_size
+        context = context or self.context
+        if context:
+            params['context'] = str(context)
+
+        url = self.session.get_rest_url(self.model_name)
+        with self.session.get(url, params=params, stream=True) as response:
+            if self.is_empty_result(response):
+                return
+            response.raise_for_status()
+            for line in response.iter_lines():
+                if not line:
+                    continue
+                record = json_codec.loads(line)
+                if 'id' not in record and 'error' in record:
+                    raise requests.HTTPError(
+                        "%s: %s" % (record.get('error'), record.get('error_description')), response=response
+                    )
+                yield record
+
+    def iter_pages(self, limit=None, read_ahead=False):
+        if not self.stream:
+            yield from super().iter_pages(limit=limit, read_ahead=read_ahead)
+            return
+        page_size = limit or self.limit or 100
+        page = []
+        for record in self.stream_read(page_size=max(page_size, 1000)):
+            page.append(record)
+            if len(page) >= page_size:
+                yield page
+                page = []
+        if page:
+            yield page
+
+    def read_params(self, ids=None, fields=None):
         # if not ids and self.ids and isinstance(self.ids, (list, tuple)):
         #     ids = self.ids[0]
         params = {}
@@ -509,20 +1099,30 @@ class RestModelObject(RemoteModel):
             params['fields'] = str(fields)
         if self.context:
             params['context'] = str(self.context)
-        response = self.rest_path_get(params=params, _id=_id)
+        return params, _id
+
+    @staticmethod
+    def read_result(response):
         response.raise_for_status()
-        data = response.json()
+        data = json_codec.response_json(response)
         return data.get("results", [])
 
-    def search_count(self):
+    def read(self, ids=None, fields=None):
+        params, _id = self.read_params(ids, fields)
+        return self.read_result(self.rest_path_get(params=params, _id=_id))
+
+    def search_count_params(self):
         params = {}
         if self.domain:
             params['domain'] = str(self.domain)
         if self.context:
             params['context'] = str(self.context)
         params['count'] = True
-        response = self.rest_path_get(params=params)
-        return response.json().get("count", 0)
+        return params
+
+    def search_count(self):
+        response = self.rest_path_get(params=self.search_count_params())
+        return json_codec.response_json(response).get("count", 0)
 
     def __str__(self):
         return "remote.RestModelObject({})".format(self.model_name)
@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+"""
+Transport asyncio (httpx) untuk remote model, surface sama dengan JsonRPCRemoteModel / RestModelObject
+tetapi method remote berupa coroutine. Session async di buat dari OdooSession (sync) yang sudah connect,
+cookie / header auth di pakai ulang. Concurrency per server di batasi semaphore.
+
+Pemakaian dari cron (sync):
+    results = remote_async.gather(session, 'res.partner', fetch, items)
+"""
+import asyncio
+import logging
+
+import requests
+
+from . import json_codec
+from .remote import JsonRPCRemoteModel, OdooSession, RestModelObject, rest_url
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+_logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_CONCURRENCY = 8
+DEFAULT_TIMEOUT = 120
+
+
+def is_available():
+    return httpx is not None
+
+
+class AsyncOdooSession:
+    """
+    Pasangan async dari OdooSession. Payload jsonrpc (auth) tetap di siapkan lewat session sync,
+    coroutine berjalan di thread yang sama (asyncio.run) sehingga aman mengakses auth model.
+    """
+
+    def __init__(self, sync_session: OdooSession, max_concurrency=DEFAULT_MAX_CONCURRENCY, timeout=DEFAULT_TIMEOUT):
+        if not is_available():
+            raise ImportError("httpx is required for async remote transport")
+        self.sync_session = sync_session
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.client = None
+        self.semaphore = None
+
+    async def __aenter__(self):
+        self.semaphore = asyncio.Semaphore(self.max_concurrency)
+        self.client = httpx.AsyncClient(
+            timeout=self.timeout,
+            limits=httpx.Limits(max_connections=self.max_concurrency,
+                                max_keepalive_connections=self.max_concurrency),
+            **self.client_auth_kwargs()
+        )
+        return self
+
+    def client_auth_kwargs(self):
+        """ snapshot auth session sync (cookie, header, basic auth, param) untuk httpx.AsyncClient """
+        kwargs = {
+            'cookies': self.sync_session.cookies.get_dict(),
+            'headers': dict(self.sync_session.headers),
+            'params': dict(self.sync_session.params),
+        }
+        auth = self.sync_session.auth
+        if isinstance(auth, requests.auth.HTTPBasicAuth):
+            # httpx tidak mengenal auth object requests, basic auth cukup tuple
+            auth = (auth.username, auth.password)
+        if auth:
+            kwargs['auth'] = auth
+        return kwargs
+
+    async def __aexit__(self, *args):
+        await self.client.aclose()
+        self.client = None
+
+    async def get(self, url, params=None):
+        async with self.semaphore:
+            return await self.client.get(url, params=params)
+
+    async def post(self, url, content=None, headers=None):
+        async with self.semaphore:
+            return await self.client.post(url, content=content, headers=headers)
+
+    def get_rest_url(self, path=None):
+        return self.sync_session.get_rest_url(path)
+
+    async def jsonrpc_call(self, model_name, method, args, kw=None):
+        payload = self.sync_session.prepare_jsonrpc_payload(model_name, method, args, kw=kw)
+        url = rest_url(self.sync_session.get_endpoint_url(), self.sync_session.get_rcp_path())
+        resp = await self.post(url, content=json_codec.dumps_bytes(payload),
+                               headers={'Content-Type': 'application/json'})
+        resp.raise_for_status()
+        return OdooSession.jsonrpc_result(json_codec.response_json(resp))
+
+    def create_remote_model(self, model_name, **kwargs):
+        if self.sync_session.auth_model.auth_type in ('odoo-rcp', 'jwt-odoo-rcp'):
+            return AsyncJsonRPCRemoteModel(model_name, self, **kwargs)
+        return AsyncRestModelObject(model_name, self, **kwargs)
+
+
+class AsyncJsonRPCRemoteModel(JsonRPCRemoteModel):
+    """ search_read, read, search_count dan method lain return coroutine """
+
+    async def call(self, method, args, kw=None):
+        return await self.session.jsonrpc_call(self.model_name, method, args, kw=self.prepare_kw(kw))
+
+    async def read_many(self, ids_chunks, fields=None):
+        return await asyncio.gather(*[self.read(ids, fields=fields) for ids in ids_chunks], return_exceptions=True)
+
+
+class AsyncRestModelObject(RestModelObject):
+    """ search_read, read, search_count return coroutine, mode stream tidak di support """
+
+    async def rest_path_get(self, params=None, _id=None):
+        # requests membuang param None, httpx tidak
+        params = {k: v for k, v in (params or {}).items() if v is not None}
+        return await self.session.get(self.rest_path_url(_id), params=params)
+
+    async def search_read(self, domain=None, fields=None, offset=0, limit=None, order=None, context=None):
+        params = self.search_read_params(domain, fields, offset, limit, order, context)
+        return self.search_read_result(await self.rest_path_get(params=params))
+
+    async def read(self, ids=None, fields=None):
+        params, _id = self.read_params(ids, fields)
+        return self.read_result(await self.rest_path_get(params=params, _id=_id))
+
+    async def search_count(self):
+        response = await self.rest_path_get(params=self.search_count_params())
+        return json_codec.response_json(response).get("count", 0)
+
+    async def read_many(self, ids_chunks, fields=None):
+        return await asyncio.gather(*[self.read(ids, fields=fields) for ids in ids_chunks], return_exceptions=True)
+
+
+def gather(sync_session, model_name, func, items, max_concurrency=DEFAULT_MAX_CONCURRENCY,
+           return_exceptions=True, **kwargs):
+    """
+    Jalankan func(async_model, item) untuk semua item secara concurrent (maks max_concurrency per server),
+    return list hasil sesuai urutan items (exception sebagai hasil bila return_exceptions).
+    """
+    async def run():
+        async with AsyncOdooSession(sync_session, max_concurrency=max_concurrency) as session:
+            model = session.create_remote_model(model_name, **kwargs)
+            return await asyncio.gather(*[func(model, item) for item in items],
+                                        return_exceptions=return_exceptions)
+
+    return asyncio.run(run())
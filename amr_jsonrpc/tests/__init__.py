@@ -0,0 +1,10 @@
+# -*- coding: utf-8 -*-
+
+from . import test_async
+from . import test_auth_cache
+from . import test_batch_call
+from . import test_json_codec
+from . import test_read_ahead
+from . import test_remote_paging
+from . import test_session_pool
+from . import test_stream_read
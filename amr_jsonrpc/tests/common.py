@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+
+import threading
+
+from contextlib import contextmanager
+from unittest.mock import patch
+
+import requests
+
+from odoo.tests.common import BaseCase
+
+from .. import json_codec, remote
+
+
+class FakeAuthModel:
+    """ pengganti client.auth.mixin tanpa database """
+
+    def __init__(self, auth_type='odoo-rcp', username='admin', password='admin', access_token=None,
+                 db='test_db', uid=None, endpoint_url='http://remote.test', token_in='header', token_key='token'):
+        self.auth_type = auth_type
+        self.username = username
+        self.password = password
+        self.access_token = access_token
+        self.refresh_token = None
+        self.expires_at = None
+        self.token_in = token_in
+        self.token_key = token_key
+        self.odoo_server_db = db
+        self.odoo_server_uid = uid
+        self.endpoint_url = endpoint_url
+        self.connect_count = 0
+
+    def get_auth_type(self):
+        return self.auth_type
+
+    def get_endpoint_url(self):
+        return self.endpoint_url
+
+    def get_db_name(self):
+        return self.odoo_server_db
+
+    def get_db_name_endpoint_url(self):
+        return f"{self.endpoint_url}/sync/db_name"
+
+    def get_token_endpoint_url(self):
+        return None
+
+    def get_username(self):
+        return self.username
+
+    def get_access_token(self):
+        return self.access_token
+
+    def get_username_password(self):
+        return self.username, self.password
+
+    def get_db_uid_username_password(self):
+        return self.odoo_server_db, self.odoo_server_uid, self.username, self.password
+
+    def connect_session(self, odoo_session):
+        self.connect_count += 1
+        if self.auth_type != 'odoo-rcp':
+            remote.apply_auth(self, odoo_session)
+        else:
+            # session rpc: cookie session_id dari login
+            odoo_session.cookies.set('session_id', 'session-%s' % self.connect_count)
+
+    def reconnect_session(self, odoo_session):
+        self.connect_session(odoo_session)
+
+    def update_token(self, access_token, refresh_token=None, expires_at=None):
+        self.access_token = access_token
+
+
+class ThreadCheckedAuthModel(FakeAuthModel):
+    """ catat thread yang mengakses auth model (record odoo tidak thread safe) """
+
+    def __init__(self, *args, **kwargs):
+        self.access_threads = set()
+        super().__init__(*args, **kwargs)
+
+    def __getattribute__(self, name):
+        if not name.startswith('__') and name != 'access_threads':
+            object.__getattribute__(self, 'access_threads').add(threading.current_thread())
+        return object.__getattribute__(self, name)
+
+
+class FakeResponse:
+
+    def __init__(self, data=None, status_code=200):
+        self.status_code = status_code
+        self.content = json_codec.dumps_bytes(data if data is not None else {})
+
+    def json(self):
+        return json_codec.loads(self.content)
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError("HTTP %s" % self.status_code, response=self)
+
+
+def rpc_result(result, request_id=2):
+    return FakeResponse({'jsonrpc': '2.0', 'id': request_id, 'result': result})
+
+
+def rpc_error(name, code=200, request_id=2):
+    return FakeResponse({'jsonrpc': '2.0', 'id': request_id, 'error': {
+        'code': code, 'message': name, 'data': {'name': name},
+    }})
+
+
+SESSION_EXPIRED = 'odoo.http.SessionExpiredException'
+ACCESS_DENIED = 'odoo.exceptions.AccessDenied'
+
+
+class RemoteCase(BaseCase):
+
+    def setUp(self):
+        super().setUp()
+        remote.server_auth_cache.clear()
+        remote.session_pool.clear()
+        self.addCleanup(remote.server_auth_cache.clear)
+        self.addCleanup(remote.session_pool.clear)
+
+    @contextmanager
+    def mock_http(self, *responses):
+        """
+        patch requests.Session.request: response di ambil berurutan,
+        list request (method, url, kwargs, session, thread) bisa di cek setelahnya.
+        """
+        queue = list(responses)
+        calls = []
+
+        def fake_request(session, method, url, *args, **kwargs):
+            calls.append((method, url, kwargs, session, threading.current_thread()))
+            response = queue.pop(0)
+            return response(session, method, url, **kwargs) if callable(response) else response
+
+        with patch.object(requests.Session, 'request', autospec=True, side_effect=fake_request):
+            yield calls
+
+
+class MemoryRemoteModel(remote.RemoteModel):
+    """ RemoteModel di atas list dict (id terurut), call di catat di self.calls """
+
+    def __init__(self, rows, **kwargs):
+        super().__init__('res.partner', **kwargs)
+        self.rows = rows
+        self.calls = []
+
+    def call(self, method, args, kw=None):
+        kw = kw or {}
+        self.calls.append((method, args, kw))
+        if method == 'search_count':
+            return len(self.rows)
+        if method == 'search_read':
+            rows = sorted(self.rows, key=lambda r: r['id'])
+            for name, op, value in kw.get('domain') or []:
+                if name == 'id' and op == '>':
+                    rows = [r for r in rows if r['id'] > value]
+            offset = kw.get('offset') or 0
+            limit = kw.get('limit')
+            return [dict(r) for r in rows[offset:offset + limit if limit else None]]
+        if method == 'read':
+            ids = set(args[0]) if args else set()
+            return [dict(r) for r in self.rows if r['id'] in ids]
+        raise NotImplementedError(method)
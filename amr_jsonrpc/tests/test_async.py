@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+
+import asyncio
+import unittest
+
+from requests.auth import HTTPBasicAuth
+
+from odoo.tests import tagged
+
+from .. import remote, remote_async
+from .common import FakeAuthModel, RemoteCase
+
+
+@tagged('post_install', '-at_install')
+@unittest.skipUnless(remote_async.is_available(), "httpx not installed")
+class TestAsyncSessionAuth(RemoteCase):
+
+    def async_session(self, **kwargs):
+        odoo_session = remote.OdooSession(FakeAuthModel(**kwargs))
+        odoo_session.connect()
+        return remote_async.AsyncOdooSession(odoo_session)
+
+    def client_of(self, session):
+        # client httpx yang di buat __aenter__
+        async def run():
+            async with session:
+                return session.client
+        return asyncio.run(run())
+
+    def test_odoo_rpc_cookie(self):
+        kwargs = self.async_session(auth_type='odoo-rcp').client_auth_kwargs()
+        self.assertEqual(kwargs['cookies'], {'session_id': 'session-1'})
+        self.assertNotIn('auth', kwargs)
+
+    def test_token_header(self):
+        kwargs = self.async_session(auth_type='rest-token', access_token='abc',
+                                    token_in='header', token_key='api-key').client_auth_kwargs()
+        self.assertEqual(kwargs['headers']['api-key'], 'abc')
+        self.assertFalse(kwargs['params'])
+
+    def test_token_bearer(self):
+        kwargs = self.async_session(auth_type='rest-token', access_token='abc',
+                                    token_in='bearer').client_auth_kwargs()
+        self.assertEqual(kwargs['headers']['Authorization'], 'Bearer abc')
+
+    def test_token_param(self):
+        session = self.async_session(auth_type='rest-token', access_token='abc',
+                                     token_in='param', token_key='access_token')
+        self.assertEqual(session.client_auth_kwargs()['params'], {'access_token': 'abc'})
+        client = self.client_of(session)
+        self.assertEqual(client.params.get('access_token'), 'abc')
+
+    def test_basic_auth(self):
+        session = self.async_session(auth_type='basic', username='user', password='secret')
+        self.assertEqual(session.client_auth_kwargs()['auth'], ('user', 'secret'))
+        client = self.client_of(session)
+        self.assertIsNotNone(client.auth)
+
+    def test_basic_auth_object(self):
+        session = self.async_session(auth_type='basic', username='user', password='secret')
+        session.sync_session.auth = HTTPBasicAuth('user', 'secret')
+        self.assertEqual(session.client_auth_kwargs()['auth'], ('user', 'secret'))
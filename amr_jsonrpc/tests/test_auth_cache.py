@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+
+from odoo.tests import tagged
+
+from .. import remote
+from .common import FakeAuthModel, FakeResponse, RemoteCase, rpc_error, rpc_result
+
+
+class UidWriteAuthModel(FakeAuthModel):
+    """ catat write odoo_server_uid (write record auth) """
+
+    def __init__(self, *args, **kwargs):
+        self.uid_writes = []
+        super().__init__(*args, **kwargs)
+
+    def __setattr__(self, name, value):
+        if name == 'odoo_server_uid' and hasattr(self, 'odoo_server_uid'):
+            self.uid_writes.append(value)
+        super().__setattr__(name, value)
+
+
+@tagged('post_install', '-at_install')
+class TestServerAuthCache(RemoteCase):
+
+    def test_db_name_from_setting(self):
+        auth = FakeAuthModel(db='setting_db')
+        with self.mock_http() as calls:
+            self.assertEqual(remote.server_auth_cache.get_db_name(auth), 'setting_db')
+        self.assertFalse(calls)
+
+    def test_db_name_discovered_once(self):
+        auth = FakeAuthModel(db=None)
+        with self.mock_http(FakeResponse({'db': 'remote_db'})) as calls:
+            self.assertEqual(remote.server_auth_cache.get_db_name(auth), 'remote_db')
+            self.assertEqual(remote.server_auth_cache.get_db_name(FakeAuthModel(db=None)), 'remote_db')
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(calls[0][1], auth.get_db_name_endpoint_url())
+
+    def test_db_name_discovery_error_not_cached(self):
+        auth = FakeAuthModel(db=None)
+        with self.mock_http(FakeResponse({}, status_code=500), FakeResponse({'db': 'remote_db'})) as calls:
+            self.assertIsNone(remote.server_auth_cache.get_db_name(auth))
+            self.assertEqual(remote.server_auth_cache.get_db_name(auth), 'remote_db')
+        self.assertEqual(len(calls), 2)
+
+    def test_invalidate_per_server_and_username(self):
+        cache = remote.server_auth_cache
+        auth = FakeAuthModel(username='user_a')
+        other_user = FakeAuthModel(username='user_b')
+        other_server = FakeAuthModel(username='user_a', endpoint_url='http://other.test')
+        for model, uid in ((auth, 2), (other_user, 3), (other_server, 4)):
+            cache.set_uid(model, 'test_db', model.get_username(), uid)
+
+        cache.invalidate(auth)
+        self.assertIsNone(cache.get_uid(auth, 'test_db', 'user_a'))
+        self.assertEqual(cache.get_uid(other_user, 'test_db', 'user_b'), 3)
+        self.assertEqual(cache.get_uid(other_server, 'test_db', 'user_a'), 4)
+
+        cache.clear()
+        self.assertIsNone(cache.get_uid(other_user, 'test_db', 'user_b'))
+
+    def test_uid_discovered_once(self):
+        auth = FakeAuthModel(auth_type='jwt-odoo-rcp')
+        with self.mock_http(rpc_result(7, request_id=1), rpc_result([{'id': 1}]),
+                            rpc_result([{'id': 2}])) as calls:
+            remote.OdooSession(auth).jsonrpc_call('res.partner', 'read', [[1]])
+            # auth model lain (uid belum di setting) ke server yang sama
+            remote.OdooSession(FakeAuthModel(auth_type='jwt-odoo-rcp')).jsonrpc_call('res.partner', 'read', [[2]])
+        # satu authenticate, dua execute_kw dengan uid dari cache
+        self.assertEqual(len(calls), 3)
+        payload = remote.json_codec.loads(calls[2][2]['data'])
+        self.assertEqual(payload['params']['args'][1], 7)
+        self.assertEqual(remote.server_auth_cache.get_uid(auth, 'test_db', 'admin'), 7)
+
+    def test_login_writes_uid_only_on_change(self):
+        auth = UidWriteAuthModel(auth_type='jwt-odoo-rcp')
+        odoo_session = remote.OdooSession(auth)
+        with self.mock_http(rpc_result(7, request_id=1), rpc_result(7, request_id=1)):
+            remote.odoo_rpc_auth(auth, odoo_session, 'test_db', 'admin', 'admin')
+            remote.odoo_rpc_auth(auth, odoo_session, 'test_db', 'admin', 'admin')
+        self.assertEqual(auth.uid_writes, [7])
+
+    def test_login_error_invalidates(self):
+        auth = FakeAuthModel(auth_type='jwt-odoo-rcp')
+        remote.server_auth_cache.set_uid(auth, 'test_db', 'admin', 7)
+        odoo_session = remote.OdooSession(auth)
+        with self.mock_http(rpc_error('odoo.exceptions.AccessDenied', request_id=1)):
+            with self.assertRaises(remote.JsonRPCAuthError):
+                remote.odoo_rpc_auth(auth, odoo_session, 'test_db', 'admin', 'admin')
+        self.assertIsNone(remote.server_auth_cache.get_uid(auth, 'test_db', 'admin'))
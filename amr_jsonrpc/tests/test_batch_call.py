@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+
+import threading
+
+from odoo.tests import tagged
+
+from .. import json_codec, remote
+from .common import SESSION_EXPIRED, FakeResponse, RemoteCase, ThreadCheckedAuthModel, rpc_error, rpc_result
+
+
+def reply(expired_ids=()):
+    """ response fallback per request sesuai id payload (request concurrent, urutan tidak pasti) """
+    expired = set(expired_ids)
+
+    def respond(session, method, url, **kwargs):
+        request_id = json_codec.loads(kwargs['data'])['id']
+        if request_id in expired:
+            expired.discard(request_id)
+            return rpc_error(SESSION_EXPIRED, code=100, request_id=request_id)
+        return rpc_result([{'id': request_id}], request_id=request_id)
+    return respond
+
+
+@tagged('post_install', '-at_install')
+class TestJsonRPCBatchCall(RemoteCase):
+
+    def setUp(self):
+        super().setUp()
+        remote._jsonrpc_batch_support.clear()
+        self.addCleanup(remote._jsonrpc_batch_support.clear)
+        self.auth = ThreadCheckedAuthModel()
+        self.session = remote.OdooSession(self.auth)
+        self.session.connect()
+        self.calls = [('res.partner', 'read', [[i]], {}) for i in range(3)]
+
+    def test_batch_endpoint(self):
+        response = FakeResponse([
+            {'jsonrpc': '2.0', 'id': i, 'result': [{'id': i}]} for i in (2, 0, 1)
+        ])
+        with self.mock_http(response) as calls:
+            results = self.session.jsonrpc_batch_call(self.calls)
+        self.assertEqual(results, [[{'id': 0}], [{'id': 1}], [{'id': 2}]])
+        self.assertEqual(len(calls), 1)
+
+    def test_fallback_detached_session(self):
+        respond = reply()
+        with self.mock_http(FakeResponse({}, status_code=404), respond, respond, respond) as calls:
+            results = self.session.jsonrpc_batch_call(self.calls)
+        self.assertEqual(results, [[{'id': 0}], [{'id': 1}], [{'id': 2}]])
+        for method, url, kwargs, session, thread in calls[1:]:
+            self.assertNotIsInstance(session, remote.OdooSession)
+            self.assertEqual(session.cookies.get('session_id'), 'session-1')
+        # auth model hanya di akses dari thread pemanggil
+        self.assertEqual(self.auth.access_threads, {threading.current_thread()})
+
+    def test_fallback_reauthenticate_on_main_thread(self):
+        respond = reply(expired_ids=[1])
+        with self.mock_http(FakeResponse({}, status_code=404), respond, respond, respond, respond) as calls:
+            results = self.session.jsonrpc_batch_call(self.calls)
+        self.assertEqual(results, [[{'id': 0}], [{'id': 1}], [{'id': 2}]])
+        # retry lewat OdooSession setelah login ulang
+        self.assertIsInstance(calls[-1][3], remote.OdooSession)
+        self.assertEqual(self.auth.connect_count, 2)
+        self.assertEqual(self.auth.access_threads, {threading.current_thread()})
+
+    def test_batch_endpoint_reauthenticate(self):
+        response = FakeResponse([
+            {'jsonrpc': '2.0', 'id': 0, 'result': [{'id': 0}]},
+            {'jsonrpc': '2.0', 'id': 1, 'error': {'code': 100, 'message': SESSION_EXPIRED,
+                                                  'data': {'name': SESSION_EXPIRED}}},
+            {'jsonrpc': '2.0', 'id': 2, 'result': [{'id': 2}]},
+        ])
+        with self.mock_http(response, rpc_result([{'id': 1}], request_id=1)) as calls:
+            results = self.session.jsonrpc_batch_call(self.calls)
+        self.assertEqual(results, [[{'id': 0}], [{'id': 1}], [{'id': 2}]])
+        # satu request batch, satu kirim ulang setelah login ulang
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(self.auth.connect_count, 2)
+
+    def test_read_many_failed_chunk(self):
+        response = FakeResponse([
+            {'jsonrpc': '2.0', 'id': 0, 'result': [{'id': 1}]},
+            {'jsonrpc': '2.0', 'id': 1, 'error': {'code': 200, 'message': 'odoo.exceptions.AccessError',
+                                                  'data': {'name': 'odoo.exceptions.AccessError'}}},
+            {'jsonrpc': '2.0', 'id': 2, 'result': [{'id': 3}]},
+        ])
+        model = remote.JsonRPCRemoteModel('res.partner', self.session)
+        with self.mock_http(response):
+            results = model.read_many([[1], [2], [3]])
+        # chunk yang gagal tidak membatalkan chunk lain
+        self.assertEqual(results[0], [{'id': 1}])
+        self.assertIsInstance(results[1], RuntimeError)
+        self.assertEqual(results[2], [{'id': 3}])
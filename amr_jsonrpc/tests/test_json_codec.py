@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+
+from datetime import date, datetime
+from decimal import Decimal
+from uuid import UUID
+
+from odoo.tests import tagged
+from odoo.tests.common import BaseCase
+
+from .. import json_codec
+from .common import FakeResponse
+
+
+@tagged('post_install', '-at_install')
+class TestJsonCodec(BaseCase):
+
+    def test_dumps_types(self):
+        value = {
+            'datetime': datetime(2020, 1, 31, 10, 20, 30),
+            'date': date(2020, 1, 31),
+            'decimal': Decimal('1.5'),
+            'uuid': UUID('12345678-1234-5678-1234-567812345678'),
+            'set': {1},
+            'bytes': b'abc',
+        }
+        self.assertEqual(json_codec.loads(json_codec.dumps(value)), {
+            'datetime': '2020-01-31 10:20:30',
+            'date': '2020-01-31',
+            'decimal': 1.5,
+            'uuid': '12345678-1234-5678-1234-567812345678',
+            'set': [1],
+            'bytes': 'YWJj',
+        })
+
+    def test_bytes_utf8(self):
+        data = json_codec.dumps_bytes({'bytes': b'abc'}, bytes_mode=json_codec.BYTES_UTF8)
+        self.assertIsInstance(data, bytes)
+        self.assertEqual(json_codec.loads(data), {'bytes': 'abc'})
+
+    def test_stdlib_default(self):
+        # default hook sama untuk orjson dan json stdlib
+        default = json_codec.get_default()
+        self.assertEqual(default(datetime(2020, 1, 31)), '2020-01-31 00:00:00')
+        self.assertEqual(default(b'abc'), 'YWJj')
+        self.assertIs(json_codec.get_default(), default)
+
+    def test_response_json(self):
+        self.assertEqual(json_codec.response_json(FakeResponse({'id': 1})), {'id': 1})
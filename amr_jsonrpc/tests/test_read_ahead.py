@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+
+import threading
+
+from odoo.tests import tagged
+
+from .. import remote
+from .common import (SESSION_EXPIRED, FakeResponse, RemoteCase, ThreadCheckedAuthModel, rpc_error,
+                     rpc_result)
+
+
+@tagged('post_install', '-at_install')
+class TestReadAhead(RemoteCase):
+
+    def connected_session(self, **kwargs):
+        auth = ThreadCheckedAuthModel(**kwargs)
+        odoo_session = remote.OdooSession(auth)
+        odoo_session.connect()
+        return auth, odoo_session
+
+    def test_worker_uses_own_session(self):
+        auth, odoo_session = self.connected_session()
+        model = remote.JsonRPCRemoteModel('res.partner', odoo_session, keyset=True, limit=2)
+        with self.mock_http(rpc_result([{'id': 1}, {'id': 2}]), rpc_result([{'id': 3}])) as calls:
+            pages = list(model.iter_pages(read_ahead=True))
+        self.assertEqual(pages, [[{'id': 1}, {'id': 2}], [{'id': 3}]])
+        main_call, ahead_call = calls
+        self.assertIs(main_call[3], odoo_session)
+        self.assertIsNot(ahead_call[3], odoo_session)
+        self.assertNotEqual(ahead_call[4], threading.current_thread())
+        # cookie session ikut di snapshot
+        self.assertEqual(ahead_call[3].cookies.get('session_id'), 'session-1')
+        self.assertEqual(auth.access_threads, {threading.current_thread()})
+
+    def test_session_expired_reauth_on_caller_thread(self):
+        auth, odoo_session = self.connected_session()
+        model = remote.JsonRPCRemoteModel('res.partner', odoo_session, keyset=True, limit=2)
+        with self.mock_http(
+                rpc_result([{'id': 1}, {'id': 2}]),
+                rpc_error(SESSION_EXPIRED, code=100),  # read ahead
+                rpc_error(SESSION_EXPIRED, code=100),  # fetch ulang, login ulang di thread pemanggil
+                rpc_result([{'id': 3}]),
+        ) as calls:
+            pages = list(model.iter_pages(read_ahead=True))
+        self.assertEqual(pages[-1], [{'id': 3}])
+        self.assertEqual(len(calls), 4)
+        self.assertEqual(auth.connect_count, 2)
+        self.assertEqual(auth.access_threads, {threading.current_thread()})
+
+    def test_rest_401_refetched_on_caller_thread(self):
+        auth, odoo_session = self.connected_session(auth_type='rest-token', access_token='tok')
+        model = remote.RestModelObject('res.partner', odoo_session, keyset=True, limit=2)
+        page = {'results': [{'id': 1}, {'id': 2}]}
+        with self.mock_http(
+                FakeResponse(page),
+                FakeResponse({}, status_code=401),  # read ahead
+                FakeResponse({'results': [{'id': 3}]}),
+        ) as calls:
+            pages = list(model.iter_pages(read_ahead=True))
+        self.assertEqual(pages, [page['results'], [{'id': 3}]])
+        # token header ikut di snapshot
+        self.assertEqual(calls[1][3].headers.get('token'), 'tok')
+        self.assertIs(calls[2][3], odoo_session)
+        self.assertEqual(auth.access_threads, {threading.current_thread()})
@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+
+from odoo.tests import tagged
+
+from .common import MemoryRemoteModel, RemoteCase
+
+
+@tagged('post_install', '-at_install')
+class TestKeysetPaging(RemoteCase):
+
+    def test_keyset_without_search_count(self):
+        model = MemoryRemoteModel([{'id': i} for i in range(1, 8)], keyset=True, limit=3)
+        seen = []
+        model.external_data_callback(lambda item, **kw: seen.append(item['id']))
+        self.assertEqual(seen, list(range(1, 8)))
+        methods = [method for method, args, kw in model.calls]
+        self.assertNotIn('search_count', methods)
+        # page ke dua dan ke tiga mulai setelah id terakhir
+        domains = [kw['domain'] for method, args, kw in model.calls]
+        self.assertEqual(domains, [[('id', '>', 0)], [('id', '>', 3)], [('id', '>', 6)]])
+        self.assertTrue(all(kw['order'] == 'id asc' for method, args, kw in model.calls))
+
+    def test_keyset_stable_while_remote_changes(self):
+        rows = [{'id': i} for i in range(1, 7)]
+        model = MemoryRemoteModel(rows, keyset=True, limit=2)
+        seen = []
+
+        def callback(item, **kw):
+            seen.append(item['id'])
+            if item['id'] == 2:
+                # data di depan di hapus selama scan, offset paging akan melewati data
+                del rows[0]
+
+        model.external_data_callback(callback)
+        self.assertEqual(seen, [1, 2, 3, 4, 5, 6])
+
+    def test_keyset_keeps_domain(self):
+        model = MemoryRemoteModel([{'id': 1}], keyset=True, limit=5, domain=[('active', '=', True)])
+        list(model.iter_records())
+        self.assertEqual(model.calls[0][2]['domain'], [('active', '=', True), ('id', '>', 0)])
+
+    def test_keyset_ignores_model_offset(self):
+        model = MemoryRemoteModel([{'id': i} for i in range(1, 6)], keyset=True, limit=2, offset=3)
+        seen = []
+        model.external_data_callback(lambda item, **kw: seen.append(item['id']))
+        self.assertEqual(seen, [1, 2, 3, 4, 5])
+        self.assertTrue(all(kw['offset'] == 0 for method, args, kw in model.calls))
+
+    def test_offset_paging_default(self):
+        model = MemoryRemoteModel([{'id': i} for i in range(1, 6)], limit=2)
+        seen = []
+        model.external_data_callback(lambda item, **kw: seen.append(item['id']))
+        self.assertEqual(seen, [1, 2, 3, 4, 5])
+        self.assertEqual(model.calls[0][0], 'search_count')
@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+
+import threading
+
+from odoo.tests import tagged
+
+from .. import remote
+from .common import ACCESS_DENIED, SESSION_EXPIRED, FakeAuthModel, RemoteCase, rpc_error, rpc_result
+
+
+@tagged('post_install', '-at_install')
+class TestSessionPool(RemoteCase):
+
+    def test_session_reused(self):
+        auth = FakeAuthModel()
+        created = []
+
+        def factory():
+            created.append(remote.OdooSession(auth))
+            return created[-1]
+
+        with remote.session_pool.session('key', factory) as s1:
+            pass
+        with remote.session_pool.session('key', factory) as s2:
+            pass
+        self.assertIs(s1, s2)
+        self.assertEqual(len(created), 1)
+        self.assertEqual(auth.connect_count, 1)
+
+    def test_session_expired_reauthenticate_once(self):
+        auth = FakeAuthModel()
+        with self.mock_http(rpc_error(SESSION_EXPIRED, code=100), rpc_result([{'id': 1}])) as calls:
+            with remote.session_pool.session('key', lambda: remote.OdooSession(auth)) as odoo_session:
+                result = odoo_session.jsonrpc_call('res.partner', 'read', [[1]])
+        self.assertEqual(result, [{'id': 1}])
+        self.assertEqual(len(calls), 2)
+        # connect + login ulang satu kali
+        self.assertEqual(auth.connect_count, 2)
+        # session sehat tetap di pool
+        self.assertEqual(len(remote.session_pool._idle['key']), 1)
+
+    def test_session_expired_twice_discarded(self):
+        auth = FakeAuthModel()
+        with self.mock_http(rpc_error(SESSION_EXPIRED, code=100), rpc_error(SESSION_EXPIRED, code=100)):
+            with self.assertRaises(remote.JsonRPCSessionExpired):
+                with remote.session_pool.session('key', lambda: remote.OdooSession(auth)) as odoo_session:
+                    odoo_session.jsonrpc_call('res.partner', 'read', [[1]])
+        self.assertFalse(remote.session_pool._idle.get('key'))
+        self.assertFalse(remote.session_pool._in_use.get('key'))
+
+    def test_access_denied_discarded(self):
+        auth = FakeAuthModel()
+        with self.mock_http(rpc_error(ACCESS_DENIED), rpc_error(ACCESS_DENIED)):
+            with self.assertRaises(remote.JsonRPCAccessDenied):
+                with remote.session_pool.session('key', lambda: remote.OdooSession(auth)) as odoo_session:
+                    odoo_session.jsonrpc_call('res.partner', 'read', [[1]])
+        self.assertFalse(remote.session_pool._idle.get('key'))
+
+    def test_other_error_keeps_session(self):
+        auth = FakeAuthModel()
+        with self.mock_http(rpc_error('odoo.exceptions.ValidationError')):
+            with self.assertRaises(RuntimeError):
+                with remote.session_pool.session('key', lambda: remote.OdooSession(auth)) as odoo_session:
+                    odoo_session.jsonrpc_call('res.partner', 'write', [[1], {}])
+        self.assertEqual(len(remote.session_pool._idle['key']), 1)
+        self.assertEqual(auth.connect_count, 1)
+
+    def test_nested_session_same_thread(self):
+        pool = remote.OdooSessionPool(max_size=1, wait_timeout=0.1)
+        auth = FakeAuthModel()
+        with pool.session('key', lambda: remote.OdooSession(auth)) as outer:
+            # pooled_session bersarang di thread yang sama tidak menunggu dirinya sendiri
+            with pool.session('key', lambda: remote.OdooSession(auth)) as inner:
+                self.assertIsNot(inner, outer)
+        # session di atas max_size tidak di simpan
+        self.assertEqual(len(pool._idle['key']), 1)
+        self.assertFalse(pool._in_use)
+        self.assertFalse(pool._owners)
+
+    def test_other_thread_waits_for_cap(self):
+        pool = remote.OdooSessionPool(max_size=1, wait_timeout=0.1)
+        auth = FakeAuthModel()
+        errors = []
+
+        def other():
+            try:
+                with pool.session('key', lambda: remote.OdooSession(auth)):
+                    pass
+            except RuntimeError as e:
+                errors.append(e)
+
+        with pool.session('key', lambda: remote.OdooSession(auth)):
+            thread = threading.Thread(target=other)
+            thread.start()
+            thread.join()
+            self.assertEqual(len(errors), 1)
+            pool.ensure_max_size(2)
+            thread = threading.Thread(target=other)
+            thread.start()
+            thread.join()
+            self.assertEqual(len(errors), 1)
+
+    def test_http_401_discarded(self):
+        auth = FakeAuthModel()
+        with self.assertRaises(remote.RemoteAuthError):
+            with remote.session_pool.session('key', lambda: remote.OdooSession(auth)):
+                raise remote.RemoteAuthError("HTTP 401")
+        self.assertFalse(remote.session_pool._idle.get('key'))
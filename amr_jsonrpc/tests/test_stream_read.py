@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+
+import io
+
+import requests
+
+from odoo.tests import tagged
+
+from .. import json_codec, remote
+from .common import FakeAuthModel, RemoteCase
+
+
+def ndjson_response(rows, status_code=200):
+    response = requests.Response()
+    response.status_code = status_code
+    response.raw = io.BytesIO(b''.join(json_codec.dumps_bytes(row) + b'\n' for row in rows))
+    return response
+
+
+@tagged('post_install', '-at_install')
+class TestStreamRead(RemoteCase):
+
+    def setUp(self):
+        super().setUp()
+        session = remote.OdooSession(FakeAuthModel(auth_type='rest-token', access_token='token'))
+        self.model = remote.RestModelObject('res.partner', session, stream=True, limit=2)
+
+    def test_stream_pages(self):
+        with self.mock_http(ndjson_response([{'id': 1}, {'id': 2}, {'id': 3}])) as calls:
+            pages = list(self.model.iter_pages())
+        self.assertEqual(pages, [[{'id': 1}, {'id': 2}], [{'id': 3}]])
+        # satu request untuk semua page
+        self.assertEqual(len(calls), 1)
+        method, url, kwargs, session, thread = calls[0]
+        self.assertEqual(url, 'http://remote.test/api/sync/data/res.partner')
+        self.assertTrue(kwargs['stream'])
+        self.assertEqual(kwargs['params']['stream'], 1)
+
+    def test_stream_error_line(self):
+        response = ndjson_response([{'id': 1}, {'error': 'Process error', 'error_description': 'Error: x'}])
+        with self.mock_http(response):
+            with self.assertRaises(requests.HTTPError):
+                list(self.model.stream_read())